@@ -0,0 +1,117 @@
+"""
+Acciones canónicas: con copias de una carta en el deck, la generación de
+antes repetía acciones equivalentes (invocar cualquiera de dos copias,
+atacar a cualquiera de dos defensores iguales) y sus subárboles. Se
+comparan las acciones de la raíz (y cuántas de ellas son distintas), el
+factor de ramificación efectivo y los nodos de la búsqueda con y sin
+`acciones_canonicas`, en partidas cuyos decks tienen 1, 2 o 3 copias de
+cada carta. Las copias se descartan después de los anchos del haz, así
+que con el perfil "normal" la búsqueda sólo pierde acciones repetidas y
+debe elegir la misma jugada; sin límites se ve la reducción completa.
+
+    python -m benchmarks.bench_acciones_canonicas [profundidad]
+"""
+import random
+import sys
+
+from benchmarks.comun import crear_juego, describir_accion
+from modelo.ia_minimax import IAMinimax
+from modelo.jugador import Jugador
+from modelo.perfil_busqueda import PERFILES, PerfilBusqueda
+from modelo.tabla_transposicion import TablaTransposicion
+
+SEMILLAS = (1, 2, 3, 4)
+TURNOS = 10
+
+PERFILES_MEDIDOS = (PERFILES["normal"], PerfilBusqueda("sin límites"))
+
+
+def deck_con_copias(cartas, tamanio, copias, aleatorio):
+    """Deck de `tamanio` cartas con `copias` copias de cada una"""
+    distintas = aleatorio.sample(cartas, tamanio // copias)
+    deck = [carta.instanciar() for carta in distintas for _ in range(copias)]
+    aleatorio.shuffle(deck)
+    return deck
+
+
+def recolectar_posiciones(juego, copias, semilla, tamanio_deck=20):
+    """
+    Posiciones (jugador en turno, rival) de una partida entre dos IAs de
+    profundidad 2 con decks de copias
+    """
+    aleatorio = random.Random(semilla)
+    jugadores = [
+        Jugador(nombre, deck_con_copias(juego.cartas_disponibles, tamanio_deck, copias, aleatorio))
+        for nombre in ("Jugador", "IA")
+    ]
+    for jugador in jugadores:
+        jugador.robar_mano_inicial(5)
+
+    agente = IAMinimax(profundidad=2)
+    agente.fusionador = juego.fusionador
+    agente.cartas_disponibles = juego.cartas_fusion
+
+    posiciones = []
+    for turno in range(TURNOS):
+        jugador, rival = jugadores[turno % 2], jugadores[1 - turno % 2]
+        if turno > 0:
+            jugador.robar_carta()
+        posiciones.append((jugador.clonar(), rival.clonar()))
+
+        agente._aplicar_accion(jugador, rival, agente.elegir_mejor_jugada(jugador, rival))
+        if jugador.esta_derrotado() or rival.esta_derrotado():
+            break
+    return posiciones
+
+
+def medir(juego, posiciones, profundidad, perfil, canonicas):
+    """
+    (acciones por posición, distintas por posición, nodos, factor de
+    ramificación medio, jugadas)
+    """
+    acciones = distintas = nodos = 0
+    ramificacion = 0.0
+    jugadas = []
+    for jugador, rival in posiciones:
+        ia = IAMinimax(profundidad=profundidad, tabla_transposicion=TablaTransposicion(),
+                       perfil=perfil, acciones_canonicas=canonicas)
+        ia.fusionador = juego.fusionador
+        ia.cartas_disponibles = juego.cartas_fusion
+
+        generadas = ia._generar_acciones(jugador, rival)
+        acciones += len(generadas)
+        distintas += len({ia._clave_accion(accion) for accion in generadas})
+        jugadas.append(describir_accion(ia.elegir_mejor_jugada(jugador, rival)))
+        nodos += ia.nodos_visitados
+        ramificacion += ia.estadisticas.factor_ramificacion()
+    cantidad = len(posiciones)
+    return acciones / cantidad, distintas / cantidad, nodos, ramificacion / cantidad, jugadas
+
+
+def main():
+    profundidad = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    juego = crear_juego(turnos=0)
+
+    print(f"{'perfil':<12} {'copias':>6} {'posiciones':>10} {'canónicas':>9} {'acciones':>8} "
+          f"{'distintas':>9} {'b*':>6} {'nodos':>8} {'vs antes':>8} {'misma jugada':>12}")
+
+    for copias in (1, 2, 3):
+        posiciones = [p for semilla in SEMILLAS
+                      for p in recolectar_posiciones(juego, copias, semilla)]
+
+        for perfil in PERFILES_MEDIDOS:
+            antes = medir(juego, posiciones, profundidad, perfil, False)
+            despues = medir(juego, posiciones, profundidad, perfil, True)
+            iguales = sum(a == b for a, b in zip(antes[4], despues[4]))
+
+            for nombre, (acciones, distintas, nodos, ramificacion, _) in (("no", antes), ("sí", despues)):
+                proporcion = nodos / antes[2]
+                misma = f"{iguales}/{len(posiciones)}" if nombre == "sí" else ""
+                print(f"{perfil.nombre:<12} {copias:>6} {len(posiciones):>10} {nombre:>9} "
+                      f"{acciones:>8.2f} {distintas:>9.2f} {ramificacion:>6.2f} {nodos:>8} "
+                      f"{proporcion:>8.2f} {misma:>12}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Caché persistente de posiciones (modelo/cache_posiciones.py).
+
+1. Los mismos duelos dos veces sobre una caché nueva: en la segunda
+   pasada las posiciones repetidas salen de la caché. Se comparan tiempo,
+   aciertos y si los duelos terminan igual.
+2. Varios procesos de autojuego escriben a la vez en el mismo archivo,
+   cada uno con sus semillas; después cada proceso juega las semillas de
+   otro y debe encontrar en la caché las posiciones que ése escribió.
+3. Con un máximo de entradas chico la poda LRU mantiene el tamaño
+   (se revisa cada 64 escrituras y al final se poda una vez más).
+
+    python -m benchmarks.bench_cache_posiciones [procesos]
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.comun import jugar_duelo
+from modelo.cache_posiciones import CachePosiciones
+from modelo.ia_minimax import IAMinimax
+from modelo.tabla_transposicion import TablaTransposicion
+
+SEMILLAS = (1, 2, 3, 4)
+MAX_NODOS = 1500
+
+
+def duelos(cache, semillas=SEMILLAS):
+    """Juega los duelos con ambos agentes usando la caché: (resultados, segundos)"""
+    resultados = []
+    inicio = time.perf_counter()
+    for semilla in semillas:
+        agentes = [IAMinimax(max_nodos=MAX_NODOS, tabla_transposicion=TablaTransposicion(),
+                             turno_completo=True, cache_posiciones=cache)
+                   for _ in range(2)]
+        resultados.append(jugar_duelo(agentes, semilla=semilla, max_turnos=40)[::2])
+    return resultados, time.perf_counter() - inicio
+
+
+def _duelos_en_proceso(argumentos):
+    ruta, semillas = argumentos
+    cache = CachePosiciones(ruta)
+    resultados, segundos = duelos(cache, semillas)
+    cache.cerrar()
+    return len(resultados), cache.aciertos, cache.escrituras, segundos
+
+
+def main():
+    procesos = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = CachePosiciones(os.path.join(directorio, "secuencial.sqlite"))
+        print(f"{'pasada':>6} {'segundos':>8} {'aciertos':>8} {'fallos':>6} {'entradas':>8} {'iguales':>7}")
+        anteriores = None
+        for pasada in (1, 2):
+            cache.aciertos = cache.fallos = 0
+            resultados, segundos = duelos(cache)
+            iguales = "-" if anteriores is None else f"{sum(a == b for a, b in zip(anteriores, resultados))}/{len(resultados)}"
+            print(f"{pasada:>6} {segundos:>8.2f} {cache.aciertos:>8} {cache.fallos:>6} "
+                  f"{len(cache):>8} {iguales:>7}")
+            anteriores = resultados
+        cache.cerrar()
+
+        ruta = os.path.join(directorio, "compartida.sqlite")
+        print()
+        print(f"{procesos} procesos compartiendo la caché:")
+        for ronda, nombre in enumerate(("escriben", "leen las de otro")):
+            # En la segunda ronda el proceso i juega las semillas del i + 1
+            tareas = [(ruta, SEMILLAS[(i + ronda) % procesos::procesos]) for i in range(procesos)]
+            with multiprocessing.Pool(procesos) as pool:
+                por_proceso = pool.map(_duelos_en_proceso, tareas)
+            print(f"  ronda {ronda + 1} ({nombre}):")
+            for i, (cantidad, aciertos, escrituras, segundos) in enumerate(por_proceso):
+                print(f"    proceso {i}: {cantidad} duelos, {aciertos} aciertos, "
+                      f"{escrituras} escrituras, {segundos:.2f} s")
+        assert all(aciertos > 0 for _, aciertos, _, _ in por_proceso), \
+            "Un proceso no encontró las posiciones que escribió otro"
+        compartida = CachePosiciones(ruta)
+        print(f"  entradas en el archivo: {len(compartida)}")
+        compartida.cerrar()
+
+        chica = CachePosiciones(os.path.join(directorio, "chica.sqlite"), max_entradas=20)
+        duelos(chica)
+        antes = len(chica)
+        chica.podar()
+        print()
+        print(f"Con max_entradas=20: {chica.escrituras} escrituras, {antes} entradas antes "
+              f"de la última poda y {len(chica)} después")
+        chica.cerrar()
+
+
+if __name__ == "__main__":
+    main()
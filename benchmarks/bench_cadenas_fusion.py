@@ -0,0 +1,100 @@
+"""
+Planificador de cadenas de fusiones (modelo/planificador_fusiones.py).
+
+1. Para manos al azar de 5 a 15 cartas y cadenas de hasta 2, 3 y 4
+   fusiones: ms de la primera consulta (memoria vacía) y de la segunda
+   (con la memoria de la primera), estados buscados, ATK medio de la
+   mejor fusión de un par contra el de la mejor cadena y cuántas
+   consultas terminan dentro de `LIMITE_MS`.
+2. Duelos de una IA que genera cadenas como acciones contra otra que
+   no, con el mismo presupuesto de nodos, cambiando quién empieza.
+
+    python -m benchmarks.bench_cadenas_fusion [max_nodos]
+"""
+import random
+import sys
+import time
+
+from benchmarks.comun import crear_juego, jugar_duelo
+from modelo.ia_minimax import IAMinimax
+from modelo.planificador_fusiones import PlanificadorFusiones
+from modelo.tabla_transposicion import TablaTransposicion
+from modelo.zona import Mano
+
+TAMANIOS = (5, 8, 10, 12, 15)
+LARGOS = (2, 3, 4)
+MANOS = 10
+LIMITE_MS = 100
+SEMILLAS = (1, 2, 3, 4)
+
+
+def medir(juego, tamanio, largo, aleatorio):
+    """Promedios de MANOS manos de `tamanio` cartas con cadenas de hasta `largo` fusiones"""
+    fusionador, pool = juego.fusionador, juego.cartas_fusion
+    fila = {"fria": 0.0, "memoria": 0.0, "estados": 0, "par": 0, "cadena": 0, "a_tiempo": 0}
+    for _ in range(MANOS):
+        mano = Mano(c.instanciar() for c in aleatorio.sample(juego.cartas_disponibles, tamanio))
+
+        planificador = PlanificadorFusiones(largo_maximo=largo)
+        inicio = time.perf_counter()
+        cadenas = planificador.cadenas(mano, fusionador, pool)
+        fila["fria"] += (time.perf_counter() - inicio) * 1000
+        fila["estados"] += planificador.estados
+
+        inicio = time.perf_counter()
+        planificador.cadenas(mano, fusionador, pool)
+        fila["memoria"] += (time.perf_counter() - inicio) * 1000
+
+        fusiones = fusionador.obtener_fusiones_posibles(mano, pool)
+        fila["par"] += max((r.atk for _, _, r in fusiones), default=0)
+        fila["cadena"] += cadenas[0][-1][2].atk if cadenas else 0
+
+        con_limite = PlanificadorFusiones(largo_maximo=largo, limite_ms=LIMITE_MS)
+        con_limite.cadenas(mano, fusionador, pool)
+        fila["a_tiempo"] += con_limite.completo
+    return {clave: valor / MANOS if clave != "a_tiempo" else valor for clave, valor in fila.items()}
+
+
+def duelos(max_nodos):
+    """Duelos con cadenas contra sin ellas: (gana, pierde, empate)"""
+    gana = pierde = empate = 0
+    for semilla in SEMILLAS:
+        for empieza in (0, 1):
+            con = IAMinimax(max_nodos=max_nodos, tabla_transposicion=TablaTransposicion(),
+                            turno_completo=True, planificador_fusiones=PlanificadorFusiones())
+            sin = IAMinimax(max_nodos=max_nodos, tabla_transposicion=TablaTransposicion(),
+                            turno_completo=True)
+            agentes = [con, sin] if empieza == 0 else [sin, con]
+
+            ganador, _, _ = jugar_duelo(agentes, semilla=semilla)
+            if ganador is None:
+                empate += 1
+            elif ganador == empieza:
+                gana += 1
+            else:
+                pierde += 1
+    return gana, pierde, empate
+
+
+def main():
+    max_nodos = int(sys.argv[1]) if len(sys.argv) > 1 else 1500
+    juego = crear_juego(turnos=0)
+    aleatorio = random.Random(1)
+
+    print(f"{'mano':>4} {'largo':>5} {'ms fría':>8} {'ms memoria':>10} {'estados':>8} "
+          f"{'ATK par':>8} {'ATK cadena':>10} {f'en {LIMITE_MS} ms':>9}")
+    for tamanio in TAMANIOS:
+        for largo in LARGOS:
+            fila = medir(juego, tamanio, largo, aleatorio)
+            print(f"{tamanio:>4} {largo:>5} {fila['fria']:>8.1f} {fila['memoria']:>10.2f} "
+                  f"{fila['estados']:>8.0f} {fila['par']:>8.0f} {fila['cadena']:>10.0f} "
+                  f"{fila['a_tiempo']:>5.0f}/{MANOS}")
+
+    gana, pierde, empate = duelos(max_nodos)
+    print()
+    print(f"Con cadenas contra sin ellas ({max_nodos} nodos): "
+          f"gana {gana}, pierde {pierde}, empate {empate}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Compara la búsqueda clonando jugadores por nodo contra el modo
+aplicar/deshacer de IAMinimax en profundidades 2 a 5.
+
+    python -m benchmarks.bench_deshacer
+"""
+import time
+
+from benchmarks.comun import crear_juego, describir_accion
+from modelo.ia_minimax import IAMinimax
+
+
+def medir(juego, profundidad, usar_deshacer):
+    """Ejecuta una búsqueda completa y retorna (accion, nodos, segundos)"""
+    ia = IAMinimax(profundidad=profundidad, usar_deshacer=usar_deshacer)
+    ia.fusionador = juego.fusionador
+    ia.cartas_disponibles = juego.cartas_fusion
+    
+    inicio = time.perf_counter()
+    accion = ia.elegir_mejor_jugada(juego.jugador_ia, juego.jugador_humano)
+    segundos = time.perf_counter() - inicio
+    
+    return describir_accion(accion), ia.nodos_visitados, segundos
+
+
+def main():
+    juego = crear_juego()
+    print(juego.jugador_ia)
+    print(juego.jugador_humano)
+    print()
+    print(f"{'prof':>4} {'modo':>9} {'nodos':>9} {'seg':>8} {'nodos/s':>10}  jugada")
+    
+    for profundidad in range(2, 6):
+        resultados = {}
+        for modo, usar_deshacer in (("clonar", False), ("deshacer", True)):
+            accion, nodos, segundos = medir(juego, profundidad, usar_deshacer)
+            resultados[modo] = (accion, nodos, segundos)
+            print(f"{profundidad:>4} {modo:>9} {nodos:>9} {segundos:>8.3f} {nodos / segundos:>10.0f}  {accion}")
+        
+        clonar, deshacer = resultados["clonar"], resultados["deshacer"]
+        assert clonar[0] == deshacer[0] and clonar[1] == deshacer[1], "Los modos no coinciden"
+        print(f"     aceleración: x{clonar[2] / deshacer[2]:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Costo de la búsqueda determinizada según el número de muestras de las
+cartas ocultas del jugador, a profundidad fija (el costo debe crecer de
+forma lineal con las muestras) y comparación de la jugada elegida con la
+de la búsqueda que mira la mano y el deck reales.
+
+    python -m benchmarks.bench_determinizacion
+"""
+import os
+import time
+
+from benchmarks.comun import crear_juego, describir_accion
+from modelo.ia_minimax import IAMinimax
+from modelo.tabla_transposicion import TablaTransposicion
+
+
+def crear_ia(juego, profundidad, determinizaciones, trabajadores=1):
+    ia = IAMinimax(profundidad=profundidad, tabla_transposicion=TablaTransposicion(),
+                   determinizaciones=determinizaciones, trabajadores=trabajadores, semilla=1)
+    ia.fusionador = juego.fusionador
+    ia.cartas_disponibles = juego.cartas_fusion
+    ia.cartas_catalogo = juego.cartas_disponibles
+    return ia
+
+
+def medir(ia, juego):
+    """Retorna (accion, nodos, segundos) de una búsqueda"""
+    inicio = time.perf_counter()
+    accion = ia.elegir_mejor_jugada(juego.jugador_ia, juego.jugador_humano)
+    segundos = time.perf_counter() - inicio
+    ia.cerrar()
+    return describir_accion(accion), ia.nodos_visitados, segundos
+
+
+def main(profundidad=4):
+    print(f"CPUs: {os.cpu_count()}  profundidad: {profundidad}")
+    print(f"{'partida':>8} {'muestras':>8} {'procesos':>8} {'nodos':>9} {'seg':>8} "
+          f"{'seg/muestra':>11} {'igual':>5}  jugada")
+
+    for semilla, turnos in ((7, 4), (3, 6)):
+        juego = crear_juego(semilla=semilla, turnos=turnos)
+
+        accion_real, nodos, segundos = medir(crear_ia(juego, profundidad, 0), juego)
+        print(f"{semilla:>8} {'real':>8} {1:>8} {nodos:>9} {segundos:>8.3f} {segundos:>11.3f} "
+              f"{'':>5}  {accion_real}")
+
+        configuraciones = [(n, 1) for n in (1, 2, 4, 8)] + [(8, os.cpu_count() or 1)]
+        for muestras, trabajadores in configuraciones:
+            accion, nodos, segundos = medir(crear_ia(juego, profundidad, muestras, trabajadores), juego)
+            igual = "sí" if accion == accion_real else "no"
+            print(f"{semilla:>8} {muestras:>8} {trabajadores:>8} {nodos:>9} {segundos:>8.3f} "
+                  f"{segundos / muestras:>11.3f} {igual:>5}  {accion}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Hojas por segundo de la evaluación escalar (`IAMinimax.evaluar_estado`)
+contra la evaluación por lotes (`modelo/evaluacion_lote.py`), con NumPy si
+está instalado y con el recorrido escalar de respaldo. También compara la
+búsqueda completa con y sin evaluación por lotes en el último nivel.
+
+    python -m benchmarks.bench_evaluacion_lote
+"""
+import time
+
+from benchmarks.comun import crear_juego, describir_accion
+from modelo.evaluacion_lote import NUMPY_DISPONIBLE, codificar_hoja, evaluar_lote
+from modelo.ia_minimax import IAMinimax
+from modelo.tabla_transposicion import TablaTransposicion
+
+REPETICIONES = 20
+
+
+def recolectar_hojas(juego):
+    """Estados a dos acciones de distancia (IA y luego humano) de la posición"""
+    ia = IAMinimax()
+    ia.fusionador = juego.fusionador
+    ia.cartas_disponibles = juego.cartas_fusion
+    ia_jugador, humano = juego.jugador_ia.clonar(), juego.jugador_humano.clonar()
+
+    hojas = []
+    for accion in ia._generar_acciones(ia_jugador, humano):
+        registro = []
+        ia._aplicar_accion(ia_jugador, humano, accion, registro)
+        for respuesta in ia._generar_acciones(humano, ia_jugador):
+            registro_respuesta = []
+            ia._aplicar_accion(humano, ia_jugador, respuesta, registro_respuesta)
+            hojas.append((ia_jugador.clonar(), humano.clonar()))
+            ia._deshacer_accion(registro_respuesta)
+        ia._deshacer_accion(registro)
+    return hojas
+
+
+def hojas_por_segundo(funcion, cantidad):
+    inicio = time.perf_counter()
+    for _ in range(REPETICIONES):
+        funcion()
+    return cantidad * REPETICIONES / (time.perf_counter() - inicio)
+
+
+def medir_busqueda(juego, evaluar_en_lote, profundidad=4):
+    ia = IAMinimax(profundidad=profundidad, tabla_transposicion=TablaTransposicion(),
+                   evaluar_en_lote=evaluar_en_lote)
+    ia.fusionador = juego.fusionador
+    ia.cartas_disponibles = juego.cartas_fusion
+
+    inicio = time.perf_counter()
+    accion = ia.elegir_mejor_jugada(juego.jugador_ia, juego.jugador_humano)
+    segundos = time.perf_counter() - inicio
+    return describir_accion(accion), ia.nodos_visitados, segundos
+
+
+def main():
+    juegos = [crear_juego(semilla=s, turnos=t) for s, t in ((7, 4), (3, 6), (11, 8))]
+    hojas = [h for juego in juegos for h in recolectar_hojas(juego)]
+    filas = [codificar_hoja(*h) for h in hojas]
+    evaluador = IAMinimax()
+
+    print(f"NumPy disponible: {'sí' if NUMPY_DISPONIBLE else 'no'}   hojas: {len(hojas)}")
+    print()
+    print(f"{'método':<34} {'hojas/s':>12}")
+
+    escalar = hojas_por_segundo(lambda: [evaluador.evaluar_estado(*h) for h in hojas], len(hojas))
+    print(f"{'evaluar_estado (una a una)':<34} {escalar:>12,.0f}")
+
+    codificar = hojas_por_segundo(lambda: [codificar_hoja(*h) for h in hojas], len(hojas))
+    print(f"{'codificar_hoja':<34} {codificar:>12,.0f}")
+
+    respaldo = hojas_por_segundo(lambda: evaluar_lote(filas, usar_numpy=False), len(hojas))
+    print(f"{'evaluar_lote sin NumPy':<34} {respaldo:>12,.0f}")
+
+    if NUMPY_DISPONIBLE:
+        for tamanio in (8, 64, len(filas)):
+            lotes = [filas[i:i + tamanio] for i in range(0, len(filas), tamanio)]
+            velocidad = hojas_por_segundo(lambda: [evaluar_lote(l) for l in lotes], len(filas))
+            print(f"{f'evaluar_lote NumPy (lotes de {tamanio})':<34} {velocidad:>12,.0f}")
+
+    # Mismos valores por ambos caminos
+    assert evaluar_lote(filas) == [evaluador.evaluar_estado(*h) for h in hojas]
+
+    print()
+    print(f"{'partida':>8} {'lote':>5} {'nodos':>8} {'seg':>8} {'nodos/s':>9} {'misma jugada':>12}")
+    for indice, juego in enumerate(juegos):
+        accion_base, nodos, segundos = medir_busqueda(juego, False)
+        print(f"{indice:>8} {'no':>5} {nodos:>8} {segundos:>8.3f} {nodos / segundos:>9,.0f}")
+        accion, nodos, segundos = medir_busqueda(juego, True)
+        misma = "sí" if accion == accion_base else "no"
+        print(f"{indice:>8} {'sí':>5} {nodos:>8} {segundos:>8.3f} {nodos / segundos:>9,.0f} {misma:>12}")
+
+
+if __name__ == "__main__":
+    main()
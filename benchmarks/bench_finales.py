@@ -0,0 +1,126 @@
+"""
+Solucionador exacto de finales (modelo/solucionador_finales.py): para
+posiciones de final de partidas con decks chicos, cuántas resuelve según
+las cartas que quedan, con qué resultado y cuánto tarda; y duelos de una
+IA que lo usa contra otra que no, con el mismo presupuesto de nodos para
+la búsqueda heurística, cambiando quién empieza.
+
+    python -m benchmarks.bench_finales [max_nodos]
+"""
+import sys
+import time
+
+from benchmarks.comun import crear_juego, jugar_duelo
+from modelo.ia_minimax import IAMinimax
+from modelo.solucionador_finales import (
+    NOMBRES_RESULTADO, SolucionadorFinales, SolucionInterrumpida, cartas_restantes
+)
+from modelo.tabla_transposicion import TablaTransposicion
+
+SEMILLAS = (1, 2, 3, 4, 5, 6)
+TAMANIO_DECK = 12
+CARTAS_MAXIMAS = 12
+
+
+def recolectar_finales(semilla):
+    """
+    Posiciones (cartas restantes, jugador en turno, rival) de una partida
+    entre dos IAs de profundidad 2 sin solucionador, desde que quedan
+    `CARTAS_MAXIMAS` cartas o menos
+    """
+    juego = crear_juego(semilla=semilla, tamanio_deck=TAMANIO_DECK, turnos=0)
+    jugadores = [juego.jugador_humano.clonar(), juego.jugador_ia.clonar()]
+    agente = IAMinimax(profundidad=2, turno_completo=True, cartas_final=None)
+    agente.fusionador = juego.fusionador
+    agente.cartas_disponibles = juego.cartas_fusion
+
+    posiciones = []
+    for turno in range(40):
+        jugador, rival = jugadores[turno % 2], jugadores[1 - turno % 2]
+        if turno > 0:
+            jugador.robar_carta()
+        cartas = cartas_restantes(jugador, rival)
+        if cartas <= CARTAS_MAXIMAS:
+            posiciones.append((cartas, jugador.clonar(), rival.clonar()))
+
+        agente._aplicar_accion(jugador, rival, agente.elegir_mejor_jugada(jugador, rival))
+        if jugador.esta_derrotado() or rival.esta_derrotado():
+            break
+    return juego, posiciones
+
+
+def resolver_finales(max_nodos):
+    """Resultados, nodos y ms medios del solucionador por cartas restantes"""
+    por_cartas = {}
+    for semilla in SEMILLAS:
+        juego, posiciones = recolectar_finales(semilla)
+        for cartas, jugador, rival in posiciones:
+            ia = IAMinimax(turno_completo=True)
+            ia.fusionador = juego.fusionador
+            ia.cartas_disponibles = juego.cartas_fusion
+            solucionador = SolucionadorFinales(ia, max_nodos=max_nodos)
+
+            inicio = time.perf_counter()
+            try:
+                valor, _, _ = solucionador.resolver(jugador, rival)
+                resultado = NOMBRES_RESULTADO[valor]
+            except SolucionInterrumpida:
+                resultado = "incompleto"
+            ms = (time.perf_counter() - inicio) * 1000
+
+            fila = por_cartas.setdefault(cartas, {"posiciones": 0, "nodos": 0, "ms": 0.0})
+            fila["posiciones"] += 1
+            fila["nodos"] += solucionador.nodos
+            fila["ms"] += ms
+            fila[resultado] = fila.get(resultado, 0) + 1
+    return por_cartas
+
+
+def duelos(max_nodos):
+    """
+    Duelos con solucionador contra sin él: (gana, pierde, empate, turnos
+    medios, finales resueltos, finales intentados)
+    """
+    gana = pierde = empate = turnos = resueltos = intentados = 0
+    for semilla in SEMILLAS:
+        for empieza in (0, 1):
+            con = IAMinimax(max_nodos=max_nodos, tabla_transposicion=TablaTransposicion(),
+                            turno_completo=True)
+            sin = IAMinimax(max_nodos=max_nodos, tabla_transposicion=TablaTransposicion(),
+                            turno_completo=True, cartas_final=None)
+            agentes = [con, sin] if empieza == 0 else [sin, con]
+
+            ganador, _, jugados = jugar_duelo(agentes, semilla=semilla, tamanio_deck=TAMANIO_DECK)
+            turnos += jugados
+            resueltos += con.finales_resueltos
+            intentados += con.finales_intentados
+            if ganador is None:
+                empate += 1
+            elif ganador == empieza:
+                gana += 1
+            else:
+                pierde += 1
+    return gana, pierde, empate, turnos / (2 * len(SEMILLAS)), resueltos, intentados
+
+
+def main():
+    max_nodos = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    resultados = ("gana", "pierde", "tablas", "incompleto")
+
+    print(f"{'cartas':>6} {'posiciones':>10} " + " ".join(f"{r:>10}" for r in resultados)
+          + f" {'nodos':>8} {'ms':>8}")
+    for cartas, fila in sorted(resolver_finales(5000).items()):
+        cantidad = fila["posiciones"]
+        print(f"{cartas:>6} {cantidad:>10} "
+              + " ".join(f"{fila.get(r, 0):>10}" for r in resultados)
+              + f" {fila['nodos'] / cantidad:>8.0f} {fila['ms'] / cantidad:>8.1f}")
+
+    gana, pierde, empate, turnos, resueltos, intentados = duelos(max_nodos)
+    print()
+    print(f"Con solucionador contra sin él ({max_nodos} nodos): "
+          f"gana {gana}, pierde {pierde}, empate {empate}, {turnos:.1f} turnos por duelo")
+    print(f"Finales resueltos por el solucionador: {resueltos} de {intentados}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Fusiones posibles de la mano: recorrer todos los pares en cada consulta
+(una lista de cartas) contra los pares que recuerda la Mano
+(modelo/zona.py), con el patrón de la búsqueda: robar una carta, pedir
+las fusiones, jugar una carta y deshacer.
+
+Para cada tamaño de mano se miden consultas por segundo con el pool de
+fusión cargado (tabla de pares e índice) y con una copia del pool, que
+obliga al fusionador a recorrer la lista, y si los resultados coinciden.
+
+    python -m benchmarks.bench_fusiones_mano [tamaño ...]
+"""
+import random
+import sys
+import time
+
+from benchmarks.comun import crear_juego
+from modelo.zona import Mano
+
+CONSULTAS = 2000
+
+
+def consultar(fusionador, mano, deck, pool, aleatorio):
+    """
+    Roba, consulta las fusiones, juega una carta al azar y la devuelve
+    `CONSULTAS` veces: (fusiones encontradas, consultas por segundo)
+    """
+    encontradas = []
+    inicio = time.perf_counter()
+    for robada in deck:
+        mano.append(robada)
+        fusiones = fusionador.obtener_fusiones_posibles(mano, pool)
+        indice = aleatorio.randrange(len(mano))
+        jugada = mano.pop(indice)
+        mano.insert(indice, jugada)
+        mano.remove(robada)
+        encontradas.append([(c1.uid, c2.uid, r.id) for c1, c2, r in fusiones])
+    return encontradas, len(deck) / (time.perf_counter() - inicio)
+
+
+def main():
+    juego = crear_juego(turnos=0)
+    normales = juego.cartas_disponibles
+    fusionador = juego.fusionador
+    tamanios = [int(n) for n in sys.argv[1:]] or [5, 8, 10, 15]
+
+    print(f"{'mano':>4} {'pool':>7} {'consultas/s lista':>18} {'consultas/s Mano':>17} "
+          f"{'mejora':>7} {'iguales':>8}")
+    for tamanio in tamanios:
+        aleatorio = random.Random(tamanio)
+        cartas = [c.instanciar() for c in aleatorio.sample(normales, tamanio - 1)]
+        # Las cartas robadas salen de un deck chico: se repiten como en una partida
+        deck = [c.instanciar() for c in aleatorio.sample(normales, 10)]
+        deck = [aleatorio.choice(deck) for _ in range(CONSULTAS)]
+
+        for nombre, pool in (("cargado", juego.cartas_fusion), ("copia", list(juego.cartas_fusion))):
+            consultas = CONSULTAS if nombre == "cargado" else CONSULTAS // 10
+            lista, velocidad_lista = consultar(fusionador, list(cartas), deck[:consultas], pool,
+                                               random.Random(1))
+            mano, velocidad_mano = consultar(fusionador, Mano(cartas), deck[:consultas], pool,
+                                             random.Random(1))
+            iguales = sum(a == b for a, b in zip(lista, mano))
+            print(f"{tamanio:>4} {nombre:>7} {velocidad_lista:>18,.0f} {velocidad_mano:>17,.0f} "
+                  f"{velocidad_mano / velocidad_lista:>6.1f}x {iguales:>4}/{consultas}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Índice de fusiones (IndiceFusiones en modelo/fusionador.py) contra el
+recorrido de toda la lista de cartas de fusión en cada par.
+
+El pool de datos/fusiones.json tiene 50 cartas; para ver cómo escala con
+el catálogo completo de la API (del orden de 12000 monstruos) se generan
+pools sintéticos a partir de las cartas reales, con ATK, atributo y tipo
+repartidos como en el catálogo. Para cada tamaño: tiempo de construcción
+del índice, pares resueltos por segundo con y sin índice y si los
+resultados coinciden.
+
+    python -m benchmarks.bench_indice_fusiones [tamaño ...]
+"""
+import random
+import sys
+import time
+
+from benchmarks.comun import crear_juego
+from modelo.fusionador import Fusionador
+
+PARES = 2000
+
+
+def pool_sintetico(cartas, tamanio, aleatorio):
+    """`tamanio` cartas de fusión con stats sacadas de las reales"""
+    atributos = sorted({c.atributo for c in cartas})
+    tipos = sorted({c.tipo for c in cartas})
+    pool = []
+    for i in range(tamanio):
+        carta = aleatorio.choice(cartas).instanciar()
+        carta.id = 10 ** 9 + i
+        carta.nombre = f"{carta.nombre} #{i}"
+        carta.atk = max(0, carta.atk + aleatorio.randrange(-500, 550, 50))
+        carta.atributo = aleatorio.choice(atributos)
+        carta.tipo = aleatorio.choice(tipos)
+        pool.append(carta)
+    return pool
+
+
+def resolver(fusionador, pares, pool):
+    inicio = time.perf_counter()
+    resultados = [fusionador.puede_fusionar(a, b, pool) for a, b in pares]
+    segundos = time.perf_counter() - inicio
+    return [(r.id, r.nombre) if r else None for r in resultados], len(pares) / segundos
+
+
+def main():
+    juego = crear_juego(turnos=0)
+    aleatorio = random.Random(1)
+    normales = juego.cartas_disponibles
+    reales = juego.cartas_fusion
+    base = normales + reales
+    pares = [(aleatorio.choice(normales), aleatorio.choice(normales)) for _ in range(PARES)]
+    tamanios = [int(n) for n in sys.argv[1:]] or [len(reales), 500, 2000, 12000]
+
+    print(f"{'pool':>6} {'índice ms':>9} {'pares/s lista':>14} {'pares/s índice':>15} "
+          f"{'mejora':>7} {'iguales':>8}")
+    for tamanio in tamanios:
+        pool = reales if tamanio == len(reales) else pool_sintetico(base, tamanio, aleatorio)
+        fusionador = Fusionador()
+
+        inicio = time.perf_counter()
+        fusionador.cargar_cartas_fusion(pool)
+        construccion = (time.perf_counter() - inicio) * 1000
+
+        # Con otra lista (una copia) el fusionador recorre la lista como antes
+        muestra = pares if tamanio <= 2000 else pares[:PARES // 10]
+        con_lista, velocidad_lista = resolver(fusionador, muestra, list(pool))
+        con_indice, velocidad_indice = resolver(fusionador, muestra, pool)
+        iguales = sum(a == b for a, b in zip(con_lista, con_indice))
+
+        print(f"{tamanio:>6} {construccion:>9.2f} {velocidad_lista:>14,.0f} {velocidad_indice:>15,.0f} "
+              f"{velocidad_indice / velocidad_lista:>6.1f}x {iguales:>4}/{len(muestra)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Enfrenta el motor MCTS contra Minimax (turnos completos, profundización
+iterativa) en partidas sin interfaz con el mismo presupuesto de tiempo por
+jugada. Cada semilla se juega dos veces cambiando quién empieza. Se
+reportan victorias y segundos de CPU usados por cada motor.
+
+    python -m benchmarks.bench_mcts [presupuesto_ms ...]
+"""
+import sys
+
+from benchmarks.comun import jugar_duelo
+from modelo.ia_mcts import IAMCTS
+from modelo.ia_minimax import IAMinimax
+from modelo.tabla_transposicion import TablaTransposicion
+
+SEMILLAS = (1, 2, 3, 4, 5)
+
+
+def crear_motores(presupuesto_ms, semilla):
+    mcts = IAMCTS(presupuesto_ms=presupuesto_ms, semilla=semilla)
+    minimax = IAMinimax(presupuesto_ms=presupuesto_ms, tabla_transposicion=TablaTransposicion(),
+                        turno_completo=True)
+    return {"mcts": mcts, "minimax": minimax}
+
+
+def main():
+    presupuestos = [int(p) for p in sys.argv[1:]] or [50, 200]
+
+    print(f"{'ms':>5} {'partidas':>8} {'mcts':>5} {'minimax':>7} {'empates':>7} "
+          f"{'cpu mcts':>9} {'cpu minimax':>11} {'victorias/cpu-s mcts':>21} {'minimax':>8}")
+
+    for presupuesto_ms in presupuestos:
+        victorias = {"mcts": 0, "minimax": 0}
+        cpu = {"mcts": 0.0, "minimax": 0.0}
+        empates = 0
+        partidas = 0
+
+        for semilla in SEMILLAS:
+            for orden in (("mcts", "minimax"), ("minimax", "mcts")):
+                motores = crear_motores(presupuesto_ms, semilla)
+                ganador, tiempos, _ = jugar_duelo([motores[n] for n in orden], semilla=semilla)
+
+                partidas += 1
+                for nombre, segundos in zip(orden, tiempos):
+                    cpu[nombre] += segundos
+                if ganador is None:
+                    empates += 1
+                else:
+                    victorias[orden[ganador]] += 1
+
+        por_cpu = {n: victorias[n] / cpu[n] if cpu[n] else 0.0 for n in cpu}
+        print(f"{presupuesto_ms:>5} {partidas:>8} {victorias['mcts']:>5} {victorias['minimax']:>7} "
+              f"{empates:>7} {cpu['mcts']:>9.1f} {cpu['minimax']:>11.1f} "
+              f"{por_cpu['mcts']:>21.3f} {por_cpu['minimax']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
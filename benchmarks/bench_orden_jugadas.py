@@ -0,0 +1,77 @@
+"""
+Efecto de cada heurística de orden de jugadas (MVV-LVA, jugadas asesinas,
+tabla de historia) por separado y juntas: nodos, cortes, fracción de
+cortes que da la primera jugada probada y si la jugada elegida cambia.
+
+    python -m benchmarks.bench_orden_jugadas [profundidad ...]
+"""
+import sys
+import time
+
+from benchmarks.comun import crear_juego, describir_accion
+from modelo.ia_minimax import IAMinimax
+from modelo.tabla_transposicion import TablaTransposicion
+
+SIN_ORDEN = {"mvv_lva": False, "jugadas_asesinas": False, "historia": False}
+
+VARIANTES = {
+    "generación": SIN_ORDEN,
+    "mvv-lva": dict(SIN_ORDEN, mvv_lva=True),
+    "asesinas": dict(SIN_ORDEN, jugadas_asesinas=True),
+    "historia": dict(SIN_ORDEN, historia=True),
+    "todas": {},
+}
+
+
+def medir(juego, **config):
+    """Retorna (jugada, nodos, cortes, cortes con la primera jugada, ms)"""
+    ia = IAMinimax(tabla_transposicion=TablaTransposicion(), **config)
+    ia.fusionador = juego.fusionador
+    ia.cartas_disponibles = juego.cartas_fusion
+
+    inicio = time.perf_counter()
+    accion = ia.elegir_mejor_jugada(juego.jugador_ia, juego.jugador_humano)
+    ms = (time.perf_counter() - inicio) * 1000
+
+    estadisticas = ia.estadisticas
+    return (describir_accion(accion), ia.nodos_visitados, estadisticas.cortes(),
+            estadisticas.cortes_primera_jugada, ms)
+
+
+def main():
+    profundidades = [int(p) for p in sys.argv[1:]] or [5, 6]
+    juegos = [crear_juego(semilla=s, turnos=t) for s, t in ((7, 4), (3, 6), (2, 5), (6, 4), (9, 5))]
+
+    # Profundización iterativa hasta la profundidad dada, sin límite de
+    # nodos: las asesinas y la historia aprenden de las iteraciones previas
+    print(f"{'prof':>4} {'orden':<11} {'nodos':>8} {'vs gen':>6} {'cortes':>7} "
+          f"{'1ª jugada':>9} {'ms':>8} {'misma jugada':>12}")
+
+    for profundidad in profundidades:
+        config = {"max_nodos": 10 ** 9, "profundidad_maxima": profundidad}
+        referencia = []
+        nodos_generacion = None
+
+        for nombre, opciones in VARIANTES.items():
+            nodos = cortes = primera = iguales = 0
+            ms = 0.0
+            for indice, juego in enumerate(juegos):
+                accion, n, c, p, t = medir(juego, **config, **opciones)
+                nodos += n
+                cortes += c
+                primera += p
+                ms += t
+                if nombre == "generación":
+                    referencia.append(accion)
+                iguales += accion == referencia[indice]
+
+            if nodos_generacion is None:
+                nodos_generacion = nodos
+            tasa = primera / cortes if cortes else 0.0
+            print(f"{profundidad:>4} {nombre:<11} {nodos:>8} {nodos / nodos_generacion:>6.2f} {cortes:>7} "
+                  f"{tasa:>9.2f} {ms:>8.1f} {f'{iguales}/{len(juegos)}':>12}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Escalado de la búsqueda paralela de la raíz según el número de procesos.
+Comprueba que cada configuración elige la misma jugada que la secuencial.
+
+El tablero es de medio juego con los campos llenos (5 cartas por lado y
+5 en cada mano) y se busca a profundidad fija 7, unos 40000 nodos: con
+el tablero de `crear_juego` la búsqueda completa son unos cientos de
+nodos y el costo de repartir las acciones entre procesos tapa cualquier
+ganancia. Por cada número de procesos se reportan nodos, segundos y
+nodos por segundo; la aceleración sólo puede aparecer con tantas CPUs
+como procesos.
+
+    python -m benchmarks.bench_paralelo [profundidad]
+"""
+import os
+import sys
+import time
+
+from benchmarks.comun import crear_juego, describir_accion
+from modelo.ia_minimax import IAMinimax
+from modelo.tabla_transposicion import TablaTransposicion
+
+
+def tablero_lleno(juego):
+    """Llena el campo de ambos jugadores con cartas de su deck en ataque"""
+    for jugador in (juego.jugador_ia, juego.jugador_humano):
+        while len(jugador.campo) < 5:
+            jugador.robar_carta()
+            jugador.jugar_carta(jugador.mano[-1], "ataque")
+    return juego
+
+
+def crear_ia(juego, profundidad, trabajadores):
+    ia = IAMinimax(profundidad=profundidad, tabla_transposicion=TablaTransposicion(),
+                   trabajadores=trabajadores)
+    ia.fusionador = juego.fusionador
+    ia.cartas_disponibles = juego.cartas_fusion
+    return ia
+
+
+def medir(ia, juego):
+    """Retorna (accion, nodos, segundos) de una búsqueda"""
+    inicio = time.perf_counter()
+    accion = ia.elegir_mejor_jugada(juego.jugador_ia, juego.jugador_humano)
+    return describir_accion(accion), ia.nodos_visitados, time.perf_counter() - inicio
+
+
+def main(profundidad=7):
+    juego = tablero_lleno(crear_juego(turnos=0))
+    print(juego.jugador_ia)
+    print(juego.jugador_humano)
+    print(f"CPUs: {os.cpu_count()}  profundidad: {profundidad}")
+    print()
+    print(f"{'procesos':>8} {'nodos':>9} {'seg':>8} {'nodos/s':>9} {'aceleración':>12}  jugada")
+    
+    serial = crear_ia(juego, profundidad, 1)
+    accion_serial, nodos, base = medir(serial, juego)
+    print(f"{'serial':>8} {nodos:>9} {base:>8.3f} {nodos / base:>9,.0f} {'x1.0':>12}  {accion_serial}")
+    
+    for trabajadores in (2, 4, 8):
+        # Una búsqueda corta arranca los procesos antes de medir
+        ia = crear_ia(juego, 1, trabajadores)
+        medir(ia, juego)
+        ia.profundidad = profundidad
+        accion, nodos, segundos = medir(ia, juego)
+        ia.cerrar()
+        
+        assert accion == accion_serial, "La búsqueda paralela eligió otra jugada"
+        print(f"{trabajadores:>8} {nodos:>9} {segundos:>8.3f} {nodos / segundos:>9,.0f} "
+              f"{'x%.1f' % (base / segundos):>12}  {accion}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
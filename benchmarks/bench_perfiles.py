@@ -0,0 +1,82 @@
+"""
+Perfiles de búsqueda selectiva (modelo/perfil_busqueda.py): profundidad
+alcanzada con el mismo presupuesto de nodos, reducciones de jugadas
+tardías (LMR) y duelos de cada perfil contra "normal" (los límites de
+antes) con el mismo presupuesto, cambiando quién empieza.
+
+    python -m benchmarks.bench_perfiles [max_nodos ...]
+"""
+import sys
+
+from benchmarks.comun import crear_juego, jugar_duelo
+from modelo.ia_minimax import IAMinimax
+from modelo.perfil_busqueda import PERFILES, PerfilBusqueda
+from modelo.tabla_transposicion import TablaTransposicion
+
+SEMILLAS = (1, 2, 3, 4, 5, 6)
+
+# "dificil" sin LMR, para separar el efecto del haz del de las reducciones
+DIFICIL_SIN_LMR = PerfilBusqueda("dificil sin LMR", PERFILES["dificil"].anchos,
+                                 max_acciones=PERFILES["dificil"].max_acciones)
+
+CANDIDATOS = [PERFILES["facil"], PERFILES["dificil"], DIFICIL_SIN_LMR]
+
+
+def medir_profundidad(juegos, perfil, max_nodos):
+    """(profundidad media alcanzada, reducciones, re-búsquedas de LMR)"""
+    profundidad = reducciones = re_busquedas = 0
+    for juego in juegos:
+        ia = IAMinimax(max_nodos=max_nodos, tabla_transposicion=TablaTransposicion(),
+                       perfil=perfil)
+        ia.fusionador = juego.fusionador
+        ia.cartas_disponibles = juego.cartas_fusion
+        ia.elegir_mejor_jugada(juego.jugador_ia, juego.jugador_humano)
+        profundidad += ia.profundidad_alcanzada
+        reducciones += ia.estadisticas.reducciones_lmr
+        re_busquedas += ia.estadisticas.re_busquedas_lmr
+    return profundidad / len(juegos), reducciones, re_busquedas
+
+
+def duelos(perfil, max_nodos):
+    """Resultados de `perfil` contra "normal" con el mismo presupuesto"""
+    resultados = {"gana": 0, "pierde": 0, "empate": 0}
+    for semilla in SEMILLAS:
+        for empieza in (0, 1):
+            candidata = IAMinimax(max_nodos=max_nodos, tabla_transposicion=TablaTransposicion(),
+                                  perfil=perfil)
+            referencia = IAMinimax(max_nodos=max_nodos, tabla_transposicion=TablaTransposicion())
+            agentes = [candidata, referencia] if empieza == 0 else [referencia, candidata]
+
+            ganador, _, _ = jugar_duelo(agentes, semilla=semilla)
+            if ganador is None:
+                resultados["empate"] += 1
+            elif ganador == empieza:
+                resultados["gana"] += 1
+            else:
+                resultados["pierde"] += 1
+    return resultados
+
+
+def main():
+    presupuestos = [int(n) for n in sys.argv[1:]] or [500, 2000]
+    juegos = [crear_juego(semilla=s, turnos=t) for s, t in ((7, 4), (3, 6), (2, 5), (6, 4))]
+
+    print(f"{'nodos':>6} {'perfil':<16} {'prof media':>10} {'reducidas':>9} {'re-busq':>7} "
+          f"{'gana':>5} {'pierde':>6} {'empate':>6}")
+
+    for max_nodos in presupuestos:
+        for perfil in [PERFILES["normal"]] + CANDIDATOS:
+            profundidad, reducciones, re_busquedas = medir_profundidad(juegos, perfil, max_nodos)
+            if perfil is PERFILES["normal"]:
+                marcador = "-"
+                fila = f"{marcador:>5} {marcador:>6} {marcador:>6}"
+            else:
+                r = duelos(perfil, max_nodos)
+                fila = f"{r['gana']:>5} {r['pierde']:>6} {r['empate']:>6}"
+            print(f"{max_nodos:>6} {perfil.nombre:<16} {profundidad:>10.2f} {reducciones:>9} "
+                  f"{re_busquedas:>7} {fila}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
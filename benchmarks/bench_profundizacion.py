@@ -0,0 +1,50 @@
+"""
+Profundización iterativa con presupuesto: profundidad alcanzada, nodos y
+tiempo real de pensamiento para distintos presupuestos en ms y en nodos.
+
+    python -m benchmarks.bench_profundizacion
+"""
+import time
+
+from benchmarks.comun import crear_juego, describir_accion
+from modelo.ia_minimax import IAMinimax
+from modelo.tabla_transposicion import TablaTransposicion
+
+
+def medir(juego, **config):
+    """Ejecuta una búsqueda y retorna (accion, profundidad, nodos, ms)"""
+    ia = IAMinimax(tabla_transposicion=TablaTransposicion(), **config)
+    ia.fusionador = juego.fusionador
+    ia.cartas_disponibles = juego.cartas_fusion
+    
+    inicio = time.perf_counter()
+    accion = ia.elegir_mejor_jugada(juego.jugador_ia, juego.jugador_humano)
+    ms = (time.perf_counter() - inicio) * 1000
+    
+    return describir_accion(accion), ia.profundidad_alcanzada, ia.nodos_visitados, ms
+
+
+def main():
+    for semilla, turnos in ((7, 4), (3, 8)):
+        juego = crear_juego(semilla=semilla, turnos=turnos)
+        print(juego.jugador_ia)
+        print(juego.jugador_humano)
+        print(f"{'presupuesto':>14} {'prof':>5} {'nodos':>8} {'ms':>8}  jugada")
+        
+        for presupuesto in (10, 50, 200, 500, 1000):
+            accion, prof, nodos, ms = medir(juego, presupuesto_ms=presupuesto)
+            print(f"{str(presupuesto) + ' ms':>14} {prof:>5} {nodos:>8} {ms:>8.1f}  {accion}")
+        
+        for nodos_max in (1000, 10000, 50000):
+            accion, prof, nodos, ms = medir(juego, max_nodos=nodos_max)
+            print(f"{str(nodos_max) + ' nodos':>14} {prof:>5} {nodos:>8} {ms:>8.1f}  {accion}")
+        
+        # Referencia: profundidad fija como antes
+        for profundidad in (2, 4):
+            accion, prof, nodos, ms = medir(juego, profundidad=profundidad)
+            print(f"{'fija ' + str(profundidad):>14} {prof:>5} {nodos:>8} {ms:>8.1f}  {accion}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Nodos visitados por alfa-beta con ventana completa (la búsqueda de antes),
+por la búsqueda de variación principal (PVS) y por PVS con ventanas de
+aspiración en la profundización iterativa. Se comprueba que las tres
+eligen la misma jugada.
+
+    python -m benchmarks.bench_pvs
+"""
+import time
+
+from benchmarks.comun import crear_juego, describir_accion
+from modelo.ia_minimax import VENTANA_ASPIRACION, IAMinimax
+from modelo.tabla_transposicion import TablaTransposicion
+
+VARIANTES = {
+    "alfa-beta": {"pvs": False, "ventana_aspiracion": None},
+    "pvs": {"pvs": True, "ventana_aspiracion": None},
+    "pvs+aspiración": {"pvs": True, "ventana_aspiracion": VENTANA_ASPIRACION},
+}
+
+
+def medir(juego, **config):
+    """Retorna (jugada, nodos, ms, re-búsquedas, fallos de aspiración)"""
+    ia = IAMinimax(tabla_transposicion=TablaTransposicion(), **config)
+    ia.fusionador = juego.fusionador
+    ia.cartas_disponibles = juego.cartas_fusion
+
+    inicio = time.perf_counter()
+    accion = ia.elegir_mejor_jugada(juego.jugador_ia, juego.jugador_humano)
+    ms = (time.perf_counter() - inicio) * 1000
+
+    estadisticas = ia.estadisticas
+    return (describir_accion(accion), ia.nodos_visitados, ms,
+            estadisticas.re_busquedas, estadisticas.fallos_aspiracion)
+
+
+def main():
+    juegos = [crear_juego(semilla=s, turnos=t) for s, t in ((7, 4), (3, 6), (2, 5), (6, 4))]
+
+    # Profundidad fija y profundización iterativa hasta esa profundidad
+    # (sin límite de nodos, para que todas lleguen igual de hondo)
+    busquedas = [(f"fija {p}", {"profundidad": p}) for p in (4, 5, 6)]
+    busquedas += [(f"iterativa {p}", {"max_nodos": 10 ** 9, "profundidad_maxima": p}) for p in (4, 5, 6)]
+
+    print(f"{'búsqueda':<13} {'variante':<15} {'nodos':>9} {'vs a-b':>7} {'ms':>9} "
+          f"{'re-busq':>7} {'fallos asp':>10} {'misma jugada':>12}")
+
+    for nombre, config in busquedas:
+        totales = {}
+        referencia = []
+        for variante, opciones in VARIANTES.items():
+            nodos = ms = re_busquedas = fallos = iguales = 0
+            for indice, juego in enumerate(juegos):
+                accion, n, t, r, f = medir(juego, **config, **opciones)
+                nodos += n
+                ms += t
+                re_busquedas += r
+                fallos += f
+                if variante == "alfa-beta":
+                    referencia.append(accion)
+                iguales += accion == referencia[indice]
+            totales[variante] = nodos
+
+            proporcion = nodos / totales["alfa-beta"]
+            print(f"{nombre:<13} {variante:<15} {nodos:>9} {proporcion:>7.2f} {ms:>9.1f} "
+                  f"{re_busquedas:>7} {fallos:>10} {f'{iguales}/{len(juegos)}':>12}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
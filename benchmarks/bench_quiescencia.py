@@ -0,0 +1,75 @@
+"""
+Fuerza por nodo de la búsqueda de quiescencia contra los bonus fijos de la
+raíz (+500 ataque directo, +100 atacar, +50 invocar). Cada configuración
+juega contra la IA de referencia (bonus, sin quiescencia) a la misma
+profundidad, cambiando quién empieza. Se reportan victorias, nodos por
+partida (incluidos los de quiescencia) y victorias por millón de nodos.
+
+    python -m benchmarks.bench_quiescencia [profundidad ...]
+"""
+import sys
+
+from benchmarks.comun import jugar_duelo
+from modelo.ia_minimax import IAMinimax
+
+SEMILLAS = (1, 2, 3, 4, 5, 6)
+
+CONFIGURACIONES = {
+    "bonus": {"quiescencia": False, "bonos_raiz": True},
+    "quiescencia": {"quiescencia": True, "bonos_raiz": False},
+    "ambos": {"quiescencia": True, "bonos_raiz": True},
+}
+
+
+class IAContada(IAMinimax):
+    """IAMinimax que acumula los nodos de todas sus búsquedas"""
+
+    nodos_totales = 0
+    nodos_en_quiescencia = 0
+
+    def elegir_mejor_jugada(self, ia_jugador, oponente, senal_detener=None):
+        jugada = super().elegir_mejor_jugada(ia_jugador, oponente, senal_detener)
+        self.nodos_totales += self.nodos_visitados
+        self.nodos_en_quiescencia += self.estadisticas.nodos_quiescencia
+        return jugada
+
+
+def main():
+    profundidades = [int(p) for p in sys.argv[1:]] or [2, 3]
+
+    print(f"{'prof':>4} {'config':<12} {'partidas':>8} {'gana':>5} {'pierde':>6} {'empate':>6} "
+          f"{'nodos/partida':>13} {'% quiesc':>8} {'vict/Mnodo':>10}")
+
+    for profundidad in profundidades:
+        for nombre, opciones in CONFIGURACIONES.items():
+            resultados = {"gana": 0, "pierde": 0, "empate": 0}
+            nodos = 0
+            nodos_quiescencia = 0
+            partidas = 0
+
+            for semilla in SEMILLAS:
+                for empieza in (0, 1):
+                    candidata = IAContada(profundidad=profundidad, **opciones)
+                    referencia = IAMinimax(profundidad=profundidad)
+                    agentes = [candidata, referencia] if empieza == 0 else [referencia, candidata]
+
+                    ganador, _, _ = jugar_duelo(agentes, semilla=semilla)
+                    partidas += 1
+                    nodos += candidata.nodos_totales
+                    nodos_quiescencia += candidata.nodos_en_quiescencia
+                    if ganador is None:
+                        resultados["empate"] += 1
+                    elif ganador == empieza:
+                        resultados["gana"] += 1
+                    else:
+                        resultados["pierde"] += 1
+
+            porcentaje = 100 * nodos_quiescencia / nodos if nodos else 0.0
+            por_nodo = resultados["gana"] / (nodos / 1e6) if nodos else 0.0
+            print(f"{profundidad:>4} {nombre:<12} {partidas:>8} {resultados['gana']:>5} "
+                  f"{resultados['pierde']:>6} {resultados['empate']:>6} {nodos // partidas:>13} "
+                  f"{porcentaje:>8.1f} {por_nodo:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
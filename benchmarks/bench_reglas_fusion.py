@@ -0,0 +1,83 @@
+"""
+Reglas de fusión compiladas (modelo/reglas_fusion.py): con cada vez más
+reglas, tiempo de compilación y pares resueltos por segundo, que no
+deberían bajar con el número de reglas.
+
+Se agregan fusiones por nombre entre cartas normales al azar y reglas por
+atributo y por tipo con valor y ventanas de ATK al azar (después de las
+de datos/reglas_fusion.json). Los pares se resuelven sin tabla de pares,
+así que cada par pasa por las reglas.
+
+    python -m benchmarks.bench_reglas_fusion [cantidad ...]
+"""
+import random
+import sys
+import time
+
+from benchmarks.comun import crear_juego
+from modelo.fusionador import Fusionador
+from modelo.reglas_fusion import RUTA_REGLAS, ReglasFusion
+
+PARES = 20000
+
+
+def reglas_sinteticas(base, cantidad, normales, pool, aleatorio):
+    """Las reglas del archivo más `cantidad` fusiones por nombre y `cantidad` reglas con valor"""
+    datos = {
+        "nombradas": [
+            {"cartas": [aleatorio.choice(normales).nombre, aleatorio.choice(normales).nombre],
+             "resultado": aleatorio.choice(pool).nombre}
+            for _ in range(cantidad)
+        ],
+        "reglas": [],
+    }
+    atributos = sorted({c.atributo for c in normales})
+    tipos = sorted({c.tipo for c in normales})
+    for _ in range(cantidad):
+        por = aleatorio.choice(("atributo", "tipo"))
+        minimo = aleatorio.choice((0.8, 0.9, 1.0))
+        datos["reglas"].append({
+            "por": por,
+            "valor": aleatorio.choice(atributos if por == "atributo" else tipos),
+            "atk_minimo": minimo,
+            "atk_maximo": minimo + aleatorio.choice((0.5, 1.0)),
+            "elegir": aleatorio.choice(("mas_fuerte", "mas_cercana")),
+        })
+    reglas = ReglasFusion(datos)
+    for par, resultado in base.nombradas.items():
+        reglas.nombradas.setdefault(par, resultado)
+    # Las reglas del archivo van primero; las sintéticas sólo se prueban si no dan carta
+    reglas.reglas = base.reglas + [r for r in reglas.reglas]
+    for orden, regla in enumerate(reglas.reglas):
+        regla.orden = orden
+    return reglas
+
+
+def main():
+    juego = crear_juego(turnos=0)
+    normales, pool = juego.cartas_disponibles, juego.cartas_fusion
+    cantidades = [int(n) for n in sys.argv[1:]] or [0, 100, 1000, 10000]
+    base = ReglasFusion.cargar(RUTA_REGLAS)
+    aleatorio = random.Random(1)
+    pares = [(aleatorio.choice(normales), aleatorio.choice(normales)) for _ in range(PARES)]
+
+    print(f"{'reglas':>7} {'compilar ms':>11} {'pares por id':>12} {'pares/s':>10}")
+    for cantidad in cantidades:
+        reglas = reglas_sinteticas(base, cantidad, normales, pool, random.Random(cantidad))
+        fusionador = Fusionador(reglas)
+
+        inicio = time.perf_counter()
+        fusionador.cargar_cartas_fusion(pool, normales)
+        compilar = (time.perf_counter() - inicio) * 1000
+
+        inicio = time.perf_counter()
+        for carta1, carta2 in pares:
+            fusionador.resultado_fusion(carta1, carta2, pool)
+        velocidad = len(pares) / (time.perf_counter() - inicio)
+
+        total = len(reglas.nombradas) + len(reglas.reglas)
+        print(f"{total:>7} {compilar:>11.1f} {len(fusionador.compiladas.por_ids):>12} {velocidad:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
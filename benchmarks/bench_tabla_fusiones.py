@@ -0,0 +1,77 @@
+"""
+Tabla de pares de fusión precalculada (Fusionador.cargar_tabla_fusiones):
+tiempo de construcción, tamaño en disco, tiempo de lectura cuando ya
+existe y pares resueltos por segundo con y sin tabla.
+
+Se mide el conjunto por defecto (100 cartas normales y 50 de fusión) y
+conjuntos sintéticos más grandes; para la base completa de la API (del
+orden de 12000 monstruos, que no se descarga aquí) la construcción se
+extrapola con los pares por segundo medidos y el tamaño es exacto:
+n(n+1)/2 posiciones de 2 bytes.
+
+    python -m benchmarks.bench_tabla_fusiones
+"""
+import random
+import tempfile
+import time
+
+from benchmarks.bench_indice_fusiones import pool_sintetico
+from benchmarks.comun import crear_juego
+from modelo.fusionador import Fusionador
+
+CATALOGO_COMPLETO = 12000
+PARES_MEDIDOS = 5000
+
+
+def pares_por_segundo(fusionador, normales, pool, aleatorio):
+    pares = [(aleatorio.choice(normales), aleatorio.choice(normales)) for _ in range(PARES_MEDIDOS)]
+    inicio = time.perf_counter()
+    for carta1, carta2 in pares:
+        fusionador.puede_fusionar(carta1, carta2, pool)
+    return len(pares) / (time.perf_counter() - inicio)
+
+
+def medir(normales, pool, directorio, aleatorio):
+    fusionador = Fusionador()
+    fusionador.cargar_cartas_fusion(pool)
+    sin_tabla = pares_por_segundo(fusionador, normales, pool, aleatorio)
+
+    construccion = fusionador.cargar_tabla_fusiones(normales, directorio)
+    lectura = Fusionador()
+    lectura.cargar_cartas_fusion(pool)
+    leida = lectura.cargar_tabla_fusiones(normales, directorio)
+    con_tabla = pares_por_segundo(fusionador, normales, pool, aleatorio)
+    return construccion, leida, sin_tabla, con_tabla
+
+
+def main():
+    juego = crear_juego(turnos=0, tamanio_deck=20)
+    aleatorio = random.Random(1)
+    base = juego.cartas_disponibles + juego.cartas_fusion
+
+    conjuntos = [("por defecto", juego.cartas_disponibles, juego.cartas_fusion)]
+    for normales, fusion in ((500, 500), (1500, 2000)):
+        sinteticas = pool_sintetico(base, normales, aleatorio)
+        for i, carta in enumerate(sinteticas):
+            carta.id = 2 * 10 ** 9 + i
+        conjuntos.append(("sintético", sinteticas, pool_sintetico(base, fusion, aleatorio)))
+
+    print(f"{'conjunto':<12} {'normales':>8} {'fusión':>6} {'pares':>10} {'KB':>9} "
+          f"{'construir ms':>12} {'leer ms':>8} {'pares/s sin':>12} {'pares/s con':>12}")
+    velocidad_construccion = None
+    with tempfile.TemporaryDirectory() as directorio:
+        for nombre, normales, pool in conjuntos:
+            construccion, leida, sin_tabla, con_tabla = medir(normales, pool, directorio, aleatorio)
+            velocidad_construccion = construccion["pares"] / (construccion["ms"] / 1000)
+            print(f"{nombre:<12} {len(normales):>8} {len(pool):>6} {construccion['pares']:>10,} "
+                  f"{construccion['bytes'] / 1024:>9,.1f} {construccion['ms']:>12,.0f} "
+                  f"{leida['ms']:>8,.1f} {sin_tabla:>12,.0f} {con_tabla:>12,.0f}")
+
+    pares = CATALOGO_COMPLETO * (CATALOGO_COMPLETO + 1) // 2
+    print()
+    print(f"Base completa (~{CATALOGO_COMPLETO} normales, extrapolado): {pares:,} pares, "
+          f"{pares * 2 / 2 ** 20:,.0f} MB, construcción ~{pares / velocidad_construccion / 60:,.0f} min")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Mide el efecto de la tabla de transposición (Zobrist) en IAMinimax:
+nodos visitados, tiempo y aciertos/fallos en profundidades 2 a 6.
+
+    python -m benchmarks.bench_tabla_transposicion
+"""
+import time
+
+from benchmarks.comun import crear_juego, describir_accion
+from modelo.ia_minimax import IAMinimax
+from modelo.tabla_transposicion import TablaTransposicion
+
+
+def medir(juego, profundidad, tabla):
+    """Ejecuta una búsqueda completa y retorna (accion, nodos, segundos)"""
+    ia = IAMinimax(profundidad=profundidad, tabla_transposicion=tabla)
+    ia.fusionador = juego.fusionador
+    ia.cartas_disponibles = juego.cartas_fusion
+    
+    inicio = time.perf_counter()
+    accion = ia.elegir_mejor_jugada(juego.jugador_ia, juego.jugador_humano)
+    segundos = time.perf_counter() - inicio
+    
+    return describir_accion(accion), ia.nodos_visitados, segundos
+
+
+def main():
+    juego = crear_juego()
+    print(juego.jugador_ia)
+    print(juego.jugador_humano)
+    print()
+    print(f"{'prof':>4} {'tabla':>6} {'nodos':>9} {'seg':>8} {'aciertos':>9} {'fallos':>9}  jugada")
+    
+    for profundidad in range(2, 7):
+        accion_sin, nodos_sin, seg_sin = medir(juego, profundidad, None)
+        print(f"{profundidad:>4} {'no':>6} {nodos_sin:>9} {seg_sin:>8.3f} {'-':>9} {'-':>9}  {accion_sin}")
+        
+        tabla = TablaTransposicion()
+        accion_con, nodos_con, seg_con = medir(juego, profundidad, tabla)
+        print(f"{profundidad:>4} {'si':>6} {nodos_con:>9} {seg_con:>8.3f} {tabla.aciertos:>9} {tabla.fallos:>9}  {accion_con}")
+        
+        assert accion_sin == accion_con, "La tabla cambió la jugada elegida"
+        print(f"     nodos: -{100 * (1 - nodos_con / nodos_sin):.0f}%  tiempo: x{seg_sin / seg_con:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Compara la búsqueda de una sola acción por turno contra la búsqueda de
+turnos completos (secuencias de acciones con las banderas por turno):
+nodos, secuencias generadas/fusionadas, latencia y valor del estado tras
+ejecutar el turno elegido.
+
+    python -m benchmarks.bench_turno_completo
+"""
+import time
+
+from benchmarks.comun import crear_juego, describir_accion
+from modelo.ia_minimax import IAMinimax
+from modelo.tabla_transposicion import TablaTransposicion
+
+
+def medir(juego, turno_completo, profundidad):
+    ia = IAMinimax(profundidad=profundidad, tabla_transposicion=TablaTransposicion(),
+                   turno_completo=turno_completo)
+    ia.fusionador = juego.fusionador
+    ia.cartas_disponibles = juego.cartas_fusion
+    
+    inicio = time.perf_counter()
+    accion = ia.elegir_mejor_jugada(juego.jugador_ia, juego.jugador_humano)
+    ms = (time.perf_counter() - inicio) * 1000
+    
+    # Valor estático del tablero tras ejecutar la jugada elegida
+    ia_clon, humano_clon = juego.jugador_ia.clonar(), juego.jugador_humano.clonar()
+    ia._aplicar_accion(ia_clon, humano_clon, accion)
+    valor = ia.evaluar_estado(ia_clon, humano_clon)
+    
+    return accion, ia, ms, valor
+
+
+def main():
+    print(f"{'partida':>8} {'modo':>7} {'prof':>4} {'nodos':>8} {'secuencias':>10} "
+          f"{'fusionadas':>10} {'ms':>8} {'valor':>8}  jugada")
+    
+    for semilla, turnos in ((7, 4), (3, 6), (11, 8)):
+        juego = crear_juego(semilla=semilla, turnos=turnos)
+        
+        for turno_completo, profundidad in ((False, 2), (False, 4), (True, 1), (True, 2)):
+            accion, ia, ms, valor = medir(juego, turno_completo, profundidad)
+            modo = "turno" if turno_completo else "acción"
+            print(f"{semilla:>8} {modo:>7} {profundidad:>4} {ia.nodos_visitados:>8} "
+                  f"{ia.secuencias_generadas:>10} {ia.secuencias_fusionadas:>10} {ms:>8.1f} "
+                  f"{valor:>8.0f}  {describir_accion(accion)}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
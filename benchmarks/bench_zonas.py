@@ -0,0 +1,67 @@
+"""
+Búsqueda de cartas por uid en las zonas (modelo/zona.py) contra el
+recorrido por nombre que hacían antes `_aplicar_accion` y Juego, y
+acciones aplicadas y deshechas por segundo sobre posiciones con copias.
+
+    python -m benchmarks.bench_zonas
+"""
+import time
+
+from benchmarks.bench_acciones_canonicas import recolectar_posiciones
+from benchmarks.comun import crear_juego
+from modelo.ia_minimax import IAMinimax
+from modelo.zona import Zona
+
+REPETICIONES = 20000
+
+
+def por_segundo(funcion, cantidad, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return cantidad * repeticiones / (time.perf_counter() - inicio)
+
+
+def main():
+    juego = crear_juego(turnos=0)
+
+    print(f"{'cartas':>6} {'por nombre/s':>14} {'por uid/s':>14}")
+    for tamanio in (5, 10, 20):
+        cartas = [c.instanciar() for c in juego.cartas_disponibles[:tamanio]]
+        lista, zona = list(cartas), Zona(cartas)
+
+        def por_nombre():
+            for carta in cartas:
+                next((c for c in lista if c.nombre == carta.nombre), None)
+
+        def por_uid():
+            for carta in cartas:
+                zona.buscar(carta.uid)
+
+        nombre = por_segundo(por_nombre, tamanio, REPETICIONES // tamanio)
+        uid = por_segundo(por_uid, tamanio, REPETICIONES // tamanio)
+        print(f"{tamanio:>6} {nombre:>14,.0f} {uid:>14,.0f}")
+
+    ia = IAMinimax()
+    ia.fusionador = juego.fusionador
+    ia.cartas_disponibles = juego.cartas_fusion
+
+    print()
+    print(f"{'copias':>6} {'acciones':>8} {'aplicar+deshacer/s':>18}")
+    for copias in (1, 2):
+        posiciones = [p for semilla in (1, 2, 3)
+                      for p in recolectar_posiciones(juego, copias, semilla)]
+        jugadas = [(j, r, a) for j, r in posiciones for a in ia._generar_acciones(j, r)]
+
+        def aplicar_y_deshacer():
+            for jugador, rival, accion in jugadas:
+                registro = []
+                ia._aplicar_accion(jugador, rival, accion, registro)
+                ia._deshacer_accion(registro)
+
+        velocidad = por_segundo(aplicar_y_deshacer, len(jugadas), 50)
+        print(f"{copias:>6} {len(jugadas):>8} {velocidad:>18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
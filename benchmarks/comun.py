@@ -0,0 +1,105 @@
+"""
+Utilidades compartidas por los scripts de benchmark.
+
+Los scripts se ejecutan desde la raíz del repositorio como módulos, por ejemplo:
+
+    python -m benchmarks.bench_deshacer
+"""
+import contextlib
+import io
+import random
+import time
+
+from controlador.controlador import Controlador
+
+
+def crear_juego(semilla=7, tamanio_deck=20, turnos=4):
+    """
+    Crea un juego reproducible y lo avanza algunos turnos para obtener
+    un tablero de medio juego (cartas en ambos campos y manos llenas).
+    """
+    random.seed(semilla)
+    
+    # Silenciar los mensajes del controlador y del historial
+    with contextlib.redirect_stdout(io.StringIO()):
+        controlador = Controlador()
+        controlador.cargar_cartas_desde_json()
+        juego = controlador.inicializar_juego(tamanio_deck)
+        
+        for _ in range(turnos):
+            if juego.ganador:
+                break
+            
+            # El humano invoca su carta más fuerte y termina el turno
+            humano = juego.jugador_humano
+            if humano.puede_jugar_carta():
+                carta = max(humano.mano, key=lambda c: c.atk)
+                juego.jugar_carta_humano(carta, "ataque")
+            
+            juego.cambiar_turno()
+    
+    return juego
+
+
+def describir_accion(accion):
+    """Representación legible y comparable de una acción"""
+    if accion is None:
+        return "ninguna"
+    
+    tipo, datos = accion
+    if tipo == "turno":
+        return " ; ".join(describir_accion(a) for a in datos) or "pasar turno"
+    if tipo == "jugar":
+        return f"jugar {datos[0].nombre} ({datos[1]})"
+    if tipo == "atacar":
+        return f"atacar {datos[0].nombre} -> {datos[1].nombre}"
+    if tipo == "fusionar":
+        return f"fusionar {datos[0].nombre} + {datos[1].nombre} = {datos[2].nombre}"
+    if tipo == "cadena":
+        return "cadena " + " + ".join([datos[0][0].nombre] + [p[1].nombre for p in datos]) \
+            + f" = {datos[-1][2].nombre}"
+    if tipo in ("ataque_directo", "cambiar_posicion"):
+        return f"{tipo} {datos.nombre}"
+    return tipo
+
+
+def jugar_duelo(agentes, semilla=7, tamanio_deck=20, max_turnos=80):
+    """
+    Enfrenta dos IAs sin interfaz, turno por turno, con las reglas de la
+    búsqueda. El agente 0 ocupa el lugar del humano (empieza) y el 1 el de
+    la IA. Cada turno el agente juega la jugada que retorna
+    `elegir_mejor_jugada` (un turno completo o una sola acción).
+    
+    Retorna (índice del ganador o None si se alcanza `max_turnos`,
+    segundos de CPU usados por cada agente, turnos jugados).
+    """
+    from modelo.ia_minimax import IAMinimax
+    
+    juego = crear_juego(semilla=semilla, tamanio_deck=tamanio_deck, turnos=0)
+    jugadores = [juego.jugador_humano.clonar(), juego.jugador_ia.clonar()]
+    for agente in agentes:
+        agente.fusionador = juego.fusionador
+        agente.cartas_disponibles = juego.cartas_fusion
+    
+    reglas = IAMinimax()
+    tiempos = [0.0, 0.0]
+    
+    for turno in range(max_turnos):
+        indice = turno % 2
+        jugador, rival = jugadores[indice], jugadores[1 - indice]
+        
+        # El primer jugador no roba en su primer turno (igual que en Juego)
+        if turno > 0:
+            jugador.robar_carta()
+        
+        inicio = time.process_time()
+        accion = agentes[indice].elegir_mejor_jugada(jugador, rival)
+        tiempos[indice] += time.process_time() - inicio
+        
+        reglas._aplicar_accion(jugador, rival, accion)
+        
+        for posible, derrotado in ((indice, rival), (1 - indice, jugador)):
+            if derrotado.esta_derrotado():
+                return posible, tiempos, turno + 1
+    
+    return None, tiempos, max_turnos
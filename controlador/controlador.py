@@ -123,6 +123,11 @@ class Controlador:
         if cartas_fusion:
             self.juego.cargar_cartas_fusion(cartas_fusion)
             print(f" Cartas de fusión cargadas en el juego")
+            info = self.juego.info_tabla_fusiones
+            if info:
+                origen = "construida" if info["construida"] else "leída"
+                print(f" Tabla de fusiones {origen} en {info['ms']:.0f} ms "
+                      f"({info['pares']} pares, {info['bytes'] / 1024:.1f} KB)")
         else:
             print(f" No se pudieron cargar cartas de fusión")
         
@@ -4,6 +4,8 @@ from tkinter import simpledialog
 from tkinter import scrolledtext
 from PIL import Image, ImageTk, ImageOps
 import os
+import queue
+import threading
 
 class InterfazYuGiOh:
     """
@@ -35,6 +37,13 @@ class InterfazYuGiOh:
         # Cache de imágenes
         self.imagenes_cache = {}
 
+        # Turno de la IA en segundo plano (ver terminar_turno)
+        self._hilo_ia = None
+        self._senal_ia = None
+        self._cola_ia = queue.Queue()
+        self._id_revision_ia = None
+        self._puntos_pensando = 0
+
         self.juego.root = self.root
 
         # conectar callback del juego
@@ -281,7 +290,13 @@ class InterfazYuGiOh:
             command=self.terminar_turno, width=20,
             bg="#27ae60", fg="white"
         )
-        self.btn_terminar_turno.pack(pady=(8,12), anchor="e")
+        self.btn_terminar_turno.pack(pady=(8,6), anchor="e")
+
+        self.btn_detener_ia = tk.Button(
+            ctrl_frame, text="Detener IA (jugar ya)",
+            command=self.detener_turno_ia, width=20, state=tk.DISABLED
+        )
+        self.btn_detener_ia.pack(pady=(0,12), anchor="e")
 
         # Log de batalla
         tk.Label(
@@ -475,7 +490,7 @@ class InterfazYuGiOh:
             for w in slot.winfo_children(): w.destroy()
             
             # Resaltar si está seleccionada
-            if self.carta_seleccionada and carta.nombre == self.carta_seleccionada.nombre:
+            if self.carta_seleccionada and carta.uid == self.carta_seleccionada.uid:
                 slot.config(bg="#1a4a1a", relief=tk.GROOVE, bd=3)
             elif self.modo_seleccion == "cambiar_posicion":
                 slot.config(bg="#3a3a1a", relief=tk.GROOVE, bd=2)
@@ -755,12 +770,79 @@ class InterfazYuGiOh:
             return
         
         self.cancelar_accion()
-        self.juego.cambiar_turno()
+
+        # El juego se modifica sólo en este hilo (preparar y aplicar); la
+        # búsqueda corre en otro hilo sobre una copia del estado y su
+        # resultado vuelve por una cola que se revisa con root.after.
+        ia_jugador, humano = self.juego.preparar_turno_ia()
+        self._senal_ia = threading.Event()
+        self._hilo_ia = threading.Thread(
+            target=self._calcular_turno_ia,
+            args=(ia_jugador, humano, self._senal_ia, self._cola_ia),
+            daemon=True,
+        )
+        self._hilo_ia.start()
+
+        self._puntos_pensando = 0
+        self.btn_detener_ia.config(state=tk.NORMAL, bg="#e67e22", fg="white")
+        self.actualizar_botones_acciones()
+        self._id_revision_ia = self.root.after(50, self._revisar_turno_ia)
+
+    def _calcular_turno_ia(self, ia_jugador, humano, senal, cola):
+        """Hilo de la IA: sólo calcula, nunca toca el juego ni los widgets"""
+        try:
+            cola.put((self.juego.calcular_turno_ia(ia_jugador, humano, senal), None))
+        except Exception as e:
+            cola.put((None, e))
+
+    def _revisar_turno_ia(self):
+        """Aplica la jugada de la IA cuando el hilo la entrega"""
+        self._id_revision_ia = None
+        try:
+            accion, error = self._cola_ia.get_nowait()
+        except queue.Empty:
+            self._puntos_pensando = (self._puntos_pensando + 1) % 4
+            self.label_estado.config(text="IA pensando" + "." * self._puntos_pensando)
+            self._id_revision_ia = self.root.after(100, self._revisar_turno_ia)
+            return
+
+        self._hilo_ia.join()
+        self._terminar_hilo_ia()
+        if error is not None:
+            self.juego.agregar_historial(f"Error en la búsqueda de la IA: {error}")
+
+        self.juego.aplicar_turno_ia(accion)
         try:
             self.actualizar_interfaz()
         except Exception:
             pass
 
+    def detener_turno_ia(self):
+        """La IA deja de pensar y juega la mejor jugada que tenga"""
+        if self._senal_ia is not None:
+            self._senal_ia.set()
+            self.btn_detener_ia.config(state=tk.DISABLED)
+
+    def _abortar_turno_ia(self):
+        """Descarta la búsqueda en curso (p. ej. al reiniciar) sin aplicar su jugada"""
+        if self._hilo_ia is not None:
+            self._senal_ia.set()
+            self._hilo_ia.join()
+            self._terminar_hilo_ia()
+
+            # La jugada que alcanzó a entregar el hilo ya no sirve
+            while not self._cola_ia.empty():
+                self._cola_ia.get_nowait()
+
+    def _terminar_hilo_ia(self):
+        if self._id_revision_ia is not None:
+            self.root.after_cancel(self._id_revision_ia)
+            self._id_revision_ia = None
+        self._hilo_ia = None
+        self._senal_ia = None
+        self.label_estado.config(text="")
+        self.btn_detener_ia.config(state=tk.DISABLED, bg="#f0f0f0", fg="black")
+
     def _abrir_config_deck(self):
         """Pide al usuario el tamaño del deck"""
         current = getattr(self.juego, "tamanio_deck", 20)
@@ -773,6 +855,7 @@ class InterfazYuGiOh:
         """Reinicia el juego, limpia visuales y fuerza el estado lógico a 0"""
         
         # 1. Cancelar cualquier acción pendiente primero
+        self._abortar_turno_ia()
         self.cancelar_accion() 
 
         # 2. Resetear variables de control de la interfaz
@@ -853,8 +936,9 @@ class InterfazYuGiOh:
             messagebox.showwarning("Sin fusiones", "No hay cartas de fusión disponibles en el sistema.\n\nAsegúrate de que fusiones.json esté cargado correctamente.")
             return
         
-        # Obtener fusiones posibles usando las cartas de fusión
-        fusiones_posibles = self.juego.fusionador.obtener_fusiones_posibles(
+        # Obtener fusiones posibles usando las cartas de fusión (las de
+        # mayor ATK primero)
+        fusiones_posibles = self.juego.fusionador.obtener_fusiones_ordenadas(
             self.juego.jugador_humano.mano,
             cartas_fusion_disponibles  # Usar cartas violetas
         )
@@ -871,10 +955,13 @@ class InterfazYuGiOh:
             messagebox.showinfo("Sin fusiones", mensaje)
             return
         
+        # Cadenas de dos o más fusiones sugeridas por el planificador
+        cadenas = self.juego.sugerir_cadenas_fusion()
+        
         # Mostrar ventana de selección de fusión
-        self._mostrar_ventana_fusiones(fusiones_posibles)
+        self._mostrar_ventana_fusiones(fusiones_posibles, cadenas)
     
-    def _mostrar_ventana_fusiones(self, fusiones_posibles):
+    def _mostrar_ventana_fusiones(self, fusiones_posibles, cadenas=()):
         """Muestra una ventana con todas las fusiones disponibles"""
         ventana = tk.Toplevel(self.root)
         ventana.title(" Fusiones Disponibles")
@@ -907,6 +994,32 @@ class InterfazYuGiOh:
         canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Cadenas sugeridas (primero: suelen dar la carta más fuerte)
+        for cadena in cadenas:
+            cadena_frame = tk.Frame(scroll_frame, bg="#1a0a2a", relief=tk.RAISED, bd=2)
+            cadena_frame.pack(fill=tk.X, padx=10, pady=8)
+            
+            resultado = cadena[-1][2]
+            nombres = " + ".join([cadena[0][0].nombre] + [paso[1].nombre for paso in cadena])
+            tk.Label(cadena_frame, text=f"Cadena de {len(cadena)} fusiones", bg="#1a0a2a", fg="#ffcc00",
+                     font=("Helvetica", 10, "bold")).pack(anchor="w", padx=10, pady=(8, 0))
+            tk.Label(cadena_frame, text=nombres, bg="#1a0a2a", fg="#cfe7ff", font=("Helvetica", 9),
+                     wraplength=620, justify=tk.LEFT).pack(anchor="w", padx=10)
+            tk.Label(cadena_frame, text=f"→ {resultado.nombre} (ATK: {resultado.atk} | DEF: {resultado.defensa})",
+                     bg="#1a0a2a", fg="#00ff00", font=("Helvetica", 9, "bold")).pack(anchor="w", padx=10)
+            
+            def make_cadena_handler(pasos=cadena, win=ventana):
+                return lambda: self._ejecutar_cadena(pasos, win)
+            
+            tk.Button(
+                cadena_frame,
+                text=" Realizar Cadena",
+                command=make_cadena_handler(),
+                bg="#8e44ad",
+                fg="white",
+                font=("Helvetica", 10, "bold")
+            ).pack(pady=5)
+        
         # Mostrar cada fusión
         for idx, (carta1, carta2, resultado) in enumerate(fusiones_posibles):
             fusion_frame = tk.Frame(scroll_frame, bg="#0a1a2a", relief=tk.RAISED, bd=2)
@@ -976,6 +1089,25 @@ class InterfazYuGiOh:
             width=20
         ).pack(pady=10)
     
+    def _ejecutar_cadena(self, cadena, ventana):
+        """Ejecuta la cadena de fusiones seleccionada"""
+        exito, msg = self.juego.fusionar_cadena(cadena)
+        
+        if exito:
+            ventana.destroy()
+            messagebox.showinfo(
+                "Fusión Exitosa",
+                f"Has encadenado {len(cadena)} fusiones\n\n"
+                f"Resultado: {msg.nombre}\n"
+                f"ATK: {msg.atk} | DEF: {msg.defensa}"
+            )
+            try:
+                self.actualizar_interfaz()
+            except Exception:
+                pass
+        else:
+            messagebox.showerror("Error", msg)
+    
     def _ejecutar_fusion(self, carta1, carta2, resultado, ventana):
         """Ejecuta la fusión seleccionada"""
         exito, msg = self.juego.fusionar_cartas(carta1, carta2)
@@ -0,0 +1,330 @@
+"""
+Búsqueda Minimax repartida entre varios procesos.
+
+Las acciones de la raíz se reparten entre un pool de `concurrent.futures`.
+Cada proceso reconstruye el estado desde su forma compacta, busca su acción
+con la mejor cota alfa conocida hasta el momento (compartida entre todos los
+procesos) y la actualiza al terminar. La señal para detener la IA también
+se comparte: si se activa mientras buscan, los trabajadores se detienen.
+"""
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from modelo.estadisticas import EstadisticasBusqueda
+from modelo.estado_compacto import codificar_carta, codificar_jugador, decodificar_carta, decodificar_jugador
+from modelo.fusionador import Fusionador
+from modelo.ia_minimax import IAMinimax, BusquedaInterrumpida
+from modelo.planificador_fusiones import PlanificadorFusiones
+from modelo.tabla_transposicion import TablaTransposicion
+
+# Cada cuánto se revisa la señal de detener de la IA mientras se espera a
+# los trabajadores
+ESPERA_SENAL_S = 0.02
+
+# Estado propio de cada proceso trabajador
+_ia_trabajador = None
+_alfa_compartido = None
+
+
+class AccionNoEncontrada(Exception):
+    """El trabajador no genera la acción de la raíz que se le pidió buscar"""
+
+
+def _inicializar_trabajador(configuracion, fusiones, alfa_compartido, detener):
+    """Crea, una sola vez por proceso, la IA que buscará las acciones"""
+    global _ia_trabajador, _alfa_compartido
+
+    configuracion = dict(configuracion)
+    tamanio_tabla = configuracion.pop("tamanio_tabla")
+    politica = configuracion.pop("politica_tabla")
+    if tamanio_tabla:
+        configuracion["tabla_transposicion"] = TablaTransposicion(tamanio_tabla, politica)
+    cadenas = configuracion.pop("cadenas")
+    if cadenas is not None:
+        largo_maximo, limite_ms = cadenas
+        configuracion["planificador_fusiones"] = PlanificadorFusiones(largo_maximo, limite_ms)
+
+    # Mismas reglas, mismo pool, mismas cartas normales y, si el proceso
+    # principal la tiene, la misma tabla de pares (ya está en disco: sólo
+    # se lee). Las reglas viajan ya leídas: pueden venir de otro archivo
+    # que el por defecto
+    cartas = [decodificar_carta(c) for c in fusiones["cartas_fusion"]]
+    normales = [decodificar_carta(c) for c in fusiones["cartas_normales"]]
+    fusionador = Fusionador(fusiones["reglas"]) if fusiones["reglas"] is not None else Fusionador()
+    fusionador.cargar_cartas_fusion(cartas, normales)
+    if fusiones["directorio_tabla"] is not None:
+        fusionador.cargar_tabla_fusiones(normales, fusiones["directorio_tabla"])
+
+    _ia_trabajador = IAMinimax(**configuracion)
+    _ia_trabajador.fusionador = fusionador
+    _ia_trabajador.cartas_disponibles = cartas
+    # `_verificar_presupuesto` la consulta igual que a un threading.Event
+    _ia_trabajador._senal_detener = detener
+    _alfa_compartido = alfa_compartido
+
+
+def _evaluar_accion_raiz(estado, clave_accion, profundidad, limite_reloj):
+    """
+    Busca una acción de la raíz en el proceso trabajador.
+
+    Retorna (valor con bono, nodos visitados, si alguna rama llegó al
+    horizonte, contadores de estadísticas); el valor es None si se agotó
+    el tiempo antes de terminar. Lanza AccionNoEncontrada si la acción no
+    está entre las que genera el trabajador.
+    """
+    ia = _ia_trabajador
+    ia_jugador = decodificar_jugador(estado[0])
+    oponente = decodificar_jugador(estado[1])
+
+    accion = None
+    for candidata in ia._acciones_raiz(ia_jugador, oponente):
+        if ia._clave_accion(candidata) == clave_accion:
+            accion = candidata
+            break
+    if accion is None:
+        raise AccionNoEncontrada(clave_accion)
+    bono = ia._bono_raiz(accion)
+
+    ia.nodos_visitados = 0
+    ia._alcanzo_horizonte = False
+    ia._iniciar_totales(ia_jugador, oponente)
+    ia.estadisticas = EstadisticasBusqueda()
+    inicio = time.perf_counter()
+    ia._profundidad_busqueda = profundidad
+    ia._lineas = {}
+    if limite_reloj is not None:
+        ia._limite_tiempo = time.perf_counter() + (limite_reloj - time.time())
+
+    # Con un punto de margen, un valor que no supera la cota es
+    # estrictamente peor que el mejor conocido y nunca empata con él
+    alfa = _alfa_compartido.value - bono - 1
+
+    try:
+        valor = ia._evaluar_hijo(ia_jugador, oponente, accion, True, profundidad - 1, alfa, math.inf) + bono
+    except BusquedaInterrumpida:
+        return None, ia.nodos_visitados, ia._alcanzo_horizonte, ia.estadisticas.contadores()
+    finally:
+        ia._limite_tiempo = None
+
+    ia.estadisticas.registrar_tiempo_accion(clave_accion, (time.perf_counter() - inicio) * 1000)
+
+    with _alfa_compartido.get_lock():
+        if valor > _alfa_compartido.value:
+            _alfa_compartido.value = valor
+
+    return valor, ia.nodos_visitados, ia._alcanzo_horizonte, ia.estadisticas.contadores()
+
+
+def _buscar_determinizacion(estado, presupuesto_ms, max_nodos):
+    """
+    Busca una determinización completa en el proceso trabajador.
+
+    Retorna (valores de las acciones de la raíz por clave en cada
+    profundidad completa, nodos visitados, profundidad alcanzada, si el
+    árbol quedó completo, contadores de estadísticas).
+    """
+    ia = _ia_trabajador
+    ia_jugador = decodificar_jugador(estado[0])
+    oponente = decodificar_jugador(estado[1])
+
+    ia.nodos_visitados = 0
+    ia.estadisticas = EstadisticasBusqueda()
+    if ia.tabla is not None:
+        ia.tabla.nueva_busqueda()
+    ia._buscar(ia_jugador, oponente, presupuesto_ms, max_nodos)
+    return (ia.valores_por_profundidad, ia.nodos_visitados, ia.profundidad_alcanzada,
+            ia._arbol_completo, ia.estadisticas.contadores())
+
+
+class BusquedaParalela:
+    """Reparte las acciones de la raíz de una IAMinimax entre procesos"""
+
+    def __init__(self, ia, trabajadores, hermano_mayor_primero=True):
+        """
+        Args:
+            ia: IAMinimax cuya configuración replican los trabajadores
+            trabajadores: Número de procesos del pool
+            hermano_mayor_primero: Busca la primera acción en este proceso
+                antes de repartir las demás ("young brothers wait"), para
+                que todas arranquen con una cota alfa útil
+        """
+        self.ia = ia
+        self.trabajadores = trabajadores
+        self.hermano_mayor_primero = hermano_mayor_primero
+
+        contexto = multiprocessing.get_context("spawn")
+        self.alfa = contexto.Value("d", -math.inf)
+        self.detener = contexto.Event()
+        self.pool = ProcessPoolExecutor(
+            max_workers=trabajadores,
+            mp_context=contexto,
+            initializer=_inicializar_trabajador,
+            initargs=(self._configuracion(), self._fusiones(), self.alfa, self.detener),
+        )
+
+    def _configuracion(self):
+        """Parámetros con los que cada trabajador construye su IAMinimax"""
+        tabla = self.ia.tabla
+        planificador = self.ia.planificador_fusiones
+        return {
+            "profundidad": self.ia.profundidad,
+            "profundidad_maxima": self.ia.profundidad_maxima,
+            "usar_deshacer": self.ia.usar_deshacer,
+            "turno_completo": self.ia.turno_completo,
+            "quiescencia": self.ia.quiescencia,
+            "nodos_quiescencia": self.ia.nodos_quiescencia,
+            "bonos_raiz": self.ia.bonos_raiz,
+            "pvs": self.ia.pvs,
+            "jugadas_asesinas": self.ia.jugadas_asesinas,
+            "historia": self.ia.historia,
+            "mvv_lva": self.ia.mvv_lva,
+            "perfil": self.ia.perfil,
+            "acciones_canonicas": self.ia.acciones_canonicas,
+            "determinizaciones": self.ia.determinizaciones,
+            "evaluar_en_lote": self.ia.evaluar_en_lote,
+            "verificar_totales": self.ia.verificar_totales,
+            "tamanio_tabla": tabla.tamanio_max if tabla is not None else 0,
+            "politica_tabla": tabla.politica if tabla is not None else None,
+            "cadenas": (planificador.largo_maximo, planificador.limite_ms) if planificador else None,
+        }
+
+    def _fusiones(self):
+        """Reglas, cartas y tabla de pares con las que cada trabajador arma su Fusionador"""
+        cartas = getattr(self.ia, "cartas_disponibles", None) or []
+        fusionador = self.ia.fusionador
+        normales = fusionador.cartas_normales if fusionador is not None else []
+        directorio = None
+        if fusionador is not None and fusionador.tabla is not None and cartas is fusionador.cartas_fusion:
+            directorio = os.path.abspath(fusionador.directorio_tabla)
+        return {
+            "reglas": fusionador.reglas if fusionador is not None else None,
+            "cartas_fusion": [codificar_carta(c) for c in cartas],
+            "cartas_normales": [codificar_carta(c) for c in normales],
+            "directorio_tabla": directorio,
+        }
+
+    def _completados(self, futuros):
+        """
+        Como `as_completed`, pero mientras espera pasa a los trabajadores
+        la señal de detener de la IA (un threading.Event de este proceso)
+        """
+        pendientes = set(futuros)
+        while pendientes:
+            listos, pendientes = wait(pendientes, timeout=ESPERA_SENAL_S, return_when=FIRST_COMPLETED)
+            senal = self.ia._senal_detener
+            if senal is not None and senal.is_set():
+                self.detener.set()
+            yield from listos
+
+    def buscar_raiz(self, ia_jugador, oponente, acciones, profundidad):
+        """
+        Equivalente en paralelo de `IAMinimax._buscar_raiz`: retorna la
+        misma (mejor_accion, mejor_valor) que la búsqueda secuencial.
+        """
+        ia = self.ia
+        estado = (codificar_jugador(ia_jugador), codificar_jugador(oponente))
+        valores = [None] * len(acciones)
+        pendientes = list(range(len(acciones)))
+        self.alfa.value = -math.inf
+        self.detener.clear()
+
+        limite_reloj = None
+        if ia._limite_tiempo is not None:
+            limite_reloj = time.time() + (ia._limite_tiempo - time.perf_counter())
+
+        if self.hermano_mayor_primero and pendientes:
+            indice = pendientes.pop(0)
+            accion = acciones[indice]
+            ia._profundidad_busqueda = profundidad
+            inicio = time.perf_counter()
+            valores[indice] = ia._evaluar_hijo(
+                ia_jugador, oponente, accion, True, profundidad - 1, -math.inf, math.inf
+            ) + ia._bono_raiz(accion)
+            ia.estadisticas.registrar_tiempo_accion(
+                ia._clave_accion(accion), (time.perf_counter() - inicio) * 1000
+            )
+            self.alfa.value = valores[indice]
+
+        futuros = {
+            self.pool.submit(
+                _evaluar_accion_raiz, estado, ia._clave_accion(acciones[i]), profundidad, limite_reloj
+            ): i
+            for i in pendientes
+        }
+
+        interrumpida = False
+        locales = []
+        for futuro in self._completados(futuros):
+            try:
+                valor, nodos, alcanzo_horizonte, contadores = futuro.result()
+            except AccionNoEncontrada:
+                # El trabajador armó otras acciones (por ejemplo cadenas de
+                # fusiones cortadas por tiempo): ésta se busca aquí
+                locales.append(futuros[futuro])
+                continue
+            ia.nodos_visitados += nodos
+            ia.estadisticas.combinar(contadores)
+            ia._alcanzo_horizonte = ia._alcanzo_horizonte or alcanzo_horizonte
+            if valor is None:
+                interrumpida = True
+            valores[futuros[futuro]] = valor
+
+        if interrumpida:
+            raise BusquedaInterrumpida()
+
+        for indice in sorted(locales):
+            accion = acciones[indice]
+            ia._profundidad_busqueda = profundidad
+            valores[indice] = ia._evaluar_hijo(
+                ia_jugador, oponente, accion, True, profundidad - 1, -math.inf, math.inf
+            ) + ia._bono_raiz(accion)
+
+        # Igual que en la búsqueda secuencial: ante empate gana la primera
+        mejor_accion = None
+        mejor_valor = -math.inf
+        for accion, valor in zip(acciones, valores):
+            if valor > mejor_valor:
+                mejor_valor = valor
+                mejor_accion = accion
+
+        # Salvo el de la mejor, los valores son cotas superiores (se
+        # buscaron con la cota alfa compartida)
+        ia.valores_raiz = {ia._clave_accion(a): v for a, v in zip(acciones, valores)}
+        ia.variacion_principal = [mejor_accion] if mejor_accion else []
+        return mejor_accion, mejor_valor
+
+    def buscar_determinizaciones(self, muestras, presupuesto_ms, max_nodos):
+        """
+        Busca cada determinización (ia_jugador, oponente) en un proceso.
+
+        Retorna la lista de (valores de la raíz por profundidad,
+        profundidad alcanzada, árbol completo), uno por muestra, en el
+        mismo orden.
+        """
+        self.detener.clear()
+        futuros = [
+            self.pool.submit(
+                _buscar_determinizacion,
+                (codificar_jugador(ia_jugador), codificar_jugador(oponente)),
+                presupuesto_ms, max_nodos
+            )
+            for ia_jugador, oponente in muestras
+        ]
+
+        for _ in self._completados(futuros):
+            pass
+
+        resultados = []
+        for futuro in futuros:
+            valores, nodos, profundidad, completo, contadores = futuro.result()
+            self.ia.nodos_visitados += nodos
+            self.ia.estadisticas.combinar(contadores)
+            resultados.append((valores, profundidad, completo))
+        return resultados
+
+    def cerrar(self):
+        """Detiene los procesos del pool"""
+        self.pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,178 @@
+"""
+Caché persistente de posiciones buscadas por IAMinimax.
+
+Con el pool de cartas chico de datos/normales.json las mismas posiciones
+de comienzo de partida se repiten duelo tras duelo. La caché guarda en un
+archivo SQLite, para cada posición ya buscada, la profundidad alcanzada,
+el valor y la mejor jugada, y la IA la consulta antes de buscar.
+
+- La clave es un hash canónico del estado: no depende del orden de la
+  mano ni del campo ni de los uid de las cartas, sólo de sus ids, y
+  lleva la configuración de la búsqueda que cambia la jugada elegida.
+- La jugada se guarda por su clave de acción (nombres de las cartas) y
+  al leerla se busca entre las jugadas de la raíz del estado actual.
+- Con más de `max_entradas` posiciones se borran las usadas hace más
+  tiempo (LRU) hasta dejar `1 - fraccion_poda` del máximo.
+- Varios procesos pueden compartir el archivo: SQLite en modo WAL
+  serializa las escrituras y cada proceso abre su propia conexión. Si la
+  base está ocupada más de `espera_s` la consulta cuenta como fallo y la
+  escritura se descarta; la caché nunca interrumpe una partida.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+RUTA_CACHE = "datos/cache_posiciones.sqlite"
+
+# Cada cuántas escrituras se revisa el tamaño de la tabla
+ESCRITURAS_POR_PODA = 64
+
+
+def clave_canonica(ia_jugador, oponente, configuracion):
+    """
+    Hash de 64 bits (con signo, como los INTEGER de SQLite) del estado
+    visto por `ia_jugador` y de la configuración de la búsqueda.
+
+    Del deck sólo cuenta el tamaño: la búsqueda no roba, así que su
+    contenido no cambia el resultado.
+    """
+    rasgos = [configuracion]
+    for jugador in (ia_jugador, oponente):
+        rasgos.append((
+            jugador.puntos_vida,
+            len(jugador.deck),
+            tuple(sorted(carta.id for carta in jugador.mano)),
+            tuple(sorted((carta.id, carta.posicion) for carta in jugador.campo)),
+        ))
+    digest = hashlib.blake2b(repr(rasgos).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+def _a_tupla(valor):
+    """Deshace la conversión de tuplas a listas de JSON"""
+    if isinstance(valor, list):
+        return tuple(_a_tupla(v) for v in valor)
+    return valor
+
+
+class CachePosiciones:
+    """Posiciones buscadas (profundidad, valor, jugada) en un archivo SQLite"""
+
+    def __init__(self, ruta=RUTA_CACHE, max_entradas=100000, fraccion_poda=0.1, espera_s=1.0):
+        """
+        Args:
+            ruta: Archivo SQLite (se crea si no existe)
+            max_entradas: Máximo de posiciones guardadas
+            fraccion_poda: Parte del máximo que se libera al podar
+            espera_s: Segundos que se espera a otro proceso que escribe
+        """
+        self.ruta = ruta
+        self.max_entradas = max_entradas
+        self.fraccion_poda = fraccion_poda
+        self.espera_s = espera_s
+        self.aciertos = 0
+        self.fallos = 0
+        self.escrituras = 0
+        self._conexion = None
+        self._pid = None
+
+    def _conectar(self):
+        """
+        Conexión de este proceso. Tras un fork (o al llegar por pickle a un
+        trabajador) se abre una nueva: las conexiones no se comparten.
+        """
+        if self._conexion is None or self._pid != os.getpid():
+            directorio = os.path.dirname(self.ruta)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            # La interfaz busca en un hilo aparte, pero nunca dos búsquedas
+            # a la vez: la conexión puede pasar de un hilo a otro
+            conexion = sqlite3.connect(self.ruta, timeout=self.espera_s, isolation_level=None,
+                                       check_same_thread=False)
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS posiciones ("
+                " clave INTEGER PRIMARY KEY,"
+                " profundidad INTEGER NOT NULL,"
+                " valor REAL,"
+                " jugada TEXT NOT NULL,"
+                " usada REAL NOT NULL)"
+            )
+            conexion.execute("CREATE INDEX IF NOT EXISTS posiciones_usada ON posiciones (usada)")
+            self._conexion = conexion
+            self._pid = os.getpid()
+        return self._conexion
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        estado["_conexion"] = None
+        estado["_pid"] = None
+        return estado
+
+    def buscar(self, clave, profundidad_minima=1):
+        """
+        (profundidad, valor, clave de la jugada) guardados para la clave si
+        se buscó al menos a `profundidad_minima`, o None
+        """
+        try:
+            conexion = self._conectar()
+            fila = conexion.execute(
+                "SELECT profundidad, valor, jugada FROM posiciones WHERE clave = ?", (clave,)
+            ).fetchone()
+            if fila is None or fila[0] < profundidad_minima:
+                self.fallos += 1
+                return None
+            conexion.execute("UPDATE posiciones SET usada = ? WHERE clave = ?", (time.time(), clave))
+        except sqlite3.OperationalError:
+            self.fallos += 1
+            return None
+
+        self.aciertos += 1
+        profundidad, valor, jugada = fila
+        return profundidad, valor, _a_tupla(json.loads(jugada))
+
+    def guardar(self, clave, profundidad, valor, clave_jugada):
+        """Guarda la posición; si ya estaba, sólo la reemplaza una búsqueda igual o más honda"""
+        try:
+            conexion = self._conectar()
+            conexion.execute(
+                "INSERT INTO posiciones (clave, profundidad, valor, jugada, usada)"
+                " VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (clave) DO UPDATE SET"
+                "  profundidad = excluded.profundidad, valor = excluded.valor,"
+                "  jugada = excluded.jugada, usada = excluded.usada"
+                " WHERE excluded.profundidad >= posiciones.profundidad",
+                (clave, profundidad, valor, json.dumps(clave_jugada, ensure_ascii=False), time.time())
+            )
+            self.escrituras += 1
+            if self.escrituras % ESCRITURAS_POR_PODA == 0:
+                self.podar()
+        except sqlite3.OperationalError:
+            pass
+
+    def podar(self):
+        """Si hay más de `max_entradas` borra las menos usadas recientemente"""
+        conexion = self._conectar()
+        cantidad = conexion.execute("SELECT COUNT(*) FROM posiciones").fetchone()[0]
+        if cantidad <= self.max_entradas:
+            return 0
+
+        sobrantes = cantidad - int(self.max_entradas * (1 - self.fraccion_poda))
+        conexion.execute(
+            "DELETE FROM posiciones WHERE clave IN"
+            " (SELECT clave FROM posiciones ORDER BY usada LIMIT ?)",
+            (sobrantes,)
+        )
+        return sobrantes
+
+    def __len__(self):
+        return self._conectar().execute("SELECT COUNT(*) FROM posiciones").fetchone()[0]
+
+    def cerrar(self):
+        if self._conexion is not None and self._pid == os.getpid():
+            self._conexion.close()
+        self._conexion = None
+        self._pid = None
@@ -1,7 +1,27 @@
+import itertools
+
+# Identificadores de instancia: cada carta creada (o instanciada) recibe uno
+# distinto y sus clones lo conservan, así que distingue copias de la misma
+# carta y sirve para encontrarla en cualquier clon del estado. El contador
+# vive en el módulo: escribir atributos de la clase en cada carta nueva
+# invalidaría la caché de atributos de todas las instancias
+_uids = itertools.count(1)
+
+
+def reservar_uid(uid):
+    """
+    Evita que las cartas nuevas repitan un uid recibido de otro proceso
+    (ver modelo/estado_compacto.py)
+    """
+    global _uids
+    _uids = itertools.count(max(next(_uids), uid + 1))
+
+
 class Carta:
     """Representa una carta monstruo de Yu-Gi-Oh!"""
     
-    def __init__(self, id, nombre, atk, defensa, nivel, atributo, tipo, imagen_path):
+    def __init__(self, id, nombre, atk, defensa, nivel, atributo, tipo, imagen_path, uid=None):
+        self.uid = uid if uid is not None else next(_uids)
         self.id = id
         self.nombre = nombre
         self.atk = atk
@@ -25,11 +45,20 @@ class Carta:
         return f"{self.nombre} (ATK:{self.atk}/DEF:{self.defensa})"
     
     def clonar(self):
-        """Crea una copia profunda de la carta"""
+        """Crea una copia profunda de la carta (con el mismo uid)"""
         copia = Carta(
             self.id, self.nombre, self.atk, self.defensa,
-            self.nivel, self.atributo, self.tipo, self.imagen_path
+            self.nivel, self.atributo, self.tipo, self.imagen_path, self.uid
         )
         copia.en_campo = self.en_campo
         copia.posicion = self.posicion
-        return copia
\ No newline at end of file
+        return copia
+    
+    def instanciar(self, uid=None):
+        """
+        Crea otra instancia de la carta, con un uid propio (otra copia en
+        juego) o con `uid` si ya se reservó uno para ella
+        """
+        copia = self.clonar()
+        copia.uid = uid if uid is not None else next(_uids)
+        return copia
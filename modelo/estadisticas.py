@@ -0,0 +1,168 @@
+"""
+Estadísticas de una búsqueda de la IA (una llamada a `elegir_mejor_jugada`).
+
+IAMinimax las va llenando mientras busca y Juego las expone tras cada
+turno de la IA; también pueden guardarse como líneas JSON para seguir el
+rendimiento turno a turno.
+"""
+import json
+
+
+class EstadisticasBusqueda:
+    """Contadores y tiempos de una búsqueda"""
+
+    def __init__(self):
+        self.nodos = 0
+        self.hojas = 0
+        self.nodos_quiescencia = 0
+        self.cortes_tabla = 0
+        self.re_busquedas = 0  # ventana nula superada en la búsqueda PVS
+        self.fallos_aspiracion = 0
+        self.reducciones_lmr = 0  # jugadas tardías buscadas con menos profundidad
+        self.re_busquedas_lmr = 0  # reducidas que superaron alfa
+        self.cortes_primera_jugada = 0  # cortes con la primera jugada probada
+        self.nodos_por_ply = {}
+        self.cortes_por_ply = {}
+        self.tiempo_por_accion = {}  # clave de la acción -> ms acumulados
+        self.nodos_ultima_iteracion = 0
+        self.profundidad = 0
+        self.duracion_ms = 0.0
+        self.variacion_principal = []  # claves de acción
+        # La jugada salió de la ponderación y no hubo que buscar
+        self.ponderada = False
+        # La jugada salió de la caché persistente de posiciones
+        self.en_cache = False
+        # Solucionador de finales: "gana", "pierde", "tablas", "incompleto"
+        # (agotó su presupuesto) o None si la posición no era un final
+        self.resultado_final = None
+        self.turnos_final = 0  # horizonte con el que se resolvió
+        self.nodos_final = 0
+        self.ms_final = 0.0
+        # Acumulados de la IA: finales intentados y resueltos (el resto
+        # quedaron incompletos)
+        self.finales_intentados = 0
+        self.finales_resueltos = 0
+
+    def registrar_nodo(self, ply, cantidad=1):
+        self.nodos_por_ply[ply] = self.nodos_por_ply.get(ply, 0) + cantidad
+
+    def registrar_corte(self, ply):
+        """Corte alfa-beta en un nodo del ply dado"""
+        self.cortes_por_ply[ply] = self.cortes_por_ply.get(ply, 0) + 1
+
+    def registrar_tiempo_accion(self, clave, ms):
+        self.tiempo_por_accion[clave] = self.tiempo_por_accion.get(clave, 0.0) + ms
+
+    def contadores(self):
+        """Contadores que un proceso trabajador envía de vuelta"""
+        return (self.hojas, self.nodos_quiescencia, self.cortes_tabla, self.re_busquedas,
+                self.cortes_primera_jugada, self.reducciones_lmr, self.re_busquedas_lmr,
+                self.nodos_por_ply, self.cortes_por_ply, self.tiempo_por_accion)
+
+    def combinar(self, contadores):
+        """Suma los contadores de `contadores()` de otro proceso"""
+        (hojas, nodos_quiescencia, cortes_tabla, re_busquedas, cortes_primera_jugada,
+         reducciones_lmr, re_busquedas_lmr, nodos_por_ply, cortes_por_ply,
+         tiempo_por_accion) = contadores
+        self.hojas += hojas
+        self.nodos_quiescencia += nodos_quiescencia
+        self.re_busquedas += re_busquedas
+        self.cortes_primera_jugada += cortes_primera_jugada
+        self.reducciones_lmr += reducciones_lmr
+        self.re_busquedas_lmr += re_busquedas_lmr
+        self.cortes_tabla += cortes_tabla
+        for ply, cantidad in nodos_por_ply.items():
+            self.registrar_nodo(ply, cantidad)
+        for ply, cantidad in cortes_por_ply.items():
+            self.cortes_por_ply[ply] = self.cortes_por_ply.get(ply, 0) + cantidad
+        for clave, ms in tiempo_por_accion.items():
+            self.registrar_tiempo_accion(clave, ms)
+
+    def cortes(self):
+        return sum(self.cortes_por_ply.values())
+
+    def tasa_corte_primera_jugada(self):
+        """Fracción de los cortes que dio la primera jugada (calidad del orden)"""
+        cortes = self.cortes()
+        return self.cortes_primera_jugada / cortes if cortes else 0.0
+
+    def tasa_finales_resueltos(self):
+        """Fracción de los finales intentados que el solucionador resolvió"""
+        if not self.finales_intentados:
+            return 0.0
+        return self.finales_resueltos / self.finales_intentados
+
+    def nodos_por_segundo(self):
+        if self.duracion_ms <= 0:
+            return 0.0
+        return self.nodos / (self.duracion_ms / 1000)
+
+    def factor_ramificacion(self):
+        """
+        Factor de ramificación efectivo b*: el de un árbol uniforme de la
+        profundidad alcanzada con los nodos de la última iteración,
+        N = b + b^2 + ... + b^d (se resuelve por bisección).
+        """
+        nodos = self.nodos_ultima_iteracion or self.nodos
+        d = self.profundidad
+        if d <= 0 or nodos <= 0:
+            return 0.0
+
+        def arbol(b):
+            return sum(b ** i for i in range(1, d + 1))
+
+        bajo, alto = 0.0, max(1.0, float(nodos))
+        for _ in range(60):
+            medio = (bajo + alto) / 2
+            if arbol(medio) < nodos:
+                bajo = medio
+            else:
+                alto = medio
+        return (bajo + alto) / 2
+
+    def a_dict(self):
+        """Representación serializable en JSON"""
+        return {
+            "nodos": self.nodos,
+            "hojas": self.hojas,
+            "nodos_quiescencia": self.nodos_quiescencia,
+            "profundidad": self.profundidad,
+            "duracion_ms": round(self.duracion_ms, 3),
+            "nodos_por_segundo": round(self.nodos_por_segundo(), 1),
+            "factor_ramificacion": round(self.factor_ramificacion(), 3),
+            "cortes_tabla": self.cortes_tabla,
+            "re_busquedas": self.re_busquedas,
+            "fallos_aspiracion": self.fallos_aspiracion,
+            "reducciones_lmr": self.reducciones_lmr,
+            "re_busquedas_lmr": self.re_busquedas_lmr,
+            "cortes": self.cortes(),
+            "tasa_corte_primera_jugada": round(self.tasa_corte_primera_jugada(), 3),
+            "nodos_por_ply": {str(p): n for p, n in sorted(self.nodos_por_ply.items())},
+            "cortes_por_ply": {str(p): n for p, n in sorted(self.cortes_por_ply.items())},
+            "tiempo_por_accion": [
+                {"accion": clave, "ms": round(ms, 3)}
+                for clave, ms in sorted(self.tiempo_por_accion.items(), key=lambda x: -x[1])
+            ],
+            "variacion_principal": self.variacion_principal,
+            "ponderada": self.ponderada,
+            "en_cache": self.en_cache,
+            "resultado_final": self.resultado_final,
+            "turnos_final": self.turnos_final,
+            "nodos_final": self.nodos_final,
+            "ms_final": round(self.ms_final, 3),
+            "finales_intentados": self.finales_intentados,
+            "finales_resueltos": self.finales_resueltos,
+            "tasa_finales_resueltos": round(self.tasa_finales_resueltos(), 3),
+        }
+
+    def guardar_jsonl(self, ruta, **extra):
+        """Agrega las estadísticas como una línea JSON al final del archivo"""
+        datos = dict(extra)
+        datos.update(self.a_dict())
+        with open(ruta, "a", encoding="utf-8") as f:
+            f.write(json.dumps(datos, ensure_ascii=False) + "\n")
+
+    def __repr__(self):
+        return (f"{self.nodos} nodos, {self.hojas} hojas, prof {self.profundidad}, "
+                f"{self.duracion_ms:.1f} ms ({self.nodos_por_segundo():.0f} nodos/s), "
+                f"b* {self.factor_ramificacion():.2f}")
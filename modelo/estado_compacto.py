@@ -0,0 +1,62 @@
+"""
+Codificación compacta del estado de juego en tuplas simples.
+
+Se usa para enviar estados a otros procesos sin serializar el grafo
+completo de objetos Jugador y Carta.
+"""
+from modelo.carta import Carta, reservar_uid
+from modelo.jugador import Jugador
+from modelo.zona import Mano, Zona
+
+
+def codificar_carta(carta):
+    """Convierte una carta en una tupla de sus datos"""
+    return (
+        carta.uid, carta.id, carta.nombre, carta.atk, carta.defensa, carta.nivel,
+        carta.atributo, carta.tipo, carta.posicion, carta.en_campo
+    )
+
+
+def decodificar_carta(datos):
+    """
+    Reconstruye una carta a partir de `codificar_carta`, con el mismo uid;
+    las cartas que se creen después en este proceso no lo repiten
+    """
+    uid, id_carta, nombre, atk, defensa, nivel, atributo, tipo, posicion, en_campo = datos
+
+    reservar_uid(uid)
+    carta = Carta(
+        id_carta, nombre, atk, defensa, nivel, atributo, tipo,
+        f"datos/imagenes/{id_carta}.jpg", uid
+    )
+    carta.posicion = posicion
+    carta.en_campo = en_campo
+    return carta
+
+
+def codificar_jugador(jugador):
+    """
+    Convierte un jugador en una tupla.
+
+    El cementerio no se incluye porque no influye en la búsqueda.
+    """
+    return (
+        jugador.nombre,
+        jugador.puntos_vida,
+        jugador.es_ia,
+        tuple(codificar_carta(c) for c in jugador.deck),
+        tuple(codificar_carta(c) for c in jugador.mano),
+        tuple(codificar_carta(c) for c in jugador.campo),
+    )
+
+
+def decodificar_jugador(datos):
+    """Reconstruye un jugador a partir de `codificar_jugador`"""
+    nombre, puntos_vida, es_ia, deck, mano, campo = datos
+
+    jugador = Jugador(nombre, [], puntos_vida)
+    jugador.es_ia = es_ia
+    jugador.deck = [decodificar_carta(c) for c in deck]
+    jugador.mano = Mano(decodificar_carta(c) for c in mano)
+    jugador.campo = Zona(decodificar_carta(c) for c in campo)
+    return jugador
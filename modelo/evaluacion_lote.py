@@ -0,0 +1,113 @@
+"""
+Evaluación por lotes de estados hoja.
+
+Cada hoja se codifica en una fila de enteros de ancho fijo (vida, cartas
+en mano y, por cada uno de los 5 espacios del campo, ATK, DEF, bit de
+posición de ataque y bit de ocupado, para ambos jugadores). Con NumPy las
+filas se evalúan todas a la vez; sin NumPy se usa un recorrido escalar que
+da exactamente los mismos valores.
+"""
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+# Pesos de la evaluación (los mismos que IAMinimax.evaluar_estado)
+PESO_VIDA = 2
+PESO_FUERZA = 0.5
+PESO_MANO = 100
+PESO_CAMPO = 150
+PESO_ATAQUE = 50
+
+ESPACIOS_CAMPO = 5
+# Columnas por jugador: vida, mano y 4 valores por espacio del campo
+COLUMNAS_JUGADOR = 2 + 4 * ESPACIOS_CAMPO
+
+NUMPY_DISPONIBLE = np is not None
+
+
+def _codificar_jugador(jugador, fila):
+    """Agrega a la fila las columnas de un jugador"""
+    fila.append(jugador.puntos_vida)
+    fila.append(len(jugador.mano))
+    for carta in jugador.campo:
+        fila.append(carta.atk)
+        fila.append(carta.defensa)
+        fila.append(1 if carta.posicion == "ataque" else 0)
+        fila.append(1)
+    fila.extend((0, 0, 0, 0) * (ESPACIOS_CAMPO - len(jugador.campo)))
+
+
+def codificar_hoja(jugador_max, jugador_min):
+    """Fila de ancho fijo con los datos de la hoja que usa la evaluación"""
+    fila = []
+    _codificar_jugador(jugador_max, fila)
+    _codificar_jugador(jugador_min, fila)
+    return fila
+
+
+def evaluar_lote(filas, usar_numpy=True):
+    """
+    Evalúa una lista de filas de `codificar_hoja` desde el punto de vista
+    del maximizador. Retorna una lista de valores en el mismo orden.
+    """
+    if not filas:
+        return []
+    if usar_numpy and np is not None:
+        return _evaluar_numpy(filas)
+    return [_evaluar_fila(fila) for fila in filas]
+
+
+def _evaluar_numpy(filas):
+    datos = np.asarray(filas, dtype=np.int64).reshape(len(filas), 2, COLUMNAS_JUGADOR)
+
+    vida = datos[:, :, 0]
+    mano = datos[:, :, 1]
+    campo = datos[:, :, 2:].reshape(len(filas), 2, ESPACIOS_CAMPO, 4)
+    atk = campo[..., 0]
+    defensa = campo[..., 1]
+    en_ataque = campo[..., 2]
+    ocupado = campo[..., 3]
+
+    # El poder de cada carta es su ATK en ataque y su DEF en defensa
+    fuerza = (np.where(en_ataque == 1, atk, defensa) * ocupado).sum(axis=2)
+    cartas_campo = ocupado.sum(axis=2)
+    cartas_ataque = en_ataque.sum(axis=2)
+
+    evaluacion = (
+        (vida[:, 0] - vida[:, 1]) * PESO_VIDA +
+        (fuerza[:, 0] - fuerza[:, 1]) * PESO_FUERZA +
+        (mano[:, 0] - mano[:, 1]) * PESO_MANO +
+        (cartas_campo[:, 0] - cartas_campo[:, 1]) * PESO_CAMPO +
+        (cartas_ataque[:, 0] - cartas_ataque[:, 1]) * PESO_ATAQUE
+    )
+    return evaluacion.tolist()
+
+
+def _resumir(fila, inicio):
+    """(vida, mano, fuerza, cartas en campo, cartas en ataque) de un jugador"""
+    fuerza = 0
+    cartas_campo = 0
+    cartas_ataque = 0
+    for espacio in range(inicio + 2, inicio + COLUMNAS_JUGADOR, 4):
+        if fila[espacio + 3]:
+            cartas_campo += 1
+            if fila[espacio + 2]:
+                cartas_ataque += 1
+                fuerza += fila[espacio]
+            else:
+                fuerza += fila[espacio + 1]
+    return fila[inicio], fila[inicio + 1], fuerza, cartas_campo, cartas_ataque
+
+
+def _evaluar_fila(fila):
+    vida_max, mano_max, fuerza_max, campo_max, ataque_max = _resumir(fila, 0)
+    vida_min, mano_min, fuerza_min, campo_min, ataque_min = _resumir(fila, COLUMNAS_JUGADOR)
+
+    return (
+        (vida_max - vida_min) * PESO_VIDA +
+        (fuerza_max - fuerza_min) * PESO_FUERZA +
+        (mano_max - mano_min) * PESO_MANO +
+        (campo_max - campo_min) * PESO_CAMPO +
+        (ataque_max - ataque_min) * PESO_ATAQUE
+    )
@@ -1,28 +1,284 @@
+import hashlib
+import os
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+from modelo.reglas_fusion import RUTA_REGLAS, ReglasFusion
+from modelo.zona import Mano
+
+# La tabla de pares precalculada se guarda junto a los JSON de cartas. Su
+# nombre lleva un hash de las cartas, del pool de fusión y de las reglas
+# de fusión, así que si cambian se construye otra
+DIRECTORIO_TABLAS = "datos"
+VERSION_TABLA = 1
+
+
+class IndiceFusiones:
+    """
+    Cartas de fusión ordenadas por ATK: todas juntas, por atributo y por
+    tipo. Las ventanas de ATK de las reglas generales (por defecto
+    70%-200% y 60%-250% del promedio, ver modelo/reglas_fusion.py) se
+    resuelven con bisect en O(log n) en lugar de recorrer todas las cartas
+    en cada par.
+    
+    Cada grupo es (atks, cartas, posiciones) ordenado por (ATK, posición en
+    la lista original): ante empates gana la carta que aparece primero,
+    igual que `max` y `sorted` sobre la lista.
+    """
+    
+    def __init__(self, cartas):
+        self.todas = self._agrupar(enumerate(cartas))
+        
+        por_atributo = {}
+        por_tipo = {}
+        for posicion, carta in enumerate(cartas):
+            por_atributo.setdefault(carta.atributo, []).append((posicion, carta))
+            por_tipo.setdefault(carta.tipo, []).append((posicion, carta))
+        self.por_atributo = {clave: self._agrupar(grupo) for clave, grupo in por_atributo.items()}
+        self.por_tipo = {clave: self._agrupar(grupo) for clave, grupo in por_tipo.items()}
+    
+    @staticmethod
+    def _agrupar(cartas_con_posicion):
+        ordenadas = sorted(cartas_con_posicion, key=lambda x: (x[1].atk, x[0]))
+        return ([c.atk for _, c in ordenadas], [c for _, c in ordenadas],
+                [posicion for posicion, _ in ordenadas])
+    
+    @staticmethod
+    def _primera_permitida(grupo, atk, inicio, fin, excluidos):
+        """Índice de la primera carta con ese ATK fuera de `excluidos`, o None"""
+        atks, cartas, _ = grupo
+        i = bisect_left(atks, atk, inicio, fin)
+        while i < fin and atks[i] == atk:
+            if cartas[i].nombre not in excluidos:
+                return i
+            i += 1
+        return None
+    
+    def mas_fuerte(self, grupo, minimo, maximo, *excluidos):
+        """Carta de mayor ATK con minimo <= ATK <= maximo cuyo nombre no está excluido"""
+        if grupo is None:
+            return None
+        atks, cartas, _ = grupo
+        inicio = bisect_left(atks, minimo)
+        fin = bisect_right(atks, maximo)
+        
+        # Del ATK más alto hacia abajo, la primera permitida de cada ATK
+        while fin > inicio:
+            atk = atks[fin - 1]
+            encontrada = self._primera_permitida(grupo, atk, inicio, fin, excluidos)
+            if encontrada is not None:
+                return cartas[encontrada]
+            fin = bisect_left(atks, atk, inicio, fin)
+        return None
+    
+    def grupo(self, por, carta):
+        """Grupo de una regla: el del atributo o tipo de la carta, o todas"""
+        if por == "atributo":
+            return self.por_atributo.get(carta.atributo)
+        if por == "tipo":
+            return self.por_tipo.get(carta.tipo)
+        return self.todas
+    
+    def mas_cercana(self, objetivo, minimo, maximo, *excluidos, grupo=None):
+        """
+        Carta de ATK más cercano a `objetivo` dentro de [minimo, maximo],
+        entre todas o entre las de `grupo`
+        """
+        grupo = self.todas if grupo is None else grupo
+        atks, cartas, posiciones = grupo
+        inicio = bisect_left(atks, minimo)
+        fin = bisect_right(atks, maximo)
+        
+        # Permitidas más cercanas por debajo y por arriba del objetivo
+        medio = bisect_left(atks, objetivo, inicio, fin)
+        abajo = medio - 1
+        while abajo >= inicio and cartas[abajo].nombre in excluidos:
+            abajo -= 1
+        arriba = medio
+        while arriba < fin and cartas[arriba].nombre in excluidos:
+            arriba += 1
+        
+        distancias = []
+        if abajo >= inicio:
+            distancias.append(objetivo - atks[abajo])
+        if arriba < fin:
+            distancias.append(atks[arriba] - objetivo)
+        if not distancias:
+            return None
+        distancia = min(distancias)
+        
+        # A igual distancia, la que aparece primero en la lista original:
+        # la de menor posición entre las de ATK objetivo - d y objetivo + d
+        candidatas = [
+            self._primera_permitida(grupo, atk, inicio, fin, excluidos)
+            for atk in {objetivo - distancia, objetivo + distancia}
+        ]
+        return cartas[min((i for i in candidatas if i is not None), key=lambda i: posiciones[i])]
+
+
+class TablaFusiones:
+    """
+    Resultado precalculado de cada par de cartas normales (ver
+    Fusionador.cargar_tabla_fusiones): un triángulo de posiciones en el
+    pool de fusión indexado por la posición de cada carta entre las
+    normales.
+    """
+    
+    # Alguna de las cartas no está en la tabla (una carta de fusión en la mano)
+    FUERA = object()
+    
+    def __init__(self, normales, posiciones, cartas_fusion):
+        self.posicion = {carta.id: i for i, carta in enumerate(normales)}
+        self.cantidad = len(normales)
+        self.posiciones = posiciones
+        self.cartas_fusion = cartas_fusion
+        self.sin_fusion = (1 << (8 * posiciones.itemsize)) - 1
+    
+    def buscar(self, carta1, carta2):
+        """Prototipo del resultado, None si no fusionan o FUERA si no es un par de la tabla"""
+        i = self.posicion.get(carta1.id)
+        j = self.posicion.get(carta2.id)
+        if i is None or j is None:
+            return self.FUERA
+        if i > j:
+            i, j = j, i
+        resultado = self.posiciones[i * self.cantidad - i * (i - 1) // 2 + j - i]
+        if resultado == self.sin_fusion:
+            return None
+        return self.cartas_fusion[resultado]
+
+
 class Fusionador:
     """Maneja las fusiones de cartas según las reglas de Forbidden Memories"""
     
-    def __init__(self):
-        # Diccionario de fusiones: (id1, id2) -> resultado
-        self.fusiones = {}
+    def __init__(self, reglas=RUTA_REGLAS):
+        """
+        Args:
+            reglas: Archivo JSON de reglas de fusión o un ReglasFusion
+                (ver modelo/reglas_fusion.py)
+        """
         self.cartas_fusion = []  # Cartas violetas disponibles para resultados
-        self._inicializar_fusiones()
+        self.cartas_normales = []  # Cartas cuyos ids se conocen al compilar
+        self.indice = None  # IndiceFusiones de cartas_fusion
+        self.tabla = None  # TablaFusiones de pares de cartas normales
+        self.directorio_tabla = None  # Donde se leyó o guardó la tabla
+        # Cambia cada vez que pueden cambiar los resultados: las manos
+        # (zona.Mano) descartan entonces los pares que ya resolvieron
+        self.version = 0
+        self.reglas = None
+        self.compiladas = None  # ReglasCompiladas para cartas_fusion
+        self.cargar_reglas(reglas)
     
-    def _inicializar_fusiones(self):
+    def cargar_reglas(self, reglas=RUTA_REGLAS):
+        """Reemplaza las reglas de fusión (un archivo JSON o un ReglasFusion)"""
+        self.reglas = ReglasFusion.cargar(reglas) if isinstance(reglas, str) else reglas
+        self.compiladas = self.reglas.compilar(self.cartas_fusion, self.cartas_normales)
+        # La tabla de pares se resolvió con las reglas anteriores
+        self.tabla = None
+        self.version += 1
+    
+    def cargar_cartas_fusion(self, cartas_fusion, cartas_normales=()):
         """
-        Define las fusiones disponibles.
-        Formato: (carta1_nombre, carta2_nombre): resultado_nombre
+        Carga las cartas de fusión (violetas) disponibles como resultados y
+        compila las reglas para ellas. Con `cartas_normales` las fusiones
+        por nombre de esas cartas se buscan por id.
         """
-        # Fusiones específicas por nombre (limitadas para evitar muchas fusiones)
-        self.fusiones_nombres = {
-            # Solo algunas fusiones clave
-            ("Dark Magician", "Mystical Elf"): "Dark Sage",
-            ("Summoned Skull", "Red-Eyes B. Dragon"): "Black Skull Dragon",
-            ("Blue-Eyes White Dragon", "Blue-Eyes White Dragon"): "Blue-Eyes Ultimate Dragon",
+        self.cartas_fusion = cartas_fusion
+        self.cartas_normales = list(cartas_normales)
+        self.indice = IndiceFusiones(cartas_fusion)
+        self.compiladas = self.reglas.compilar(cartas_fusion, self.cartas_normales)
+        # La tabla de pares era del pool anterior
+        self.tabla = None
+        self.version += 1
+    
+    # ========== TABLA DE PARES PRECALCULADA ==========
+    
+    def cargar_tabla_fusiones(self, cartas_normales, directorio=DIRECTORIO_TABLAS):
+        """
+        Resuelve de una vez el resultado de cada par de cartas normales
+        contra las cartas de fusión cargadas y desde entonces
+        `puede_fusionar` lo responde con una consulta O(1). La tabla se lee
+        de `directorio` si ya existe para este conjunto de cartas y si no
+        se construye y se guarda ahí.
+        
+        El resultado no depende del orden del par, así que se guarda un
+        triángulo: para n cartas normales n(n+1)/2 posiciones en el pool de
+        fusión (2 bytes cada una con menos de 65535 cartas de fusión).
+        
+        Returns:
+            dict con ruta, pares, bytes, ms y si se construyó (o se leyó)
+        """
+        inicio = time.perf_counter()
+        self.tabla = None
+        
+        normales = list({c.id: c for c in sorted(cartas_normales, key=lambda c: c.id)}.values())
+        tipo_array = "H" if len(self.cartas_fusion) < 0xFFFF else "I"
+        ruta = os.path.join(directorio, f"tabla_fusiones_{self._huella_tabla(normales)}.bin")
+        
+        construida = not os.path.exists(ruta)
+        posiciones = array(tipo_array)
+        if not construida:
+            with open(ruta, "rb") as f:
+                posiciones.frombytes(f.read())
+            construida = len(posiciones) != len(normales) * (len(normales) + 1) // 2
+        
+        if construida:
+            posiciones = self._construir_tabla(normales, tipo_array)
+            os.makedirs(directorio, exist_ok=True)
+            temporal = f"{ruta}.{os.getpid()}.tmp"
+            with open(temporal, "wb") as f:
+                posiciones.tofile(f)
+            os.replace(temporal, ruta)
+        
+        self.tabla = TablaFusiones(normales, posiciones, self.cartas_fusion)
+        self.directorio_tabla = directorio
+        return {
+            "ruta": ruta,
+            "pares": len(posiciones),
+            "bytes": len(posiciones) * posiciones.itemsize,
+            "ms": (time.perf_counter() - inicio) * 1000,
+            "construida": construida,
         }
     
-    def cargar_cartas_fusion(self, cartas_fusion):
-        """Carga las cartas de fusión (violetas) disponibles como resultados"""
-        self.cartas_fusion = cartas_fusion
+    def _construir_tabla(self, normales, tipo_array):
+        """Posición en el pool del resultado de cada par (i <= j), o el máximo del tipo"""
+        sin_fusion = (1 << (8 * array(tipo_array).itemsize)) - 1
+        por_nombre = {}
+        for i, carta in enumerate(self.cartas_fusion):
+            por_nombre.setdefault((carta.id, carta.nombre, carta.atk), i)
+        
+        posiciones = array(tipo_array)
+        for i, carta1 in enumerate(normales):
+            for carta2 in normales[i:]:
+                resultado = self.resultado_fusion(carta1, carta2, self.cartas_fusion)
+                if resultado is None:
+                    posiciones.append(sin_fusion)
+                else:
+                    posiciones.append(por_nombre[(resultado.id, resultado.nombre, resultado.atk)])
+        return posiciones
+    
+    def _huella_tabla(self, normales):
+        """Hash de todo lo que decide el resultado de un par"""
+        def datos(carta):
+            return (carta.id, carta.nombre, carta.atk, carta.atributo, carta.tipo)
+        
+        contenido = repr((
+            VERSION_TABLA,
+            [datos(c) for c in normales],
+            [datos(c) for c in self.cartas_fusion],
+            self.reglas.huella(),
+        ))
+        return hashlib.blake2b(contenido.encode("utf-8"), digest_size=8).hexdigest()
+    
+    def _indice_de(self, cartas_disponibles):
+        """
+        Índice de las cartas disponibles si son las cargadas con
+        `cargar_cartas_fusion`; con otra lista se recorre la lista
+        """
+        if self.indice is not None and cartas_disponibles is self.cartas_fusion:
+            return self.indice
+        return None
     
     def puede_fusionar(self, carta1, carta2, cartas_disponibles):
         """
@@ -36,102 +292,95 @@ class Fusionador:
         Returns:
             Carta resultante or None si no es posible
         """
-        # Intentar fusión por nombre exacto (prioridad más alta)
-        clave1 = (carta1.nombre, carta2.nombre)
-        clave2 = (carta2.nombre, carta1.nombre)
-        
-        nombre_resultado = None
-        if clave1 in self.fusiones_nombres:
-            nombre_resultado = self.fusiones_nombres[clave1]
-        elif clave2 in self.fusiones_nombres:
-            nombre_resultado = self.fusiones_nombres[clave2]
-        
-        # Si encontramos una fusión por nombre
-        if nombre_resultado:
-            for carta in cartas_disponibles:
-                if carta.nombre == nombre_resultado:
-                    return carta.clonar()
-        
-        # IMPORTANTE: SIEMPRE intentar fusión por atributo si son iguales
-        if carta1.atributo == carta2.atributo:
-            resultado = self._fusion_por_atributo(carta1, carta2, cartas_disponibles)
-            if resultado:
+        resultado = self.resultado_fusion(carta1, carta2, cartas_disponibles)
+        return resultado.instanciar() if resultado else None
+    
+    def resultado_fusion(self, carta1, carta2, cartas_disponibles):
+        """
+        Como `puede_fusionar` pero devuelve la carta del pool sin
+        instanciarla (no se debe poner en juego tal cual)
+        """
+        # Par de cartas normales ya resuelto en la tabla precalculada
+        if self.tabla is not None and cartas_disponibles is self.cartas_fusion:
+            resultado = self.tabla.buscar(carta1, carta2)
+            if resultado is not TablaFusiones.FUERA:
                 return resultado
         
-        # IMPORTANTE: SIEMPRE intentar fusión por tipo si son iguales
-        if carta1.tipo == carta2.tipo:
-            resultado = self._fusion_por_tipo(carta1, carta2, cartas_disponibles)
-            if resultado:
+        # Fusión por nombre (prioridad más alta)
+        if cartas_disponibles is self.cartas_fusion:
+            resultado = self.compiladas.por_nombre(carta1, carta2)
+            if resultado is not None:
                 return resultado
+        else:
+            par = tuple(sorted((carta1.nombre, carta2.nombre)))
+            nombre_resultado = self.reglas.nombradas.get(par)
+            if nombre_resultado:
+                for carta in cartas_disponibles:
+                    if carta.nombre == nombre_resultado:
+                        return carta
         
-        # Si no son del mismo atributo ni tipo, intentar fusión genérica
-        # Buscar cualquier carta de fusión que tenga stats razonables
-        resultado = self._fusion_generica(carta1, carta2, cartas_disponibles)
-        if resultado:
-            return resultado
+        # Reglas generales (atributo, tipo, cualquiera) que valen para el par
+        reglas = self.compiladas.reglas_para(carta1, carta2)
+        excluidos = (carta1.nombre, carta2.nombre)
+        if cartas_disponibles is self.cartas_fusion:
+            # Sin excluir nombres el resultado sólo depende del atributo y
+            # el tipo compartidos y del ATK promedio: se recuerda por eso.
+            # Si no es una de las dos cartas es también el resultado con
+            # exclusión (quitar candidatas no cambia a la ganadora)
+            clave = (
+                carta1.atributo if carta1.atributo == carta2.atributo else None,
+                carta1.tipo if carta1.tipo == carta2.tipo else None,
+                (carta1.atk + carta2.atk) // 2,
+            )
+            resultados = self.compiladas.resultados
+            if clave in resultados:
+                resultado = resultados[clave]
+            else:
+                resultado = resultados[clave] = self._aplicar_reglas(reglas, carta1, carta2,
+                                                                     cartas_disponibles, ())
+            if resultado is None or resultado.nombre not in excluidos:
+                return resultado
         
-        return None
+        return self._aplicar_reglas(reglas, carta1, carta2, cartas_disponibles, excluidos)
     
-    def _fusion_por_atributo(self, carta1, carta2, cartas_disponibles):
-        """Fusión genérica basada en atributo compartido"""
-        atk_promedio = (carta1.atk + carta2.atk) // 2
-        atributo = carta1.atributo
-        
-        # Buscar una carta de FUSIÓN del mismo atributo con stats similares o mejores
-        # AMPLIADO: Rango más flexible (70% - 200%)
-        candidatos = [
-            c for c in cartas_disponibles 
-            if c.atributo == atributo and 
-            c.atk >= atk_promedio * 0.7 and  # Al menos 70% del promedio
-            c.atk <= atk_promedio * 2.0 and  # Máximo 200% del promedio
-            c.nombre not in [carta1.nombre, carta2.nombre]  # No las mismas cartas
-        ]
-        
-        if candidatos:
-            # Retornar la más fuerte de los candidatos
-            return max(candidatos, key=lambda c: c.atk).clonar()
-        
+    def _aplicar_reglas(self, reglas, carta1, carta2, cartas_disponibles, excluidos):
+        """Resultado de la primera regla que da una carta, o None"""
+        for regla in reglas:
+            resultado = self._aplicar_regla(regla, carta1, carta2, cartas_disponibles, excluidos)
+            if resultado is not None:
+                return resultado
         return None
     
-    def _fusion_por_tipo(self, carta1, carta2, cartas_disponibles):
-        """Fusión genérica basada en tipo compartido"""
+    def _aplicar_regla(self, regla, carta1, carta2, cartas_disponibles, excluidos):
+        """Carta de fusión que da una regla general para el par (sin los nombres excluidos), o None"""
         atk_promedio = (carta1.atk + carta2.atk) // 2
-        tipo = carta1.tipo
-        
-        # Buscar una carta de FUSIÓN del mismo tipo con stats similares o mejores
-        # AMPLIADO: Rango más flexible (70% - 200%)
-        candidatos = [
-            c for c in cartas_disponibles 
-            if c.tipo == tipo and 
-            c.atk >= atk_promedio * 0.7 and
-            c.atk <= atk_promedio * 2.0 and
-            c.nombre not in [carta1.nombre, carta2.nombre]
-        ]
+        minimo = atk_promedio * regla.atk_minimo
+        maximo = atk_promedio * regla.atk_maximo
         
-        if candidatos:
-            return max(candidatos, key=lambda c: c.atk).clonar()
+        indice = self._indice_de(cartas_disponibles)
+        if indice is not None:
+            grupo = indice.grupo(regla.por, carta1)
+            if grupo is None:
+                return None
+            if regla.elegir == "mas_fuerte":
+                return indice.mas_fuerte(grupo, minimo, maximo, *excluidos)
+            return indice.mas_cercana(atk_promedio, minimo, maximo, *excluidos, grupo=grupo)
         
-        return None
-    
-    def _fusion_generica(self, carta1, carta2, cartas_disponibles):
-        """Fusión genérica cuando no comparten atributo ni tipo"""
-        atk_promedio = (carta1.atk + carta2.atk) // 2
-        
-        # Buscar cualquier carta de fusión con stats razonables
-        # Rango muy amplio: 60% - 250%
+        # Con otra lista se recorre completa
         candidatos = [
-            c for c in cartas_disponibles 
-            if c.atk >= atk_promedio * 0.6 and
-            c.atk <= atk_promedio * 2.5 and
-            c.nombre not in [carta1.nombre, carta2.nombre]
+            c for c in cartas_disponibles
+            if (regla.por != "atributo" or c.atributo == carta1.atributo) and
+            (regla.por != "tipo" or c.tipo == carta1.tipo) and
+            minimo <= c.atk <= maximo and
+            c.nombre not in excluidos
         ]
         
-        if candidatos:
-            # Preferir cartas más cercanas al promedio
-            candidatos_ordenados = sorted(candidatos, key=lambda c: abs(c.atk - atk_promedio))
-            return candidatos_ordenados[0].clonar()
-        
-        return None
+        if not candidatos:
+            return None
+        if regla.elegir == "mas_fuerte":
+            return max(candidatos, key=lambda c: c.atk)
+        # A igual distancia, la que aparece primero
+        return min(candidatos, key=lambda c: abs(c.atk - atk_promedio))
     
     def obtener_fusiones_posibles(self, mano, cartas_disponibles):
         """
@@ -144,6 +393,12 @@ class Fusionador:
         Returns:
             Lista de tuplas (carta1, carta2, resultado)
         """
+        # Las manos de los jugadores recuerdan los pares ya resueltos y el
+        # uid del resultado de cada uno
+        if isinstance(mano, Mano):
+            return [(carta1, carta2, mano.instanciar_fusion(carta1, carta2, resultado))
+                    for carta1, carta2, resultado in mano.fusiones(self, cartas_disponibles)]
+        
         fusiones = []
         
         for i in range(len(mano)):
@@ -154,6 +409,11 @@ class Fusionador:
         
         return fusiones
     
+    def obtener_fusiones_ordenadas(self, mano, cartas_disponibles):
+        """Fusiones posibles de la mano, de mayor a menor ATK del resultado"""
+        return sorted(self.obtener_fusiones_posibles(mano, cartas_disponibles),
+                      key=lambda fusion: fusion[2].atk, reverse=True)
+    
     def es_fusion_beneficiosa(self, carta1, carta2, resultado):
         """
         Evalúa si una fusión es beneficiosa
@@ -0,0 +1,308 @@
+"""
+Motor alternativo de IA basado en Monte Carlo Tree Search (UCT).
+
+Cada nodo del árbol es el estado al inicio de un turno y cada arista un
+turno completo ("turno", plan) como los que genera IAMinimax. Entre turno
+y turno el jugador que empieza roba su carta, igual que en Juego, así que
+el nodo al que se llega tras el turno de la IA y la respuesta del humano
+es el mismo estado con el que se llama a la IA en su siguiente turno: el
+subárbol se conserva y la búsqueda continúa donde quedó.
+"""
+import math
+import random
+import time
+
+from modelo.ia_minimax import IAMinimax
+
+
+class NodoMCTS:
+    """Estado del árbol al inicio del turno de `juega_ia` (o del humano)"""
+
+    __slots__ = ("accion", "padre", "hijos", "sin_expandir", "visitas", "valor",
+                 "clave", "juega_ia", "terminal")
+
+    def __init__(self, accion, padre, clave, juega_ia, terminal):
+        self.accion = accion          # Turno que llevó a este nodo
+        self.padre = padre
+        self.hijos = []
+        self.sin_expandir = None      # Turnos aún no probados (se generan al visitarlo)
+        self.visitas = 0
+        self.valor = 0.0              # Recompensa acumulada de quien jugó `accion`
+        self.clave = clave            # Clave Zobrist para reutilizar el árbol
+        self.juega_ia = juega_ia
+        self.terminal = terminal
+
+
+class IAMCTS:
+    """Elige el turno de la IA con Monte Carlo Tree Search"""
+
+    def __init__(self, iteraciones=500, presupuesto_ms=None, exploracion=1.4,
+                 turnos_simulacion=6, epsilon=0.2, escala_evaluacion=2000, semilla=None,
+                 iteraciones_ponderacion=2000):
+        """
+        Args:
+            iteraciones: Iteraciones por jugada si no hay presupuesto de tiempo;
+                si el subárbol reutilizado ya tiene esas visitas (por ejemplo,
+                tras ponderar) se responde sin buscar más
+            presupuesto_ms: Tiempo de pensamiento por jugada (ms); tiene
+                prioridad sobre `iteraciones`
+            exploracion: Constante C de UCT
+            turnos_simulacion: Turnos que dura como mucho cada simulación
+            epsilon: Probabilidad de que la simulación elija al azar en lugar
+                de la opción voraz
+            escala_evaluacion: Escala con la que `evaluar_estado` se convierte
+                en probabilidad de victoria al cortar una simulación
+            semilla: Semilla del generador aleatorio (para reproducir partidas)
+            iteraciones_ponderacion: Iteraciones como mucho al ponderar
+                durante el turno del humano (el hilo compite con la interfaz
+                por el GIL); None pondera hasta que se lo detenga
+        """
+        self.fusionador = None
+        self.cartas_disponibles = []
+        # Sin tabla de transposición: Juego la consulta en ambos motores
+        self.tabla = None
+
+        self.iteraciones = iteraciones
+        self.presupuesto_ms = presupuesto_ms
+        self.exploracion = exploracion
+        self.turnos_simulacion = turnos_simulacion
+        self.epsilon = epsilon
+        self.escala_evaluacion = escala_evaluacion
+        self.aleatorio = random.Random(semilla)
+        self.iteraciones_ponderacion = iteraciones_ponderacion
+
+        # Generación de turnos, reglas y evaluación compartidas con Minimax
+        self.motor = IAMinimax(turno_completo=True)
+
+        self.raiz = None
+        self.iteraciones_realizadas = 0
+        self.visitas_reutilizadas = 0
+        self.variacion_principal = []
+
+    def elegir_mejor_jugada(self, ia_jugador, oponente, senal_detener=None):
+        """
+        Ejecuta MCTS desde el estado actual y retorna el turno más visitado
+        como ("turno", plan). Si se activa `senal_detener` (threading.Event)
+        se deja de iterar y se usan las visitas acumuladas hasta entonces.
+        """
+        self.motor.fusionador = self.fusionador
+        self.motor.cartas_disponibles = self.cartas_disponibles
+
+        # La búsqueda modifica y revierte una copia del estado real
+        ia_jugador = ia_jugador.clonar()
+        oponente = oponente.clonar()
+
+        self.raiz = self._reutilizar_arbol(ia_jugador, oponente, True)
+        self.visitas_reutilizadas = self.raiz.visitas
+        self.iteraciones_realizadas = 0
+        
+        if self.raiz.visitas >= self.iteraciones and self.raiz.hijos:
+            self.variacion_principal = self._linea_mas_visitada()
+            return max(self.raiz.hijos, key=lambda n: n.visitas).accion
+
+        limite_tiempo = None
+        if self.presupuesto_ms is not None:
+            limite_tiempo = time.perf_counter() + self.presupuesto_ms / 1000
+
+        while True:
+            if senal_detener is not None and senal_detener.is_set() and self.iteraciones_realizadas > 0:
+                break
+            if limite_tiempo is not None:
+                if time.perf_counter() >= limite_tiempo and self.iteraciones_realizadas > 0:
+                    break
+            elif self.iteraciones_realizadas >= self.iteraciones:
+                break
+
+            self._iterar(ia_jugador, oponente)
+            self.iteraciones_realizadas += 1
+
+            # Sólo hay una opción (o ninguna): no hace falta seguir
+            if not self.raiz.sin_expandir and len(self.raiz.hijos) <= 1:
+                break
+
+        self.variacion_principal = self._linea_mas_visitada()
+        if not self.raiz.hijos:
+            return ("turno", ())
+        return max(self.raiz.hijos, key=lambda n: n.visitas).accion
+
+    def ponderar(self, ia_jugador, oponente, senal_detener):
+        """
+        Sigue iterando durante el turno del humano, desde el nodo del árbol
+        en el que le toca jugar, hasta que se active `senal_detener`
+        (threading.Event) o se hagan `iteraciones_ponderacion`. Se llama desde un hilo aparte (ver
+        modelo/ponderador.py) con copias del estado; el subárbol de la
+        respuesta real se reutiliza en la siguiente jugada de la IA.
+        """
+        self.motor.fusionador = self.fusionador
+        self.motor.cartas_disponibles = self.cartas_disponibles
+
+        self.raiz = self._reutilizar_arbol(ia_jugador, oponente, False)
+        iteraciones = 0
+        while not senal_detener.is_set():
+            if self.iteraciones_ponderacion is not None and iteraciones >= self.iteraciones_ponderacion:
+                break
+            self._iterar(ia_jugador, oponente)
+            iteraciones += 1
+
+    def _reutilizar_arbol(self, ia_jugador, oponente, juega_ia):
+        """
+        Busca el estado actual entre los nodos de la búsqueda anterior: la
+        propia raíz o un nodo uno o dos turnos más abajo (tras el turno de
+        la IA y, si no se ponderó, el del humano). Si no aparece se empieza
+        un árbol nuevo.
+        """
+        clave = self.motor.zobrist.hash_estado(ia_jugador, oponente, juega_ia)
+
+        if self.raiz is not None:
+            candidatos = [self.raiz]
+            for hijo in self.raiz.hijos:
+                candidatos.append(hijo)
+                candidatos.extend(hijo.hijos)
+
+            for nodo in candidatos:
+                if nodo.clave == clave and nodo.juega_ia == juega_ia:
+                    nodo.padre = None
+                    nodo.accion = None
+                    return nodo
+
+        return NodoMCTS(None, None, clave, juega_ia, False)
+
+    def _iterar(self, ia_jugador, oponente):
+        """Selección, expansión, simulación y retropropagación"""
+        registro = []
+        nodo = self.raiz
+
+        # 1. Selección: bajar por UCT mientras el nodo esté totalmente expandido
+        while not nodo.terminal:
+            if nodo.sin_expandir is None:
+                nodo.sin_expandir = self._generar_turnos(nodo, ia_jugador, oponente)
+            if nodo.sin_expandir or not nodo.hijos:
+                break
+            nodo = self._seleccionar_hijo(nodo)
+            self._jugar_turno(nodo.accion, not nodo.juega_ia, ia_jugador, oponente, registro)
+
+        # 2. Expansión de un turno no probado
+        if not nodo.terminal and nodo.sin_expandir:
+            accion = nodo.sin_expandir.pop()
+            juega_ia = nodo.juega_ia
+            self._jugar_turno(accion, juega_ia, ia_jugador, oponente, registro)
+            hijo = NodoMCTS(
+                accion, nodo,
+                self.motor.zobrist.hash_estado(ia_jugador, oponente, not juega_ia),
+                not juega_ia,
+                ia_jugador.esta_derrotado() or oponente.esta_derrotado()
+            )
+            nodo.hijos.append(hijo)
+            nodo = hijo
+
+        # 3. Simulación
+        recompensa = self._simular(ia_jugador, oponente, nodo.juega_ia, registro)
+        self.motor._deshacer_accion(registro)
+
+        # 4. Retropropagación: cada nodo acumula la recompensa de quien
+        # jugó el turno que lleva a él
+        while nodo is not None:
+            nodo.visitas += 1
+            if nodo.padre is not None:
+                nodo.valor += recompensa if nodo.padre.juega_ia else 1 - recompensa
+            nodo = nodo.padre
+
+    def _generar_turnos(self, nodo, ia_jugador, oponente):
+        """Turnos posibles del jugador del nodo, en orden aleatorio"""
+        if nodo.juega_ia:
+            turnos = self.motor._generar_turnos(ia_jugador, oponente)
+        else:
+            turnos = self.motor._generar_turnos(oponente, ia_jugador)
+        self.aleatorio.shuffle(turnos)
+        return turnos
+
+    def _seleccionar_hijo(self, nodo):
+        """UCT: promedio de recompensa más término de exploración"""
+        log_visitas = math.log(nodo.visitas)
+        return max(
+            nodo.hijos,
+            key=lambda h: h.valor / h.visitas + self.exploracion * math.sqrt(log_visitas / h.visitas)
+        )
+
+    def _jugar_turno(self, accion, juega_ia, ia_jugador, oponente, registro):
+        """Aplica un turno completo y hace robar al jugador siguiente"""
+        jugador, rival = (ia_jugador, oponente) if juega_ia else (oponente, ia_jugador)
+        self.motor._aplicar_accion(jugador, rival, accion, registro)
+        if not jugador.esta_derrotado() and not rival.esta_derrotado():
+            self.motor._robar(rival, registro)
+
+    def _simular(self, ia_jugador, oponente, juega_ia, registro):
+        """
+        Juega turnos rápidos desde el estado actual y retorna la
+        recompensa para la IA: 1 si gana, 0 si pierde o, al cortar la
+        simulación, la evaluación del estado convertida en probabilidad.
+        """
+        for _ in range(self.turnos_simulacion):
+            if ia_jugador.esta_derrotado() or oponente.esta_derrotado():
+                break
+            jugador, rival = (ia_jugador, oponente) if juega_ia else (oponente, ia_jugador)
+            self._turno_rapido(jugador, rival, registro)
+            if not jugador.esta_derrotado() and not rival.esta_derrotado():
+                self.motor._robar(rival, registro)
+            juega_ia = not juega_ia
+
+        if oponente.esta_derrotado():
+            return 1.0
+        if ia_jugador.esta_derrotado():
+            return 0.0
+
+        evaluacion = self.motor.evaluar_estado(ia_jugador, oponente)
+        return 1 / (1 + math.exp(-evaluacion / self.escala_evaluacion))
+
+    def _turno_rapido(self, jugador, rival, registro):
+        """
+        Turno de la simulación sin fusiones: invocar la carta más fuerte
+        y atacar con la más fuerte al mejor objetivo que pueda destruir.
+        Con probabilidad `epsilon` cada decisión se toma al azar.
+        """
+        aleatorio = self.aleatorio
+
+        # Invocar
+        if jugador.puede_jugar_carta():
+            if aleatorio.random() < self.epsilon:
+                carta = aleatorio.choice(jugador.mano)
+            else:
+                carta = max(jugador.mano, key=lambda c: c.atk)
+            posicion = "ataque" if carta.atk >= carta.defensa else "defensa"
+            self.motor._invocar(jugador, carta, posicion, registro)
+
+        # Atacar
+        atacantes = [c for c in jugador.campo if c.posicion == "ataque"]
+        if not atacantes:
+            return
+
+        if aleatorio.random() < self.epsilon:
+            atacante = aleatorio.choice(atacantes)
+        else:
+            atacante = max(atacantes, key=lambda c: c.atk)
+
+        if not rival.campo:
+            self.motor._danio(rival, atacante.atk, registro)
+            return
+
+        if aleatorio.random() < self.epsilon:
+            objetivo = aleatorio.choice(rival.campo)
+        else:
+            objetivos = [c for c in rival.campo if atacante.atk > c.obtener_poder()]
+            if not objetivos:
+                return
+            objetivo = max(objetivos, key=lambda c: c.obtener_poder())
+        self.motor._simular_batalla(atacante, objetivo, jugador, rival, registro)
+
+    def _linea_mas_visitada(self):
+        """Secuencia de turnos más visitados desde la raíz"""
+        linea = []
+        nodo = self.raiz
+        while nodo.hijos:
+            nodo = max(nodo.hijos, key=lambda n: n.visitas)
+            linea.append(nodo.accion)
+        return linea
+
+    def cerrar(self):
+        """Descarta el árbol (por ejemplo, si cambian las fusiones)"""
+        self.raiz = None
@@ -1,11 +1,184 @@
 import math
+import random
+import time
+from collections import Counter
+from modelo.cache_posiciones import clave_canonica
+from modelo.estadisticas import EstadisticasBusqueda
+from modelo.evaluacion_lote import (
+    PESO_ATAQUE, PESO_CAMPO, PESO_FUERZA, PESO_MANO, PESO_VIDA, codificar_hoja, evaluar_lote
+)
+from modelo.perfil_busqueda import obtener_perfil
+from modelo.tabla_transposicion import EXACTO, COTA_INFERIOR, COTA_SUPERIOR, Zobrist
+from modelo.zona import Mano
+
+# Categoría de cada tipo de acción dentro de un turno: sólo se permite una
+# acción de cada categoría por turno (mismas banderas que usa Juego)
+CATEGORIAS_TURNO = {
+    "fusionar": "fusion",
+    "cadena": "fusion",
+    "jugar": "invocar",
+    "atacar": "ataque",
+    "ataque_directo": "ataque",
+    "cambiar_posicion": "cambio",
+}
+
+# Margen de la poda delta: una captura se descarta si ni ganando su cota
+# más este margen mejora alfa de quien juega
+MARGEN_DELTA = 200
+
+# Todos los valores de evaluar_estado son múltiplos de 0.5 (PESO_FUERZA por
+# ATK/DEF enteros), así que la ventana (alfa, alfa + 0.5) es una ventana nula
+VENTANA_NULA = 0.5
+
+# Semiancho recomendado para `ventana_aspiracion` (el que menos fallos dio
+# en benchmarks/bench_pvs.py; con ventanas menores casi siempre falla)
+VENTANA_ASPIRACION = 1000
+
+# Parte del presupuesto de tiempo de la jugada que puede usar el
+# solucionador de finales; si no resuelve, el resto queda para la búsqueda
+FRACCION_FINAL = 0.5
+
+class BusquedaInterrumpida(Exception):
+    """Se lanza dentro de la búsqueda cuando se agota el presupuesto"""
+
 
 class IAMinimax:
     """Implementa el algoritmo Minimax con poda alfa-beta para Yu-Gi-Oh!"""
     
-    def __init__(self, profundidad=2):
+    def __init__(self, profundidad=2, usar_deshacer=True, tabla_transposicion=None,
+                 presupuesto_ms=None, max_nodos=None, profundidad_maxima=30, trabajadores=1,
+                 turno_completo=False, determinizaciones=0, semilla=None, evaluar_en_lote=False,
+                 verificar_totales=False, respuestas_ponderadas=4, quiescencia=False,
+                 nodos_quiescencia=64, bonos_raiz=True, pvs=True,
+                 ventana_aspiracion=None, jugadas_asesinas=True, historia=True, mvv_lva=True,
+                 perfil=None, acciones_canonicas=True, cartas_final=4, nodos_final=5000,
+                 turnos_final=12, cache_posiciones=None, planificador_fusiones=None):
         self.profundidad = profundidad
         self.fusionador = None
+        # Modo aplicar/deshacer: la búsqueda modifica un único estado y lo
+        # revierte al volver, en lugar de clonar ambos jugadores por nodo
+        self.usar_deshacer = usar_deshacer
+        # Tabla de transposición opcional (TablaTransposicion)
+        self.tabla = tabla_transposicion
+        self.nodos_visitados = 0
+        # Estadísticas de la última llamada a elegir_mejor_jugada
+        self.estadisticas = EstadisticasBusqueda()
+        
+        # Modo "anytime": si hay presupuesto de tiempo o de nodos se usa
+        # profundización iterativa hasta `profundidad_maxima` en lugar de
+        # la profundidad fija
+        self.presupuesto_ms = presupuesto_ms
+        self.max_nodos = max_nodos
+        self.profundidad_maxima = profundidad_maxima
+        self.profundidad_alcanzada = 0
+        self._limite_tiempo = None
+        self._limite_nodos = None
+        self._alcanzo_horizonte = False
+        
+        # Variación principal: mejor línea de la última búsqueda completa
+        self.variacion_principal = []
+        self._linea_previa = []
+        self._lineas = {}
+        self._profundidad_busqueda = profundidad
+        
+        # Con más de un trabajador las acciones de la raíz se reparten
+        # entre procesos (ver modelo/busqueda_paralela.py)
+        self.trabajadores = trabajadores
+        self._paralelo = None
+        
+        # Con turno_completo cada jugada es un turno entero ("turno", plan):
+        # una secuencia de fusionar/invocar/atacar/cambiar posición
+        self.turno_completo = turno_completo
+        self.zobrist = Zobrist()
+        self.secuencias_generadas = 0
+        self.secuencias_fusionadas = 0
+        
+        # Búsqueda determinizada: en lugar de mirar la mano y el orden del
+        # deck reales del oponente se buscan `determinizaciones` muestras
+        # sacadas de las cartas no vistas y se promedian los valores de cada
+        # acción de la raíz. `cartas_catalogo` es el conjunto de cartas del
+        # que salen los decks (lo asigna Juego)
+        self.determinizaciones = determinizaciones
+        self.cartas_catalogo = None
+        self.aleatorio = random.Random(semilla)
+        self.valores_raiz = {}
+        self.valores_por_profundidad = {}
+        
+        # En el último nivel los hijos se evalúan todos juntos con
+        # `evaluar_lote` (NumPy si está instalado) en lugar de uno a uno
+        self.evaluar_en_lote = evaluar_en_lote
+        
+        # Totales incrementales del campo de cada jugador del estado de
+        # búsqueda: [fuerza, cartas en ataque]. Los mantienen los cambios
+        # elementales (y sus deshacer) en modo deshacer; con
+        # `verificar_totales` cada evaluación los compara con el recálculo
+        self._totales = {}
+        self.verificar_totales = verificar_totales
+        
+        # Ponderación: mientras piensa el humano se buscan sus
+        # `respuestas_ponderadas` jugadas más probables y se guarda la
+        # mejor jugada de la IA para cada estado resultante
+        self.respuestas_ponderadas = respuestas_ponderadas
+        self._ponderadas = {}
+        self._senal_detener = None
+        self._profundidad_real = 0
+        self._arbol_completo = False
+        
+        # Quiescencia: bajo el horizonte se siguen explorando sólo capturas
+        # hasta que el campo quede tranquilo, con como mucho
+        # `nodos_quiescencia` nodos por hoja. `bonos_raiz` activa los bonus
+        # fijos por tipo de acción en la raíz (ver _bono_raiz)
+        self.quiescencia = quiescencia
+        self.nodos_quiescencia = nodos_quiescencia
+        self._restantes_quiescencia = 0
+        self.bonos_raiz = bonos_raiz
+        
+        # Búsqueda de variación principal (ventanas nulas tras la primera
+        # jugada de cada nodo) y semiancho de la ventana de aspiración de la
+        # profundización iterativa (None: siempre con la ventana completa)
+        self.pvs = pvs
+        self.ventana_aspiracion = ventana_aspiracion
+        
+        # Orden de jugadas en los nodos interiores (ver _ordenar_jugadas):
+        # jugadas asesinas por ply, tabla de historia por clave de acción y
+        # capturas ordenadas por víctima más valiosa / atacante menos valioso
+        self.jugadas_asesinas = jugadas_asesinas
+        self.historia = historia
+        self.mvv_lva = mvv_lva
+        self._asesinas = {}
+        self._historia = {}
+        
+        # Búsqueda selectiva: anchos del haz por tipo de acción y
+        # reducciones de jugadas tardías (PerfilBusqueda o su nombre)
+        self.perfil = obtener_perfil(perfil)
+        
+        # Las copias de una carta (misma firma, ver _firma_carta) dan
+        # acciones y subárboles idénticos: con `acciones_canonicas` cada
+        # acción equivalente se genera una sola vez
+        self.acciones_canonicas = acciones_canonicas
+        
+        # Finales: con `cartas_final` cartas o menos entre decks, manos y
+        # campos de ambos jugadores se intenta resolver la partida de forma
+        # exacta (ver modelo/solucionador_finales.py) con como mucho
+        # `nodos_final` estados y `turnos_final` turnos de horizonte.
+        # None desactiva el solucionador. Con 4 cartas o menos
+        # benchmarks/bench_finales.py resolvió todas las posiciones en
+        # unos 20 ms; con 5 ya agota los nodos en la mitad
+        self.cartas_final = cartas_final
+        self.nodos_final = nodos_final
+        self.turnos_final = turnos_final
+        # Finales intentados por esta IA y cuántos se resolvieron
+        self.finales_intentados = 0
+        self.finales_resueltos = 0
+        
+        # Caché persistente opcional (CachePosiciones) de posiciones ya
+        # buscadas, compartida entre partidas y procesos
+        self.cache_posiciones = cache_posiciones
+        
+        # Con un planificador de fusiones (PlanificadorFusiones) también se
+        # generan cadenas de dos o más fusiones ("cadena", pasos) como una
+        # sola acción de la categoría fusión
+        self.planificador_fusiones = planificador_fusiones
     
     def evaluar_estado(self, jugador_max, jugador_min):
         """
@@ -15,90 +188,552 @@ class IAMinimax:
         # Diferencia de puntos de vida
         diferencia_vida = jugador_max.puntos_vida - jugador_min.puntos_vida
         
-        # Fuerza total en el campo
-        fuerza_max = sum(c.obtener_poder() for c in jugador_max.campo)
-        fuerza_min = sum(c.obtener_poder() for c in jugador_min.campo)
+        totales_max = self._totales.get(jugador_max)
+        totales_min = self._totales.get(jugador_min)
+        
+        # Fuerza total en el campo y cartas en ataque: mantenidas por la
+        # búsqueda si las hay, o recorriendo el campo
+        if totales_max is not None and totales_min is not None:
+            fuerza_max, cartas_ataque_max = totales_max
+            fuerza_min, cartas_ataque_min = totales_min
+            if self.verificar_totales:
+                self._comprobar_totales(jugador_max)
+                self._comprobar_totales(jugador_min)
+        else:
+            fuerza_max, cartas_ataque_max = self._calcular_totales(jugador_max)
+            fuerza_min, cartas_ataque_min = self._calcular_totales(jugador_min)
+        
         diferencia_fuerza = fuerza_max - fuerza_min
         
         # Ventaja de cartas
         diferencia_mano = len(jugador_max.mano) - len(jugador_min.mano)
         diferencia_campo = len(jugador_max.campo) - len(jugador_min.campo)
         
-        # Bonificación por cartas en ataque
-        cartas_ataque_max = sum(1 for c in jugador_max.campo if c.posicion == "ataque")
-        cartas_ataque_min = sum(1 for c in jugador_min.campo if c.posicion == "ataque")
-        
         # Cálculo ponderado
         evaluacion = (
-            diferencia_vida * 2 +
-            diferencia_fuerza * 0.5 +
-            diferencia_mano * 100 +
-            diferencia_campo * 150 +
-            (cartas_ataque_max - cartas_ataque_min) * 50
+            diferencia_vida * PESO_VIDA +
+            diferencia_fuerza * PESO_FUERZA +
+            diferencia_mano * PESO_MANO +
+            diferencia_campo * PESO_CAMPO +
+            (cartas_ataque_max - cartas_ataque_min) * PESO_ATAQUE
         )
         
         return evaluacion
     
-    def minimax(self, jugador_max, jugador_min, profundidad, alfa, beta, es_maximizador):
-        """Algoritmo Minimax con poda alfa-beta"""
+    # ========== TOTALES INCREMENTALES DE LA EVALUACIÓN ==========
+    
+    @staticmethod
+    def _calcular_totales(jugador):
+        """[fuerza, cartas en ataque] del campo, recorriéndolo completo"""
+        fuerza = sum(c.obtener_poder() for c in jugador.campo)
+        cartas_ataque = sum(1 for c in jugador.campo if c.posicion == "ataque")
+        return [fuerza, cartas_ataque]
+    
+    def _iniciar_totales(self, ia_jugador, oponente):
+        """Calcula los totales de la raíz de una búsqueda en modo deshacer"""
+        self._totales = {}
+        if self.usar_deshacer:
+            self._totales[ia_jugador] = self._calcular_totales(ia_jugador)
+            self._totales[oponente] = self._calcular_totales(oponente)
+    
+    def _sumar_al_campo(self, jugador, carta, signo):
+        """Suma (signo 1) o resta (signo -1) una carta a los totales del jugador"""
+        totales = self._totales.get(jugador)
+        if totales is not None:
+            totales[0] += signo * carta.obtener_poder()
+            if carta.posicion == "ataque":
+                totales[1] += signo
+    
+    def _comprobar_totales(self, jugador):
+        """Modo depuración: los totales deben coincidir con el recálculo"""
+        esperado = self._calcular_totales(jugador)
+        if self._totales[jugador] != esperado:
+            raise RuntimeError(
+                f"Totales incrementales de {jugador.nombre} desincronizados: "
+                f"{self._totales[jugador]} != {esperado}"
+            )
+    
+    def negamax(self, jugador_max, jugador_min, profundidad, alfa, beta, es_maximizador):
+        """
+        Minimax con poda alfa-beta en forma negamax: el valor es siempre
+        desde el punto de vista de quien juega (el maximizador si
+        `es_maximizador`), así que ambos jugadores comparten el mismo código.
+        
+        Con `pvs` sólo la primera jugada (la de la variación principal) se
+        busca con la ventana completa; las demás con una ventana nula que
+        sólo comprueba si la superan, y se vuelven a buscar si es así. Las
+        jugadas tardías que indique el perfil se buscan además con menos
+        profundidad (LMR) y se repiten completas si superan alfa.
+        """
+        self.nodos_visitados += 1
+        self._verificar_presupuesto()
+        
+        ply = self._profundidad_busqueda - profundidad
+        self._lineas[ply] = []
+        self.estadisticas.registrar_nodo(ply)
+        signo = 1 if es_maximizador else -1
+        
         # Condiciones de parada
-        if profundidad == 0 or jugador_max.esta_derrotado() or jugador_min.esta_derrotado():
-            return self.evaluar_estado(jugador_max, jugador_min)
+        if jugador_max.esta_derrotado() or jugador_min.esta_derrotado():
+            self.estadisticas.hojas += 1
+            return signo * self.evaluar_estado(jugador_max, jugador_min)
+        if profundidad == 0:
+            self._alcanzo_horizonte = True
+            self.estadisticas.hojas += 1
+            if self.quiescencia:
+                self._restantes_quiescencia = self.nodos_quiescencia
+                return self._quiescencia(jugador_max, jugador_min, alfa, beta, es_maximizador)
+            return signo * self.evaluar_estado(jugador_max, jugador_min)
+        
+        # Consultar la tabla de transposición (la clave incluye quién juega,
+        # así que sus valores están desde el punto de vista de ese jugador)
+        alfa_original, beta_original = alfa, beta
+        clave = None
+        if self.tabla is not None:
+            clave = self.tabla.clave_estado(jugador_max, jugador_min, es_maximizador)
+            entrada = self.tabla.buscar(clave, profundidad)
+            
+            if entrada is not None:
+                # El valor guardado viene de un árbol cortado en el
+                # horizonte: la profundización iterativa debe seguir
+                if entrada.tipo == EXACTO:
+                    self.estadisticas.cortes_tabla += 1
+                    self._alcanzo_horizonte = self._alcanzo_horizonte or entrada.horizonte
+                    return entrada.valor
+                if entrada.tipo == COTA_INFERIOR:
+                    alfa = max(alfa, entrada.valor)
+                else:
+                    beta = min(beta, entrada.valor)
+                if beta <= alfa:
+                    self.estadisticas.cortes_tabla += 1
+                    self._alcanzo_horizonte = self._alcanzo_horizonte or entrada.horizonte
+                    return entrada.valor
         
         jugador_actual = jugador_max if es_maximizador else jugador_min
         oponente = jugador_min if es_maximizador else jugador_max
         
-        if es_maximizador:
-            max_eval = -math.inf
-            acciones = self._generar_acciones(jugador_actual, oponente)
-            
-            for accion in acciones:
-                clon_actual = jugador_actual.clonar()
-                clon_oponente = oponente.clonar()
-                self._aplicar_accion(clon_actual, clon_oponente, accion)
-                
-                eval = self.minimax(
-                    clon_actual if es_maximizador else clon_oponente,
-                    clon_oponente if es_maximizador else clon_actual,
-                    profundidad - 1,
-                    alfa,
-                    beta,
-                    False
-                )
+        acciones = self._ordenar_por_linea(
+            self._ordenar_jugadas(self._generar_jugadas(jugador_actual, oponente), ply), ply
+        )
+        valor = -math.inf
+        
+        # Si este subárbol llega al horizonte se guarda en su entrada
+        horizonte_previo = self._alcanzo_horizonte
+        self._alcanzo_horizonte = False
+        
+        if profundidad == 1 and self.evaluar_en_lote and not self.quiescencia:
+            # Todos los hijos son hojas: se evalúan en una sola llamada
+            valores = self._evaluar_hijos_en_lote(jugador_max, jugador_min, acciones, es_maximizador)
+            self.estadisticas.registrar_nodo(ply + 1, len(acciones))
+            self._lineas[ply + 1] = []
+            for accion, eval in zip(acciones, valores):
+                if signo * eval > valor:
+                    valor = signo * eval
+                    self._actualizar_linea(ply, accion)
+        
+        else:
+            for indice, accion in enumerate(acciones):
+                reduccion = self._reduccion_lmr(accion, indice, profundidad, ply)
+                if indice == 0 or not (self.pvs or reduccion):
+                    eval = self._evaluar_hijo(
+                        jugador_max, jugador_min, accion, es_maximizador,
+                        profundidad - 1, alfa, beta
+                    )
+                else:
+                    techo = alfa + VENTANA_NULA if self.pvs else beta
+                    eval = self._evaluar_hijo(
+                        jugador_max, jugador_min, accion, es_maximizador,
+                        profundidad - 1 - reduccion, alfa, techo
+                    )
+                    # Jugada reducida que supera alfa: se busca completa
+                    if reduccion and eval > alfa:
+                        self.estadisticas.re_busquedas_lmr += 1
+                        eval = self._evaluar_hijo(
+                            jugador_max, jugador_min, accion, es_maximizador,
+                            profundidad - 1, alfa, techo
+                        )
+                    # La superó: hay que saber por cuánto
+                    if self.pvs and alfa < eval < beta:
+                        self.estadisticas.re_busquedas += 1
+                        eval = self._evaluar_hijo(
+                            jugador_max, jugador_min, accion, es_maximizador,
+                            profundidad - 1, alfa, beta
+                        )
                 
-                max_eval = max(max_eval, eval)
+                if eval > valor:
+                    valor = eval
+                    self._actualizar_linea(ply, accion)
                 alfa = max(alfa, eval)
                 
                 if beta <= alfa:
+                    self.estadisticas.registrar_corte(ply)
+                    if indice == 0:
+                        self.estadisticas.cortes_primera_jugada += 1
+                    self._registrar_corte_jugada(accion, ply, profundidad)
                     break
+        
+        horizonte = self._alcanzo_horizonte
+        self._alcanzo_horizonte = horizonte_previo or horizonte
+        
+        # Guardar el resultado indicando si es exacto o sólo una cota
+        if clave is not None:
+            if valor <= alfa_original:
+                tipo = COTA_SUPERIOR
+            elif valor >= beta_original:
+                tipo = COTA_INFERIOR
+            else:
+                tipo = EXACTO
+            self.tabla.guardar(clave, profundidad, valor, tipo, horizonte)
+        
+        return valor
+    
+    def _evaluar_hijo(self, jugador_max, jugador_min, accion, juega_max, profundidad, alfa, beta):
+        """
+        Aplica la acción del jugador en turno, evalúa el estado resultante
+        con negamax (le toca al rival) y devuelve el valor desde el punto de
+        vista de quien hizo la acción; `alfa` y `beta` también son suyos.
+        
+        En modo deshacer la acción se aplica sobre el mismo estado y se
+        revierte antes de retornar; en otro caso se trabaja sobre clones.
+        """
+        if self.usar_deshacer:
+            actual = jugador_max if juega_max else jugador_min
+            rival = jugador_min if juega_max else jugador_max
             
-            return max_eval
+            registro = []
+            self._aplicar_accion(actual, rival, accion, registro)
+            try:
+                return -self.negamax(jugador_max, jugador_min, profundidad, -beta, -alfa, not juega_max)
+            finally:
+                # También si se interrumpe la búsqueda: el estado queda intacto
+                self._deshacer_accion(registro)
         
+        clon_max = jugador_max.clonar()
+        clon_min = jugador_min.clonar()
+        if juega_max:
+            self._aplicar_accion(clon_max, clon_min, accion)
         else:
-            min_eval = math.inf
-            acciones = self._generar_acciones(jugador_actual, oponente)
+            self._aplicar_accion(clon_min, clon_max, accion)
+        
+        return -self.negamax(clon_max, clon_min, profundidad, -beta, -alfa, not juega_max)
+    
+    def _evaluar_hijos_en_lote(self, jugador_max, jugador_min, acciones, juega_max):
+        """
+        Aplica cada acción, codifica el estado hoja resultante y lo revierte;
+        luego evalúa todas las hojas con una sola llamada a `evaluar_lote`.
+        """
+        filas = []
+        for accion in acciones:
+            self.nodos_visitados += 1
             
-            for accion in acciones:
-                clon_actual = jugador_actual.clonar()
-                clon_oponente = oponente.clonar()
-                self._aplicar_accion(clon_actual, clon_oponente, accion)
-                
-                eval = self.minimax(
-                    clon_oponente if not es_maximizador else clon_actual,
-                    clon_actual if not es_maximizador else clon_oponente,
-                    profundidad - 1,
-                    alfa,
-                    beta,
-                    True
-                )
-                
-                min_eval = min(min_eval, eval)
-                beta = min(beta, eval)
-                
-                if beta <= alfa:
-                    break
+            if self.usar_deshacer:
+                hoja_max, hoja_min = jugador_max, jugador_min
+                registro = []
+            else:
+                hoja_max, hoja_min = jugador_max.clonar(), jugador_min.clonar()
+                registro = None
+            
+            if juega_max:
+                self._aplicar_accion(hoja_max, hoja_min, accion, registro)
+            else:
+                self._aplicar_accion(hoja_min, hoja_max, accion, registro)
+            
+            if not hoja_max.esta_derrotado() and not hoja_min.esta_derrotado():
+                self._alcanzo_horizonte = True
+            filas.append(codificar_hoja(hoja_max, hoja_min))
             
-            return min_eval
+            if registro is not None:
+                self._deshacer_accion(registro)
+        
+        self._verificar_presupuesto()
+        self.estadisticas.hojas += len(filas)
+        return evaluar_lote(filas)
+    
+    # ========== QUIESCENCIA ==========
+    
+    def _quiescencia(self, jugador_max, jugador_min, alfa, beta, es_maximizador):
+        """
+        Búsqueda de quiescencia bajo el horizonte: el jugador en turno puede
+        quedarse con la evaluación estática o hacer una captura (atacar o
+        ataque directo), y así hasta que no queden capturas que valgan la
+        pena. Poda delta con `_ganancia_captura` y tope de nodos por hoja.
+        
+        Igual que `negamax`, el valor es desde el punto de vista de quien juega.
+        """
+        self.nodos_visitados += 1
+        self.estadisticas.nodos_quiescencia += 1
+        self._restantes_quiescencia -= 1
+        self._verificar_presupuesto()
+        
+        estatica = self.evaluar_estado(jugador_max, jugador_min)
+        if not es_maximizador:
+            estatica = -estatica
+        if jugador_max.esta_derrotado() or jugador_min.esta_derrotado():
+            return estatica
+        if self._restantes_quiescencia <= 0:
+            return estatica
+        
+        # Quedarse quieto: cota inferior para quien juega
+        if estatica >= beta:
+            return estatica
+        alfa = max(alfa, estatica)
+        
+        jugador_actual = jugador_max if es_maximizador else jugador_min
+        oponente = jugador_min if es_maximizador else jugador_max
+        
+        capturas = [(self._ganancia_captura(c, oponente), c)
+                    for c in self._acciones_distintas(self._generar_capturas(jugador_actual, oponente))]
+        capturas.sort(key=lambda x: -x[0])
+        
+        valor = estatica
+        for ganancia, captura in capturas:
+            # Un ataque que no destruye ni hace daño nunca mejora quedarse quieto
+            if ganancia <= 0:
+                break
+            # Poda delta: ni en el mejor caso la captura cambia el resultado
+            # (están ordenadas, así que tampoco las siguientes)
+            if estatica + ganancia + MARGEN_DELTA <= alfa:
+                break
+            
+            eval = self._evaluar_captura(jugador_max, jugador_min, captura, es_maximizador, alfa, beta)
+            valor = max(valor, eval)
+            alfa = max(alfa, eval)
+            
+            if beta <= alfa or self._restantes_quiescencia <= 0:
+                break
+        
+        return valor
+    
+    def _evaluar_captura(self, jugador_max, jugador_min, accion, juega_max, alfa, beta):
+        """Como `_evaluar_hijo`, pero sigue con la quiescencia del rival"""
+        if self.usar_deshacer:
+            actual = jugador_max if juega_max else jugador_min
+            rival = jugador_min if juega_max else jugador_max
+            
+            registro = []
+            self._aplicar_accion(actual, rival, accion, registro)
+            try:
+                return -self._quiescencia(jugador_max, jugador_min, -beta, -alfa, not juega_max)
+            finally:
+                self._deshacer_accion(registro)
+        
+        clon_max = jugador_max.clonar()
+        clon_min = jugador_min.clonar()
+        if juega_max:
+            self._aplicar_accion(clon_max, clon_min, accion)
+        else:
+            self._aplicar_accion(clon_min, clon_max, accion)
+        
+        return -self._quiescencia(clon_max, clon_min, -beta, -alfa, not juega_max)
+    
+    @staticmethod
+    def _ganancia_captura(accion, oponente):
+        """
+        Cota superior de cuánto mejora la evaluación, para quien ataca, una
+        captura contra `oponente` (con los mismos pesos de evaluar_estado).
+        """
+        if accion[0] == "ataque_directo":
+            return min(accion[1].atk, oponente.puntos_vida) * PESO_VIDA
+        
+        atacante, objetivo = accion[1]
+        if objetivo.posicion == "ataque":
+            if atacante.atk <= objetivo.atk:
+                return 0
+            danio = min(atacante.atk - objetivo.atk, oponente.puntos_vida)
+            return danio * PESO_VIDA + objetivo.atk * PESO_FUERZA + PESO_CAMPO + PESO_ATAQUE
+        
+        if atacante.atk <= objetivo.defensa:
+            return 0
+        return objetivo.defensa * PESO_FUERZA + PESO_CAMPO
+    
+    # ========== PRESUPUESTO Y VARIACIÓN PRINCIPAL ==========
+    
+    def _verificar_presupuesto(self):
+        """Interrumpe la búsqueda si se agotó el tiempo o los nodos"""
+        if self._senal_detener is not None and self._senal_detener.is_set():
+            raise BusquedaInterrumpida()
+        if self._limite_nodos is not None and self.nodos_visitados > self._limite_nodos:
+            raise BusquedaInterrumpida()
+        if self._limite_tiempo is not None and time.perf_counter() >= self._limite_tiempo:
+            raise BusquedaInterrumpida()
+    
+    def _actualizar_linea(self, ply, accion):
+        """La línea de este ply pasa a ser la acción más la línea del hijo"""
+        self._lineas[ply] = [accion] + self._lineas.get(ply + 1, [])
+    
+    def _ordenar_por_linea(self, acciones, ply):
+        """Explora primero la acción de la variación principal previa en este ply"""
+        if ply >= len(self._linea_previa):
+            return acciones
+        
+        objetivo = self._clave_accion(self._linea_previa[ply])
+        for i, accion in enumerate(acciones):
+            if self._clave_accion(accion) == objetivo:
+                return [accion] + acciones[:i] + acciones[i + 1:]
+        return acciones
+    
+    # ========== ORDEN DE JUGADAS ==========
+    
+    def _ordenar_jugadas(self, acciones, ply):
+        """
+        Ordena las jugadas de un nodo interior con las heurísticas activas:
+        primero las capturas que ganan (MVV-LVA), luego las jugadas
+        asesinas de este ply y el resto según la tabla de historia. Los
+        empates conservan el orden de generación.
+        """
+        if not (self.mvv_lva or self.jugadas_asesinas or self.historia):
+            return acciones
+        
+        asesinas = self._asesinas.get(ply, []) if self.jugadas_asesinas else []
+        
+        def prioridad(accion):
+            if self.mvv_lva:
+                puntaje = self._puntaje_mvv_lva(accion)
+                if puntaje is not None:
+                    return (2, puntaje)
+            clave = self._clave_accion(accion)
+            if clave in asesinas:
+                return (1, (-asesinas.index(clave),))
+            return (0, (self._historia.get(clave, 0) if self.historia else 0,))
+        
+        return sorted(acciones, key=prioridad, reverse=True)
+    
+    @staticmethod
+    def _puntaje_mvv_lva(accion):
+        """
+        Puntaje MVV-LVA de una captura que gana (o de un turno que la
+        incluye): primero los ataques directos, luego por víctima más
+        valiosa y, a igual víctima, por atacante menos valioso. None si la
+        jugada no es una captura que gane.
+        """
+        if accion[0] == "turno":
+            for sub_accion in accion[1]:
+                puntaje = IAMinimax._puntaje_mvv_lva(sub_accion)
+                if puntaje is not None:
+                    return puntaje
+            return None
+        
+        if accion[0] == "ataque_directo":
+            return (1, accion[1].atk, 0)
+        if accion[0] != "atacar":
+            return None
+        
+        atacante, objetivo = accion[1]
+        victima = objetivo.atk if objetivo.posicion == "ataque" else objetivo.defensa
+        if atacante.atk <= victima:
+            return None
+        return (0, victima, -atacante.atk)
+    
+    def _registrar_corte_jugada(self, accion, ply, profundidad):
+        """
+        La jugada que produjo un corte pasa a ser asesina en su ply y suma
+        profundidad² en la tabla de historia. Las capturas no: ya van
+        primero por MVV-LVA.
+        """
+        if self.mvv_lva and self._puntaje_mvv_lva(accion) is not None:
+            return
+        
+        clave = self._clave_accion(accion)
+        if self.jugadas_asesinas:
+            asesinas = self._asesinas.setdefault(ply, [])
+            if clave not in asesinas:
+                asesinas.insert(0, clave)
+                del asesinas[2:]
+        if self.historia:
+            self._historia[clave] = self._historia.get(clave, 0) + profundidad * profundidad
+    
+    def _reduccion_lmr(self, accion, indice, profundidad, ply):
+        """
+        Plies que se le quitan a una jugada tardía según el perfil. Las
+        capturas que ganan y las jugadas asesinas nunca se reducen.
+        """
+        reduccion = self.perfil.reduccion_lmr(indice, profundidad)
+        if not reduccion:
+            return 0
+        if self._puntaje_mvv_lva(accion) is not None:
+            return 0
+        if self.jugadas_asesinas and self._clave_accion(accion) in self._asesinas.get(ply, []):
+            return 0
+        self.estadisticas.reducciones_lmr += 1
+        return reduccion
+    
+    @staticmethod
+    def _clave_accion(accion):
+        """Identifica una acción por su tipo y las cartas involucradas"""
+        tipo, datos = accion
+        
+        if tipo == "jugar":
+            return (tipo, datos[0].nombre, datos[1])
+        if tipo in ("atacar", "fusionar"):
+            return (tipo, datos[0].nombre, datos[1].nombre)
+        if tipo == "cadena":
+            return (tipo, datos[0][0].nombre) + tuple(paso[1].nombre for paso in datos)
+        if tipo in ("ataque_directo", "cambiar_posicion"):
+            return (tipo, datos.nombre)
+        if tipo == "turno":
+            return (tipo,) + tuple(IAMinimax._clave_accion(a) for a in datos)
+        return (tipo,)
+    
+    # ========== TURNOS COMPLETOS ==========
+    
+    def _generar_jugadas(self, jugador, oponente):
+        """Jugadas de un nodo: acciones sueltas o turnos completos"""
+        if self.turno_completo:
+            return self._generar_turnos(jugador, oponente)
+        return self._generar_acciones(jugador, oponente)
+    
+    def _generar_turnos(self, jugador, oponente, parcial=False):
+        """
+        Genera los turnos completos posibles del jugador como acciones
+        ("turno", plan), donde plan es una tupla de acciones que usa como
+        mucho una acción de cada categoría (fusión, invocación, ataque y
+        cambio de posición). El plan vacío equivale a pasar.
+        
+        Las secuencias que llegan al mismo estado final se fusionan: sólo se
+        conserva la primera encontrada.
+        
+        Si se agota el presupuesto a mitad del recorrido se lanza
+        BusquedaInterrumpida; con `parcial` (la raíz) se retornan los
+        turnos encontrados hasta ahí, siempre al menos el de pasar.
+        """
+        finales = {}
+        try:
+            self._explorar_turno(jugador, oponente, (), frozenset(), finales, set())
+        except BusquedaInterrumpida:
+            if not parcial:
+                raise
+        return [("turno", plan) for plan in finales.values()]
+    
+    def _explorar_turno(self, jugador, oponente, plan, usadas, finales, visitados):
+        """Recorre en profundidad las secuencias de acciones de un turno"""
+        self._verificar_presupuesto()
+        clave = self.zobrist.hash_estado(jugador, oponente, True)
+        
+        # Mismo estado con las mismas categorías usadas: todo lo que siga
+        # ya se exploró por otro orden
+        if (clave, usadas) in visitados:
+            self.secuencias_fusionadas += 1
+            return
+        visitados.add((clave, usadas))
+        self.secuencias_generadas += 1
+        
+        if clave not in finales:
+            finales[clave] = plan
+        
+        if jugador.esta_derrotado() or oponente.esta_derrotado():
+            return
+        
+        for accion in self._generar_acciones(jugador, oponente):
+            categoria = CATEGORIAS_TURNO.get(accion[0])
+            if categoria is None or categoria in usadas:
+                continue
+            
+            registro = []
+            self._aplicar_accion(jugador, oponente, accion, registro)
+            try:
+                self._explorar_turno(jugador, oponente, plan + (accion,), usadas | {categoria}, finales, visitados)
+            finally:
+                self._deshacer_accion(registro)
     
     def _generar_acciones(self, jugador, oponente):
         """Genera acciones posibles con estrategia inteligente"""
@@ -111,16 +746,24 @@ class IAMinimax:
                 self.cartas_disponibles
             )
             
-            # Evaluar solo fusiones beneficiosas
-            for carta1, carta2, resultado in fusiones_posibles[:3]:
+            # Evaluar solo fusiones beneficiosas (entre las candidatas del perfil)
+            for carta1, carta2, resultado in fusiones_posibles[:self.perfil.ancho("fusionar")]:
                 if self.fusionador.es_fusion_beneficiosa(carta1, carta2, resultado):
                     acciones.append(("fusionar", (carta1, carta2, resultado)))
         
+        # 0b. CADENAS DE FUSIONES (con planificador)
+        if len(jugador.mano) >= 3 and self.planificador_fusiones and self.fusionador and self.cartas_disponibles:
+            for cadena in self.planificador_fusiones.cadenas(
+                jugador.mano, self.fusionador, self.cartas_disponibles,
+                self.perfil.ancho("cadena"), minimo_pasos=2
+            ):
+                acciones.append(("cadena", cadena))
+        
         # 1. INVOCAR
         if jugador.puede_jugar_carta() and jugador.mano:
             cartas_ordenadas = sorted(jugador.mano, key=lambda c: c.atk, reverse=True)
             
-            for carta in cartas_ordenadas[:3]:
+            for carta in cartas_ordenadas[:self.perfil.ancho("jugar")]:
                 if oponente.tiene_cartas_campo():
                     carta_enemiga_fuerte = max(oponente.campo, key=lambda c: c.atk)
                     
@@ -134,10 +777,11 @@ class IAMinimax:
                     acciones.append(("jugar", (carta, "defensa")))
         
         # 2. CAMBIAR POSICIÓN
+        cambios = []
         for carta in jugador.campo:
             if carta.posicion == "defensa":
                 if not oponente.campo:
-                    acciones.append(("cambiar_posicion", carta))
+                    cambios.append(("cambiar_posicion", carta))
                 elif oponente.campo:
                     puede_ganar = False
                     for enemigo in oponente.campo:
@@ -147,7 +791,7 @@ class IAMinimax:
                             puede_ganar = True
                     
                     if puede_ganar:
-                        acciones.append(("cambiar_posicion", carta))
+                        cambios.append(("cambiar_posicion", carta))
             
             elif carta.posicion == "ataque":
                 if oponente.campo:
@@ -162,7 +806,27 @@ class IAMinimax:
                             break
                     
                     if not puede_destruir_algo and carta.defensa > carta.atk:
-                        acciones.append(("cambiar_posicion", carta))
+                        cambios.append(("cambiar_posicion", carta))
+        
+        acciones.extend(cambios[:self.perfil.ancho("cambiar_posicion")])
+        
+        # 3. ATACAR y 4. ATAQUE DIRECTO
+        capturas = self._generar_capturas(jugador, oponente)
+        for tipo in ("atacar", "ataque_directo"):
+            de_tipo = [captura for captura in capturas if captura[0] == tipo]
+            acciones.extend(de_tipo[:self.perfil.ancho(tipo)])
+        
+        # 5. Si no hay acciones, pasar
+        if not acciones:
+            acciones.append(("pasar", None))
+        
+        # Límite total de acciones del perfil; las copias se descartan
+        # después de los anchos para que no dejen lugar a otras acciones
+        return self._acciones_distintas(acciones[:self.perfil.max_acciones])
+    
+    def _generar_capturas(self, jugador, oponente):
+        """Ataques a cartas del rival y ataques directos (las capturas de la quiescencia)"""
+        capturas = []
         
         # 3. ATACAR
         if jugador.tiene_cartas_campo() and oponente.tiene_cartas_campo():
@@ -170,86 +834,732 @@ class IAMinimax:
                 if atacante.posicion == "ataque":
                     for objetivo in oponente.campo:
                         if objetivo.posicion == "ataque" and atacante.atk > objetivo.atk:
-                            acciones.append(("atacar", (atacante, objetivo)))
+                            capturas.append(("atacar", (atacante, objetivo)))
                         elif objetivo.posicion == "defensa" and atacante.atk > objetivo.defensa:
-                            acciones.append(("atacar", (atacante, objetivo)))
+                            capturas.append(("atacar", (atacante, objetivo)))
                         elif objetivo.posicion == "defensa" and (objetivo.defensa - atacante.atk) < 300:
-                            acciones.append(("atacar", (atacante, objetivo)))
+                            capturas.append(("atacar", (atacante, objetivo)))
         
         # 4. ATAQUE DIRECTO
         if jugador.tiene_cartas_campo() and not oponente.tiene_cartas_campo():
             for atacante in jugador.campo:
                 if atacante.posicion == "ataque":
-                    acciones.append(("ataque_directo", atacante))
+                    capturas.append(("ataque_directo", atacante))
         
-        # 5. Si no hay acciones, pasar
-        if not acciones:
-            acciones.append(("pasar", None))
+        return capturas
+    
+    # ========== ACCIONES CANÓNICAS ==========
+    
+    @staticmethod
+    def _firma_carta(carta):
+        """
+        Dos cartas con la misma firma son intercambiables: cada acción
+        encuentra su carta por uid, pero el resultado sólo depende de sus
+        valores.
+        """
+        return (carta.nombre, carta.atk, carta.defensa, carta.posicion)
+    
+    def _distintas(self, cartas):
+        """Una carta por firma (la primera de cada grupo de copias)"""
+        if not self.acciones_canonicas:
+            return cartas
+        
+        vistas = set()
+        distintas = []
+        for carta in cartas:
+            firma = self._firma_carta(carta)
+            if firma not in vistas:
+                vistas.add(firma)
+                distintas.append(carta)
+        return distintas
+    
+    def _fusiones_distintas(self, fusiones):
+        """
+        Una fusión por par de firmas (sin importar el orden) y resultado:
+        con copias en la mano el fusionador repite el mismo par.
+        """
+        if not self.acciones_canonicas:
+            return fusiones
         
-        # Aumentar límite de acciones
-        return acciones[:12]  # De 8 a 12 para mejor exploración
+        vistas = set()
+        distintas = []
+        for carta1, carta2, resultado in fusiones:
+            clave = (tuple(sorted((self._firma_carta(carta1), self._firma_carta(carta2)))),
+                     resultado.nombre)
+            if clave not in vistas:
+                vistas.add(clave)
+                distintas.append((carta1, carta2, resultado))
+        return distintas
     
-    def _aplicar_accion(self, jugador, oponente, accion):
-        """Aplica una acción al estado clonado"""
+    def _firma_accion(self, accion):
+        """
+        Dos acciones con la misma firma son equivalentes. Las cadenas y
+        el pase no se comparan (None).
+        """
         tipo, datos = accion
         
         if tipo == "jugar":
+            return (tipo, self._firma_carta(datos[0]), datos[1])
+        if tipo == "atacar":
+            return (tipo, self._firma_carta(datos[0]), self._firma_carta(datos[1]))
+        if tipo == "fusionar":
+            return (tipo, tuple(sorted((self._firma_carta(datos[0]), self._firma_carta(datos[1])))),
+                    datos[2].nombre)
+        if tipo in ("ataque_directo", "cambiar_posicion"):
+            return (tipo, self._firma_carta(datos))
+        return None
+    
+    def _acciones_distintas(self, acciones):
+        """
+        Una acción por firma (la primera de cada grupo), sin cambiar el
+        orden. Se aplica sobre la lista ya recortada por el perfil: así
+        sólo se podan acciones que de todos modos se iban a buscar.
+        """
+        if not self.acciones_canonicas:
+            return acciones
+        
+        vistas = set()
+        distintas = []
+        for accion in acciones:
+            firma = self._firma_accion(accion)
+            if firma is None or firma not in vistas:
+                vistas.add(firma)
+                distintas.append(accion)
+        return distintas
+    
+    def _aplicar_accion(self, jugador, oponente, accion, registro=None):
+        """
+        Aplica una acción al estado simulado.
+        
+        Si se recibe `registro` (una lista), cada cambio se anota en ella
+        para poder revertirlo después con `_deshacer_accion`.
+        """
+        tipo, datos = accion
+        
+        if tipo == "turno":
+            for sub_accion in datos:
+                self._aplicar_accion(jugador, oponente, sub_accion, registro)
+        
+        elif tipo == "fusionar":
+            carta1, carta2, resultado = datos
+            c1 = jugador.mano.buscar(carta1.uid)
+            c2 = jugador.mano.buscar(carta2.uid)
+            if c1 and c2 and c1 is not c2:
+                self._fusionar(jugador, c1, c2, resultado, registro)
+        
+        elif tipo == "cadena":
+            # Cada paso usa el resultado del anterior, que ya está en la mano
+            for carta1, carta2, resultado in datos:
+                c1 = jugador.mano.buscar(carta1.uid)
+                c2 = jugador.mano.buscar(carta2.uid)
+                if not (c1 and c2 and c1 is not c2):
+                    break
+                self._fusionar(jugador, c1, c2, resultado, registro)
+        
+        elif tipo == "jugar":
             carta, posicion = datos
-            carta_en_mano = next((c for c in jugador.mano if c.nombre == carta.nombre), None)
+            carta_en_mano = jugador.mano.buscar(carta.uid)
             if carta_en_mano:
-                jugador.jugar_carta(carta_en_mano, posicion)
+                self._invocar(jugador, carta_en_mano, posicion, registro)
         
         elif tipo == "atacar":
             atacante, objetivo = datos
-            atacante_en_campo = next((c for c in jugador.campo if c.nombre == atacante.nombre), None)
-            objetivo_en_campo = next((c for c in oponente.campo if c.nombre == objetivo.nombre), None)
+            atacante_en_campo = jugador.campo.buscar(atacante.uid)
+            objetivo_en_campo = oponente.campo.buscar(objetivo.uid)
             
             if atacante_en_campo and objetivo_en_campo:
-                self._simular_batalla(atacante_en_campo, objetivo_en_campo, jugador, oponente)
+                self._simular_batalla(atacante_en_campo, objetivo_en_campo, jugador, oponente, registro)
         
         elif tipo == "ataque_directo":
             atacante = datos
-            atacante_en_campo = next((c for c in jugador.campo if c.nombre == atacante.nombre), None)
+            atacante_en_campo = jugador.campo.buscar(atacante.uid)
             if atacante_en_campo:
-                oponente.recibir_danio(atacante_en_campo.atk)
+                self._danio(oponente, atacante_en_campo.atk, registro)
         
         elif tipo == "cambiar_posicion":
             carta = datos
-            carta_en_campo = next((c for c in jugador.campo if c.nombre == carta.nombre), None)
+            carta_en_campo = jugador.campo.buscar(carta.uid)
             if carta_en_campo:
-                carta_en_campo.cambiar_posicion()
+                self._cambiar_posicion(jugador, carta_en_campo, registro)
+    
+    # ========== CAMBIOS ELEMENTALES CON REGISTRO PARA DESHACER ==========
+    
+    def _invocar(self, jugador, carta, posicion, registro):
+        """Mueve una carta de la mano al campo"""
+        if registro is not None:
+            indice = jugador.mano.index(carta)
+            posicion_anterior = carta.posicion
+            en_campo_anterior = carta.en_campo
+        
+        if jugador.jugar_carta(carta, posicion):
+            self._sumar_al_campo(jugador, carta, 1)
+            if registro is not None:
+                registro.append(("invocar", jugador, carta, indice, posicion_anterior, en_campo_anterior))
+    
+    def _fusionar(self, jugador, carta1, carta2, resultado, registro):
+        """Envía dos cartas de la mano al cementerio y agrega el resultado"""
+        if registro is not None:
+            registro.append((
+                "fusionar", jugador,
+                carta1, jugador.mano.index(carta1),
+                carta2, jugador.mano.index(carta2)
+            ))
+        
+        jugador.mano.remove(carta1)
+        jugador.mano.remove(carta2)
+        jugador.cementerio.append(carta1)
+        jugador.cementerio.append(carta2)
+        jugador.mano.append(resultado)
     
-    def _simular_batalla(self, atacante, defensor, atacante_jugador, defensor_jugador):
+    def _destruir(self, jugador, carta, registro):
+        """Envía una carta del campo al cementerio"""
+        if carta in jugador.campo:
+            self._sumar_al_campo(jugador, carta, -1)
+            if registro is not None:
+                registro.append(("destruir", jugador, carta, jugador.campo.index(carta)))
+        jugador.remover_carta_campo(carta)
+    
+    def _danio(self, jugador, cantidad, registro):
+        """Resta puntos de vida a un jugador"""
+        if registro is not None:
+            registro.append(("vida", jugador, jugador.puntos_vida))
+        jugador.recibir_danio(cantidad)
+    
+    def _cambiar_posicion(self, jugador, carta, registro):
+        """Alterna la posición de una carta en el campo"""
+        if registro is not None:
+            registro.append(("posicion", jugador, carta))
+        self._sumar_al_campo(jugador, carta, -1)
+        carta.cambiar_posicion()
+        self._sumar_al_campo(jugador, carta, 1)
+    
+    def _robar(self, jugador, registro):
+        """Roba la primera carta del deck a la mano"""
+        carta = jugador.robar_carta()
+        if carta is not None and registro is not None:
+            registro.append(("robar", jugador))
+        return carta
+    
+    def _deshacer_accion(self, registro):
+        """Revierte, en orden inverso, los cambios anotados en el registro"""
+        while registro:
+            entrada = registro.pop()
+            tipo = entrada[0]
+            
+            if tipo == "vida":
+                _, jugador, puntos_vida = entrada
+                jugador.puntos_vida = puntos_vida
+            
+            elif tipo == "invocar":
+                _, jugador, carta, indice, posicion, en_campo = entrada
+                self._sumar_al_campo(jugador, carta, -1)
+                jugador.campo.pop()
+                jugador.mano.insert(indice, carta)
+                carta.posicion = posicion
+                carta.en_campo = en_campo
+            
+            elif tipo == "destruir":
+                _, jugador, carta, indice = entrada
+                jugador.cementerio.pop()
+                jugador.campo.insert(indice, carta)
+                carta.en_campo = True
+                self._sumar_al_campo(jugador, carta, 1)
+            
+            elif tipo == "fusionar":
+                _, jugador, carta1, indice1, carta2, indice2 = entrada
+                jugador.mano.pop()
+                jugador.cementerio.pop()
+                jugador.cementerio.pop()
+                # Reinsertar primero la de menor índice
+                for indice, carta in sorted(((indice1, carta1), (indice2, carta2)), key=lambda x: x[0]):
+                    jugador.mano.insert(indice, carta)
+            
+            elif tipo == "posicion":
+                _, jugador, carta = entrada
+                self._sumar_al_campo(jugador, carta, -1)
+                carta.cambiar_posicion()
+                self._sumar_al_campo(jugador, carta, 1)
+            
+            elif tipo == "robar":
+                jugador = entrada[1]
+                jugador.deck.insert(0, jugador.mano.pop())
+    
+    def _simular_batalla(self, atacante, defensor, atacante_jugador, defensor_jugador, registro=None):
         """Simula batalla para clones según reglas de Forbidden Memories"""
         if defensor.posicion == "ataque":
             # Batalla ATK vs ATK - Daño al jugador por diferencia
             if atacante.atk > defensor.atk:
                 diferencia = atacante.atk - defensor.atk
-                defensor_jugador.recibir_danio(diferencia)
-                defensor_jugador.remover_carta_campo(defensor)
+                self._danio(defensor_jugador, diferencia, registro)
+                self._destruir(defensor_jugador, defensor, registro)
             elif atacante.atk < defensor.atk:
                 diferencia = defensor.atk - atacante.atk
-                atacante_jugador.recibir_danio(diferencia)
-                atacante_jugador.remover_carta_campo(atacante)
+                self._danio(atacante_jugador, diferencia, registro)
+                self._destruir(atacante_jugador, atacante, registro)
             else:
                 # Empate - ambas destruidas, SIN daño
-                defensor_jugador.remover_carta_campo(defensor)
-                atacante_jugador.remover_carta_campo(atacante)
+                self._destruir(defensor_jugador, defensor, registro)
+                self._destruir(atacante_jugador, atacante, registro)
         else:
             # Batalla ATK vs DEF - Sin daño al defensor
             if atacante.atk > defensor.defensa:
                 # Destruye pero SIN daño al jugador defensor
-                defensor_jugador.remover_carta_campo(defensor)
+                self._destruir(defensor_jugador, defensor, registro)
             elif atacante.atk < defensor.defensa:
                 # Daño de retroceso al atacante
                 diferencia = defensor.defensa - atacante.atk
-                atacante_jugador.recibir_danio(diferencia)
+                self._danio(atacante_jugador, diferencia, registro)
             # Si son iguales, no pasa nada
     
-    def elegir_mejor_jugada(self, ia_jugador, oponente):
-        """Elige la mejor jugada usando Minimax con priorización inteligente"""
-        mejor_accion = None
+    def elegir_mejor_jugada(self, ia_jugador, oponente, senal_detener=None):
+        """
+        Elige la mejor jugada usando Minimax con priorización inteligente.
+        
+        Si la IA tiene presupuesto (`presupuesto_ms` o `max_nodos`) se
+        profundiza 1, 2, 3... hasta agotarlo y se retorna la mejor jugada
+        de la última iteración completa. Si no, se busca a `profundidad`.
+        
+        Con `turno_completo` la jugada retornada es ("turno", plan) con
+        todas las acciones del turno de la IA.
+        
+        Con `determinizaciones` se busca sobre muestras de las cartas
+        ocultas del oponente en lugar de sobre las reales.
+        
+        Con `cache_posiciones` una posición ya buscada al menos tan hondo
+        se responde con la jugada guardada.
+        
+        En los finales (ver `cartas_final`) primero se intenta resolver la
+        partida de forma exacta; si hay una victoria forzada se juega ésa.
+        
+        Si se activa `senal_detener` (threading.Event) desde otro hilo la
+        búsqueda termina y se retorna la mejor jugada encontrada hasta ahí.
+        """
+        self.nodos_visitados = 0
+        self.secuencias_generadas = 0
+        self.secuencias_fusionadas = 0
+        self.estadisticas = EstadisticasBusqueda()
+        inicio = time.perf_counter()
+        if self.tabla is not None:
+            self.tabla.nueva_busqueda()
+        
+        ponderada = self._jugada_ponderada(ia_jugador, oponente)
+        if ponderada is not None:
+            return ponderada
+        
+        self._senal_detener = senal_detener
+        try:
+            if self.determinizaciones > 0:
+                mejor_accion = self._buscar_determinizado(ia_jugador, oponente)
+            else:
+                # En modo deshacer se clona una sola vez en la raíz para no tocar
+                # el estado real del juego mientras se busca
+                if self.usar_deshacer:
+                    ia_jugador = ia_jugador.clonar()
+                    oponente = oponente.clonar()
+                mejor_accion = self._jugada_en_cache(ia_jugador, oponente)
+                if mejor_accion is None:
+                    mejor_accion = self._resolver_final(ia_jugador, oponente)
+                if mejor_accion is None:
+                    presupuesto_ms = self.presupuesto_ms
+                    if presupuesto_ms is not None:
+                        presupuesto_ms = max(0.0, presupuesto_ms - self.estadisticas.ms_final)
+                    mejor_accion = self._buscar(ia_jugador, oponente, presupuesto_ms, self.max_nodos)
+                    self._guardar_en_cache(ia_jugador, oponente, mejor_accion)
+        finally:
+            self._senal_detener = None
+        
+        estadisticas = self.estadisticas
+        estadisticas.nodos = self.nodos_visitados
+        estadisticas.profundidad = self.profundidad_alcanzada
+        estadisticas.duracion_ms = (time.perf_counter() - inicio) * 1000
+        estadisticas.variacion_principal = [self._clave_accion(a) for a in self.variacion_principal]
+        estadisticas.finales_intentados = self.finales_intentados
+        estadisticas.finales_resueltos = self.finales_resueltos
+        self._profundidad_real = self.profundidad_alcanzada
+        
+        if not mejor_accion:
+            return ("turno", ()) if self.turno_completo else ("pasar", None)
+        return mejor_accion
+    
+    def _buscar(self, ia_jugador, oponente, presupuesto_ms, max_nodos):
+        """
+        Busca desde un estado a profundidad fija o, si hay presupuesto, con
+        profundización iterativa. Deja en `valores_raiz` el valor de cada
+        acción de la raíz en la última iteración completa, y en
+        `valores_por_profundidad` los de cada iteración completa.
+        """
+        self.valores_raiz = {}
+        self.valores_por_profundidad = {}
+        self._arbol_completo = False
+        self._iniciar_totales(ia_jugador, oponente)
+        
+        # Las jugadas asesinas son de esta posición; la historia se conserva
+        # de búsquedas anteriores pero pierde peso
+        self._asesinas = {}
+        self._historia = {clave: puntos // 2 for clave, puntos in self._historia.items() if puntos > 1}
+        
+        # Armar la lista de la raíz ya gasta del presupuesto de tiempo (y
+        # con el campo lleno puede tardar); también se puede detener
+        inicio = time.perf_counter()
+        if presupuesto_ms is not None:
+            self._limite_tiempo = inicio + presupuesto_ms / 1000
+        try:
+            acciones_priorizadas = self._acciones_raiz(ia_jugador, oponente)
+        finally:
+            self._limite_tiempo = None
+        if presupuesto_ms is not None:
+            presupuesto_ms = max(0.0, presupuesto_ms - (time.perf_counter() - inicio) * 1000)
+        
+        if presupuesto_ms is None and max_nodos is None:
+            self._linea_previa = []
+            try:
+                mejor_accion, _ = self._buscar_raiz(ia_jugador, oponente, acciones_priorizadas, self.profundidad)
+            except BusquedaInterrumpida:
+                # Detenida desde fuera: se usa la jugada mejor priorizada
+                self.profundidad_alcanzada = 0
+                return acciones_priorizadas[0] if acciones_priorizadas else None
+            self.profundidad_alcanzada = self.profundidad
+            self.valores_por_profundidad[self.profundidad] = self.valores_raiz
+            return mejor_accion
+        
+        return self._profundizacion_iterativa(
+            ia_jugador, oponente, acciones_priorizadas, presupuesto_ms, max_nodos
+        )
+    
+    # ========== FINALES ==========
+    
+    def _resolver_final(self, ia_jugador, oponente):
+        """
+        Si quedan `cartas_final` cartas o menos entre decks, manos y campos
+        resuelve la posición con SolucionadorFinales sobre una copia del
+        estado. Retorna la jugada ganadora, o None si no hay victoria
+        forzada o se agotó el presupuesto y hay que buscar con la
+        heurística (que, ante una derrota segura, al menos la retrasa).
+        """
+        from modelo.solucionador_finales import (
+            GANA, NOMBRES_RESULTADO, SolucionadorFinales, SolucionInterrumpida
+        )
+        
+        if not self._es_final(ia_jugador, oponente):
+            return None
+        
+        inicio = time.perf_counter()
+        limite_tiempo = None
+        if self.presupuesto_ms is not None:
+            limite_tiempo = inicio + self.presupuesto_ms * FRACCION_FINAL / 1000
+        solucionador = SolucionadorFinales(
+            self, self.turnos_final, self.nodos_final, limite_tiempo, self._senal_detener
+        )
+        
+        jugada = None
+        try:
+            valor, jugada, turnos = solucionador.resolver(ia_jugador.clonar(), oponente.clonar())
+            self.estadisticas.resultado_final = NOMBRES_RESULTADO[valor]
+            self.estadisticas.turnos_final = turnos
+            self.finales_resueltos += 1
+        except SolucionInterrumpida:
+            valor = None
+            self.estadisticas.resultado_final = "incompleto"
+        finally:
+            self._totales = {}
+            self.finales_intentados += 1
+            self.estadisticas.nodos_final = solucionador.nodos
+            self.estadisticas.ms_final = (time.perf_counter() - inicio) * 1000
+        
+        if valor != GANA:
+            return None
+        self.profundidad_alcanzada = turnos
+        self.variacion_principal = [jugada]
+        return jugada
+    
+    def _es_final(self, ia_jugador, oponente):
+        """Quedan `cartas_final` cartas o menos: se intenta el solucionador"""
+        from modelo.solucionador_finales import cartas_restantes
+        
+        return self.cartas_final is not None and cartas_restantes(ia_jugador, oponente) <= self.cartas_final
+    
+    # ========== CACHÉ PERSISTENTE DE POSICIONES ==========
+    
+    def _configuracion_cache(self):
+        """Parámetros que cambian la jugada elegida: entran en la clave de la caché"""
+        fusiones = tuple(sorted(c.id for c in getattr(self, "cartas_disponibles", None) or []))
+        # Las reglas de fusión son datos: si cambian, cambian los resultados
+        reglas = self.fusionador.reglas.huella() if self.fusionador else None
+        configuracion = (self.turno_completo, self.perfil.nombre, self.quiescencia, self.bonos_raiz,
+                         self.acciones_canonicas, fusiones, reglas)
+        if self.planificador_fusiones:
+            configuracion += (("cadenas", self.planificador_fusiones.largo_maximo),)
+        return configuracion
+    
+    def _profundidad_minima(self):
+        """Profundidad a la que llega una búsqueda normal de esta IA"""
+        if self.presupuesto_ms is None and self.max_nodos is None:
+            return self.profundidad
+        return max(1, self._profundidad_real)
+    
+    def _jugada_en_cache(self, ia_jugador, oponente):
+        """
+        Jugada guardada en `cache_posiciones` para este estado, si se buscó
+        al menos tan hondo como llega una búsqueda normal. Los finales no
+        se consultan: ahí decide el solucionador.
+        """
+        if self.cache_posiciones is None or self._es_final(ia_jugador, oponente):
+            return None
+        
+        clave = clave_canonica(ia_jugador, oponente, self._configuracion_cache())
+        entrada = self.cache_posiciones.buscar(clave, self._profundidad_minima())
+        if entrada is None:
+            return None
+        
+        profundidad, _, clave_jugada = entrada
+        for accion in self._acciones_raiz(ia_jugador, oponente):
+            if self._clave_accion(accion) == clave_jugada:
+                self.profundidad_alcanzada = profundidad
+                self.estadisticas.en_cache = True
+                self.variacion_principal = [accion]
+                return accion
+        return None
+    
+    def _guardar_en_cache(self, ia_jugador, oponente, mejor_accion):
+        """Guarda el resultado de una búsqueda que terminó al menos una iteración"""
+        if self.cache_posiciones is None or not mejor_accion or self.profundidad_alcanzada <= 0:
+            return
+        if self._es_final(ia_jugador, oponente):
+            return
+        
+        clave_jugada = self._clave_accion(mejor_accion)
+        self.cache_posiciones.guardar(
+            clave_canonica(ia_jugador, oponente, self._configuracion_cache()),
+            self.profundidad_alcanzada, self.valores_raiz.get(clave_jugada), clave_jugada
+        )
+    
+    # ========== PONDERACIÓN ==========
+    
+    def ponderar(self, ia_jugador, oponente, senal_detener):
+        """
+        Busca, hasta que se active `senal_detener` (threading.Event), las
+        posiciones a las que llegaría la IA tras las respuestas más
+        probables del oponente, que es quien juega ahora. Se llama desde un
+        hilo aparte (ver modelo/ponderador.py) con copias del estado.
+        
+        Cada ronda busca todas las predicciones con el doble de tiempo que
+        la anterior; la tabla de transposición se comparte con la búsqueda
+        real. En modo determinizado no se pondera: predecir las respuestas
+        exige mirar la mano del oponente.
+        """
+        self._ponderadas = {}
+        if self.determinizaciones > 0:
+            return
+        
+        self._senal_detener = senal_detener
+        try:
+            predicciones = self._predecir_respuestas(ia_jugador, oponente)
+            presupuesto_ms = 100
+            completas = set()
+            
+            while not senal_detener.is_set() and len(completas) < len(predicciones):
+                for indice, respuesta in enumerate(predicciones):
+                    if indice in completas:
+                        continue
+                    
+                    # El oponente juega y la IA roba al empezar su turno
+                    registro = []
+                    self._aplicar_accion(oponente, ia_jugador, respuesta, registro)
+                    if ia_jugador.esta_derrotado() or oponente.esta_derrotado():
+                        completas.add(indice)
+                    else:
+                        self._robar(ia_jugador, registro)
+                        if self._ponderar_posicion(ia_jugador, oponente, presupuesto_ms):
+                            completas.add(indice)
+                    self._deshacer_accion(registro)
+                    
+                    if senal_detener.is_set():
+                        break
+                presupuesto_ms *= 2
+        except BusquedaInterrumpida:
+            # Detenida mientras se predecían las respuestas
+            pass
+        finally:
+            self._senal_detener = None
+    
+    def _predecir_respuestas(self, ia_jugador, oponente):
+        """Jugadas del oponente ordenadas por la evaluación que le dejan"""
+        puntuadas = []
+        for jugada in self._generar_jugadas(oponente, ia_jugador):
+            registro = []
+            self._aplicar_accion(oponente, ia_jugador, jugada, registro)
+            puntuadas.append((self.evaluar_estado(oponente, ia_jugador), len(puntuadas), jugada))
+            self._deshacer_accion(registro)
+        
+        puntuadas.sort(key=lambda x: (-x[0], x[1]))
+        return [jugada for _, _, jugada in puntuadas[:self.respuestas_ponderadas]]
+    
+    def _ponderar_posicion(self, ia_jugador, oponente, presupuesto_ms):
+        """
+        Busca una posición predicha y guarda su jugada si llegó más hondo
+        que antes. Retorna True si el árbol quedó completo.
+        """
+        self.nodos_visitados = 0
+        self.estadisticas = EstadisticasBusqueda()
+        if self.tabla is not None:
+            self.tabla.nueva_busqueda()
+        
+        clave = self.zobrist.hash_estado(ia_jugador, oponente, True)
+        mejor_accion = self._buscar(ia_jugador, oponente, presupuesto_ms, None)
+        
+        anterior = self._ponderadas.get(clave)
+        if mejor_accion and self.profundidad_alcanzada > 0 and (
+                anterior is None or self.profundidad_alcanzada > anterior[1]):
+            self._ponderadas[clave] = (mejor_accion, self.profundidad_alcanzada)
+        
+        return self._arbol_completo
+    
+    def _jugada_ponderada(self, ia_jugador, oponente):
+        """
+        Jugada guardada por la ponderación para este estado, si se buscó al
+        menos tan hondo como llega una búsqueda normal.
+        """
+        if not self._ponderadas:
+            return None
+        
+        entrada = self._ponderadas.get(self.zobrist.hash_estado(ia_jugador, oponente, True))
+        self._ponderadas = {}
+        if entrada is None:
+            return None
+        
+        accion, profundidad = entrada
+        if profundidad < self._profundidad_minima():
+            return None
+        
+        self.profundidad_alcanzada = profundidad
+        self.estadisticas.profundidad = profundidad
+        self.estadisticas.ponderada = True
+        self.variacion_principal = [accion]
+        self.estadisticas.variacion_principal = [self._clave_accion(accion)]
+        return accion
+    
+    # ========== BÚSQUEDA DETERMINIZADA ==========
+    
+    def _buscar_determinizado(self, ia_jugador, oponente):
+        """
+        Busca cada determinización con una parte del presupuesto y elige la
+        acción de la raíz con mejor valor promedio entre las muestras.
+        
+        Sólo se promedian valores de la misma profundidad: entre una par y
+        una impar cambia quién hace la última jugada y los valores se
+        sesgan en sentidos opuestos. Se usa la más honda que terminaron
+        todas las muestras (un árbol completo vale para cualquiera mayor).
+        """
+        muestras = [self._determinizar(ia_jugador, oponente) for _ in range(self.determinizaciones)]
+        
+        # El presupuesto total se reparte entre las muestras; en paralelo
+        # cada proceso atiende varias a la vez
+        simultaneas = min(self.trabajadores, len(muestras))
+        presupuesto_ms = None
+        max_nodos = None
+        if self.presupuesto_ms is not None:
+            presupuesto_ms = self.presupuesto_ms * simultaneas / len(muestras)
+        if self.max_nodos is not None:
+            max_nodos = max(1, self.max_nodos // len(muestras))
+        
+        if self.trabajadores > 1:
+            if self._paralelo is None:
+                from modelo.busqueda_paralela import BusquedaParalela
+                self._paralelo = BusquedaParalela(self, self.trabajadores)
+            resultados = self._paralelo.buscar_determinizaciones(muestras, presupuesto_ms, max_nodos)
+        else:
+            resultados = []
+            for ia_muestra, oponente_muestra in muestras:
+                self._buscar(ia_muestra, oponente_muestra, presupuesto_ms, max_nodos)
+                resultados.append((self.valores_por_profundidad, self.profundidad_alcanzada,
+                                   self._arbol_completo))
+        
+        # Profundidad que alcanzaron todas las muestras
+        incompletas = [p for _, p, completo in resultados if not completo]
+        profundidad = min(incompletas) if incompletas else max(p for _, p, _ in resultados)
+        self.profundidad_alcanzada = profundidad
+        
+        # Las acciones de la IA sólo dependen de información visible, así
+        # que son las mismas en todas las muestras
+        acciones = self._acciones_raiz(ia_jugador.clonar(), oponente.clonar())
+        totales = {}
+        for por_profundidad, alcanzada, _ in resultados:
+            valores = por_profundidad.get(min(profundidad, alcanzada), {})
+            for clave, valor in valores.items():
+                suma, cantidad = totales.get(clave, (0, 0))
+                totales[clave] = (suma + valor, cantidad + 1)
+        
+        # Ante empate gana la primera en el orden de prioridad
+        mejor_accion = acciones[0] if acciones else None
         mejor_valor = -math.inf
+        self.valores_raiz = {}
+        for accion in acciones:
+            clave = self._clave_accion(accion)
+            if clave not in totales:
+                continue
+            suma, cantidad = totales[clave]
+            promedio = suma / cantidad
+            self.valores_raiz[clave] = promedio
+            if promedio > mejor_valor:
+                mejor_valor = promedio
+                mejor_accion = accion
+        
+        self.variacion_principal = [mejor_accion] if mejor_accion else []
+        return mejor_accion
+    
+    def _determinizar(self, ia_jugador, oponente):
+        """
+        Copia del estado con la información oculta muestreada: la mano y
+        el deck del oponente salen de las cartas no vistas y el orden del
+        deck propio se baraja.
+        """
+        ia_muestra = ia_jugador.clonar()
+        oponente_muestra = oponente.clonar()
+        self.aleatorio.shuffle(ia_muestra.deck)
+        
+        tamanio_mano = len(oponente_muestra.mano)
+        ocultas = tamanio_mano + len(oponente_muestra.deck)
+        candidatas = self._cartas_no_vistas(ia_jugador, oponente)
+        
+        if len(candidatas) >= ocultas:
+            cartas = [c.instanciar() for c in self.aleatorio.sample(candidatas, ocultas)]
+        else:
+            # Sin catálogo suficiente sólo se oculta el orden de las cartas
+            cartas = oponente_muestra.mano + oponente_muestra.deck
+            self.aleatorio.shuffle(cartas)
+        
+        oponente_muestra.mano = Mano(cartas[:tamanio_mano])
+        oponente_muestra.deck = cartas[tamanio_mano:]
+        return ia_muestra, oponente_muestra
+    
+    def _cartas_no_vistas(self, ia_jugador, oponente):
+        """Cartas del catálogo que la IA no ha visto en ninguna zona"""
+        if not self.cartas_catalogo:
+            return []
+        
+        vistas = Counter(
+            c.id for c in (
+                ia_jugador.deck + ia_jugador.mano + ia_jugador.campo + ia_jugador.cementerio +
+                oponente.campo + oponente.cementerio
+            )
+        )
+        
+        candidatas = []
+        for carta in self.cartas_catalogo:
+            if vistas[carta.id] > 0:
+                vistas[carta.id] -= 1
+            else:
+                candidatas.append(carta)
+        return candidatas
+    
+    def _acciones_raiz(self, ia_jugador, oponente):
+        """
+        Acciones de la raíz ordenadas por prioridad estratégica. Si se agota
+        el presupuesto mientras se arman los turnos completos se usan los
+        encontrados hasta ahí
+        """
+        if self.turno_completo:
+            return self._generar_turnos(ia_jugador, oponente, parcial=True)
         
         acciones = self._generar_acciones(ia_jugador, oponente)
         
@@ -258,6 +1568,8 @@ class IAMinimax:
         acciones_invocar = [a for a in acciones if a[0] == "jugar"]
         acciones_atacar = [a for a in acciones if a[0] == "atacar"]
         acciones_cambio = [a for a in acciones if a[0] == "cambiar_posicion"]
+        acciones_cadena = [a for a in acciones if a[0] == "cadena"]
+        acciones_fusionar = [a for a in acciones if a[0] == "fusionar"]
         acciones_pasar = [a for a in acciones if a[0] == "pasar"]
         
         # Ordenar por prioridad estratégica
@@ -265,42 +1577,176 @@ class IAMinimax:
         # 2. Invocar (aumenta presencia en campo)
         # 3. Atacar (elimina amenazas)
         # 4. Cambiar posición (ajuste táctico)
-        # 5. Pasar (última opción)
-        acciones_priorizadas = (acciones_ataque_directo + 
-                               acciones_invocar + 
-                               acciones_atacar + 
-                               acciones_cambio + 
-                               acciones_pasar)
-        
-        for accion in acciones_priorizadas:
-            # Clonar estado
-            clon_ia = ia_jugador.clonar()
-            clon_oponente = oponente.clonar()
+        # 5. Cadenas de fusiones y fusiones (mejoran la mano para después)
+        # 6. Pasar (última opción)
+        return (acciones_ataque_directo + 
+                acciones_invocar + 
+                acciones_atacar + 
+                acciones_cambio + 
+                acciones_cadena + 
+                acciones_fusionar + 
+                acciones_pasar)
+    
+    def _bono_raiz(self, accion):
+        """Bonus por tipo de acción en la raíz (para desempatar)"""
+        if not self.bonos_raiz:
+            return 0
+        tipo_accion = accion[0]
+        if tipo_accion == "turno":
+            return sum(self._bono_raiz(a) for a in accion[1])
+        if tipo_accion == "ataque_directo":
+            return 500  # Gran bonus por ataque directo
+        elif tipo_accion == "atacar":
+            return 100  # Bonus moderado por atacar
+        elif tipo_accion == "jugar":
+            return 50   # Bonus pequeño por invocar
+        return 0
+    
+    def _profundizacion_iterativa(self, ia_jugador, oponente, acciones, presupuesto_ms, max_nodos):
+        """Busca a profundidad 1, 2, 3... mientras quede presupuesto"""
+        self._limite_tiempo = None
+        self._limite_nodos = None
+        if max_nodos is not None:
+            self._limite_nodos = self.nodos_visitados + max_nodos
+        if presupuesto_ms is not None:
+            self._limite_tiempo = time.perf_counter() + presupuesto_ms / 1000
+        
+        # Si ni la primera iteración termina se usa la jugada mejor priorizada
+        mejor_accion = acciones[0] if acciones else None
+        valores = []
+        self.profundidad_alcanzada = 0
+        self._linea_previa = []
+        self._arbol_completo = False
+        
+        try:
+            for profundidad in range(1, self.profundidad_maxima + 1):
+                # La mejor jugada de la iteración anterior se explora primero
+                if mejor_accion in acciones:
+                    acciones = [mejor_accion] + [a for a in acciones if a is not mejor_accion]
+                
+                self._alcanzo_horizonte = False
+                nodos_inicio = self.nodos_visitados
+                accion, valor = self._buscar_con_aspiracion(
+                    ia_jugador, oponente, acciones, profundidad,
+                    valores[-2] if len(valores) >= 2 else (valores[0] if valores else None)
+                )
+                valores.append(valor)
+                
+                mejor_accion = accion
+                self.profundidad_alcanzada = profundidad
+                self.valores_por_profundidad[profundidad] = self.valores_raiz
+                self.estadisticas.nodos_ultima_iteracion = self.nodos_visitados - nodos_inicio
+                self._linea_previa = self.variacion_principal
+                
+                # Si ninguna rama llegó al horizonte el árbol ya está completo
+                if not self._alcanzo_horizonte:
+                    break
+            self._arbol_completo = True
+        except BusquedaInterrumpida:
+            pass
+        finally:
+            self._limite_tiempo = None
+            self._limite_nodos = None
+        
+        return mejor_accion
+    
+    def _buscar_con_aspiracion(self, ia_jugador, oponente, acciones, profundidad, valor_previo):
+        """
+        Busca la raíz con una ventana de aspiración centrada en `valor_previo`
+        y, si el resultado cae fuera, vuelve a buscar con ese lado abierto.
+        
+        El valor oscila mucho entre una profundidad par y una impar (cambia
+        quién hace la última jugada), así que la profundización iterativa
+        centra la ventana en la iteración de dos niveles antes, que termina
+        con el mismo jugador, y sólo a profundidad 2 en la anterior.
+        """
+        if (valor_previo is None or self.ventana_aspiracion is None or
+                self.trabajadores > 1 or self.determinizaciones > 0):
+            return self._buscar_raiz(ia_jugador, oponente, acciones, profundidad)
+        
+        alfa = valor_previo - self.ventana_aspiracion
+        beta = valor_previo + self.ventana_aspiracion
+        while True:
+            accion, valor = self._buscar_raiz(ia_jugador, oponente, acciones, profundidad, alfa, beta)
+            if valor <= alfa and alfa > -math.inf:
+                alfa = -math.inf
+            elif valor >= beta and beta < math.inf:
+                beta = math.inf
+            else:
+                return accion, valor
+            self.estadisticas.fallos_aspiracion += 1
+    
+    def _buscar_raiz(self, ia_jugador, oponente, acciones, profundidad, alfa=-math.inf, beta=math.inf):
+        """
+        Evalúa cada acción de la raíz a la profundidad dada; `alfa` y `beta`
+        acotan el valor con bono.
+        
+        Con `pvs` sólo la primera acción se busca con la ventana completa y
+        las demás con una ventana nula para ver si superan a la mejor, así
+        que en `valores_raiz` sólo el valor de la mejor es exacto (los demás
+        son cotas superiores). La búsqueda determinizada promedia los
+        valores de todas, por eso allí se buscan todas con la ventana completa.
+        """
+        if self.trabajadores > 1:
+            if self._paralelo is None:
+                from modelo.busqueda_paralela import BusquedaParalela
+                self._paralelo = BusquedaParalela(self, self.trabajadores)
+            return self._paralelo.buscar_raiz(ia_jugador, oponente, acciones, profundidad)
+        
+        mejor_accion = None
+        mejor_valor = -math.inf
+        self._profundidad_busqueda = profundidad
+        self._lineas = {}
+        valores = {}
+        ventanas_nulas = self.pvs and self.determinizaciones == 0
+        
+        for accion in acciones:
+            inicio = time.perf_counter()
             
-            # Aplicar acción
-            self._aplicar_accion(clon_ia, clon_oponente, accion)
+            # Bonus por tipo de acción (para desempatar)
+            bono = self._bono_raiz(accion)
             
-            # Evaluar con Minimax (el oponente juega después)
-            valor = self.minimax(
-                clon_ia,
-                clon_oponente,
-                self.profundidad - 1,
-                -math.inf,
-                math.inf,
-                False  # El siguiente turno es del oponente (minimizador)
-            )
+            # Aplicar acción y evaluar con negamax (el oponente juega después)
+            if mejor_accion is None or not ventanas_nulas:
+                valor = self._evaluar_hijo(
+                    ia_jugador, oponente, accion, True,
+                    profundidad - 1, alfa - bono, beta - bono
+                ) + bono
+            else:
+                # Ante empate gana la primera: basta saber si la supera
+                cota = max(alfa, mejor_valor) - bono
+                valor = self._evaluar_hijo(
+                    ia_jugador, oponente, accion, True,
+                    profundidad - 1, cota, cota + VENTANA_NULA
+                ) + bono
+                if cota + bono < valor < beta:
+                    self.estadisticas.re_busquedas += 1
+                    valor = self._evaluar_hijo(
+                        ia_jugador, oponente, accion, True,
+                        profundidad - 1, cota, beta - bono
+                    ) + bono
             
-            # Bonus por tipo de acción (para desempatar)
-            tipo_accion = accion[0]
-            if tipo_accion == "ataque_directo":
-                valor += 500  # Gran bonus por ataque directo
-            elif tipo_accion == "atacar":
-                valor += 100  # Bonus moderado por atacar
-            elif tipo_accion == "jugar":
-                valor += 50   # Bonus pequeño por invocar
+            clave = self._clave_accion(accion)
+            valores[clave] = valor
+            self.estadisticas.registrar_tiempo_accion(clave, (time.perf_counter() - inicio) * 1000)
             
             if valor > mejor_valor:
                 mejor_valor = valor
                 mejor_accion = accion
+                self.variacion_principal = [accion] + self._lineas.get(1, [])
+            
+            # Fuera de la ventana de aspiración: se repetirá la búsqueda
+            if mejor_valor >= beta:
+                break
         
-        return mejor_accion if mejor_accion else ("pasar", None)
\ No newline at end of file
+        # Sólo se publican los valores de una iteración completa
+        self.valores_raiz = valores
+        return mejor_accion, mejor_valor
+    
+    def cerrar(self):
+        """Libera el pool de procesos del modo paralelo y la caché, si existen"""
+        if self._paralelo is not None:
+            self._paralelo.cerrar()
+            self._paralelo = None
+        if self.cache_posiciones is not None:
+            self.cache_posiciones.cerrar()
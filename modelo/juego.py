@@ -1,18 +1,47 @@
 import random
 from modelo.jugador import Jugador
 from modelo.ia_minimax import IAMinimax
+from modelo.ia_mcts import IAMCTS
+from modelo.cache_posiciones import CachePosiciones
 from modelo.fusionador import Fusionador
+from modelo.perfil_busqueda import perfil_para_presupuesto
+from modelo.planificador_fusiones import PlanificadorFusiones
+from modelo.ponderador import Ponderador
+from modelo.tabla_transposicion import TablaTransposicion
 
 class Juego:
     """Controla la lógica principal del juego de Yu-Gi-Oh!"""
     
-    def __init__(self, cartas_totales, tamanio_deck=20):
+    def __init__(self, cartas_totales, tamanio_deck=20, presupuesto_ia_ms=500, trabajadores_ia=1,
+                 motor_ia="minimax", determinizaciones_ia=0, archivo_estadisticas_ia=None,
+                 ponderar_ia=False, perfil_ia=None, archivo_cache_ia=None, tabla_fusiones=True,
+                 cadenas_fusion_ia=False):
         """
         Inicializa el juego.
         
         Args:
             cartas_totales: Lista de todas las cartas disponibles
             tamanio_deck: Número de cartas por deck (máximo 40)
+            presupuesto_ia_ms: Tiempo de pensamiento de la IA por jugada (ms)
+            trabajadores_ia: Procesos entre los que la IA reparte la búsqueda
+            motor_ia: "minimax" (alfa-beta) o "mcts" (Monte Carlo Tree Search)
+            determinizaciones_ia: Si es mayor que 0, Minimax no mira la mano
+                ni el deck del jugador y busca sobre ese número de muestras
+            archivo_estadisticas_ia: Si se indica, las estadísticas de cada
+                búsqueda de la IA se agregan a ese archivo como líneas JSON
+            ponderar_ia: La IA sigue pensando en segundo plano durante el
+                turno del jugador
+            perfil_ia: Perfil de búsqueda selectiva de Minimax ("facil",
+                "normal", "dificil" o un PerfilBusqueda); si no se indica
+                se elige según `presupuesto_ia_ms`
+            archivo_cache_ia: Si se indica, Minimax guarda las posiciones
+                que busca en ese archivo SQLite y las reutiliza entre
+                partidas (ver modelo/cache_posiciones.py)
+            tabla_fusiones: Al cargar las cartas de fusión se precalcula
+                (o se lee de datos/) el resultado de cada par de cartas
+                normales (ver Fusionador.cargar_tabla_fusiones)
+            cadenas_fusion_ia: Minimax también considera cadenas de dos o
+                más fusiones en un turno (ver modelo/planificador_fusiones.py)
         """
         # === BANDERAS DE ACCIONES POR TURNO ===
         # Jugador Humano
@@ -41,11 +70,41 @@ class Juego:
         
         # IMPORTANTE: Cargar cartas de fusión separadas
         self.cartas_fusion = []
+        self.tabla_fusiones = tabla_fusiones
+        self.info_tabla_fusiones = None
+        
+        # Cadenas de fusiones sugeridas al jugador (con poco tiempo: se
+        # calculan al abrir la ventana de fusiones)
+        self.planificador_fusiones = PlanificadorFusiones(limite_ms=200)
         
         # Inicializar IA con referencias al fusionador y cartas
-        self.ia = IAMinimax(profundidad=2)
+        # La IA piensa hasta agotar su presupuesto de tiempo
+        if motor_ia == "mcts":
+            self.ia = IAMCTS(presupuesto_ms=presupuesto_ia_ms)
+        elif motor_ia == "minimax":
+            self.ia = IAMinimax(
+                presupuesto_ms=presupuesto_ia_ms,
+                tabla_transposicion=TablaTransposicion(),
+                trabajadores=trabajadores_ia,
+                turno_completo=True,
+                determinizaciones=determinizaciones_ia,
+                perfil=perfil_ia or perfil_para_presupuesto(presupuesto_ia_ms),
+                cache_posiciones=CachePosiciones(archivo_cache_ia) if archivo_cache_ia else None,
+                planificador_fusiones=PlanificadorFusiones() if cadenas_fusion_ia else None
+            )
+        else:
+            raise ValueError(f"Motor de IA desconocido: {motor_ia}")
         self.ia.fusionador = self.fusionador
         self.ia.cartas_disponibles = self.cartas_fusion
+        self.ia.cartas_catalogo = self.cartas_disponibles
+        
+        # Ponderación en segundo plano durante el turno del humano
+        self.ponderador = Ponderador(self.ia) if ponderar_ia else None
+        
+        # Estadísticas de la última búsqueda de la IA (EstadisticasBusqueda)
+        self.estadisticas_ia = None
+        self.archivo_estadisticas_ia = archivo_estadisticas_ia
+        self.turnos_ia = 0
         
         self.ganador = None
         
@@ -55,9 +114,17 @@ class Juego:
     def cargar_cartas_fusion(self, cartas_fusion):
         """Carga las cartas de fusión (violetas) disponibles."""
         self.cartas_fusion = cartas_fusion
-        self.fusionador.cargar_cartas_fusion(cartas_fusion)
+        self.fusionador.cargar_cartas_fusion(cartas_fusion, self.cartas_disponibles)
+        if self.tabla_fusiones:
+            self.info_tabla_fusiones = self.fusionador.cargar_tabla_fusiones(self.cartas_disponibles)
         if self.ia:
+            self.detener_ponderacion()
             self.ia.cartas_disponibles = cartas_fusion
+            # Los valores guardados y los procesos de búsqueda dependen
+            # de las fusiones disponibles
+            if self.ia.tabla is not None:
+                self.ia.tabla.limpiar()
+            self.ia.cerrar()
     
     def resetear_acciones_turno(self, jugador_tipo="humano"):
         """Resetea las banderas de acciones al inicio de cada turno"""
@@ -76,6 +143,8 @@ class Juego:
         """Prepara el juego con decks aleatorios"""
         self.ganador = None
         self.historial = []
+        self.estadisticas_ia = None
+        self.turnos_ia = 0
         
         # Resetear TODAS las banderas de acciones
         self.resetear_acciones_turno("humano")
@@ -86,8 +155,8 @@ class Juego:
         random.shuffle(deck_completo)
         
         # Dividir cartas para cada jugador
-        deck_humano = [c.clonar() for c in deck_completo[:self.tamanio_deck]]
-        deck_ia = [c.clonar() for c in deck_completo[self.tamanio_deck:self.tamanio_deck*2]]
+        deck_humano = [c.instanciar() for c in deck_completo[:self.tamanio_deck]]
+        deck_ia = [c.instanciar() for c in deck_completo[self.tamanio_deck:self.tamanio_deck*2]]
         
         # Crear jugadores
         self.jugador_humano = Jugador("Jugador", deck_humano)
@@ -103,131 +172,204 @@ class Juego:
         self.fase = "main"
         
         self.agregar_historial("El juego ha comenzado. Es tu turno.")
+        self.iniciar_ponderacion()
+    
+    def iniciar_ponderacion(self):
+        """Si está activada, la IA piensa mientras juega el humano"""
+        if self.ponderador is not None and not self.ganador:
+            self.ponderador.iniciar(self.jugador_ia, self.jugador_humano)
+    
+    def detener_ponderacion(self):
+        """Detiene la ponderación en curso (antes de que la IA busque)"""
+        if self.ponderador is not None:
+            self.ponderador.detener()
     
     def cambiar_turno(self):
         """Cambia al siguiente turno manejando el ciclo completo Jugador -> IA -> Jugador"""
         
         if self.turno_actual == self.jugador_humano:
-            self.turno_actual = self.jugador_ia
-            self.resetear_acciones_turno("ia")
-            
-            # 1. IA Roba carta
-            carta = self.jugador_ia.robar_carta()
-            if carta:
-                self.agregar_historial(f"IA robó una carta.")
-            else:
-                self.agregar_historial(f"IA no puede robar (Deck vacío).")
-            
-            # Actualizar interfaz antes de que la IA piense
-            if self.on_actualizar_interfaz:
-                self.on_actualizar_interfaz()
-            
-            # 2. IA Ejecuta su lógica (Minimax)
-            self.ejecutar_turno_ia()
-            
-            # Verificar si alguien ganó durante el turno de la IA
-            if self.ganador:
-                return
-
-            # --- VUELTA AL JUGADOR ---
-            self.turno_actual = self.jugador_humano
-            self.fase = "main"
-            self.resetear_acciones_turno("humano")
-            
-            self.agregar_historial("-" * 20)
-            self.agregar_historial("--- TU TURNO ---")
-            
-            # 3. Humano robar carta
-            carta_humano = self.jugador_humano.robar_carta()
-            if carta_humano:
-                self.agregar_historial(f"Robaste: {carta_humano.nombre}")
-            else:
-                self.agregar_historial("¡Tu deck está vacío! No puedes robar.")
+            ia_jugador, humano = self.preparar_turno_ia()
+            mejor_accion = self.calcular_turno_ia(ia_jugador, humano)
+            self.aplicar_turno_ia(mejor_accion)
+    
+    # El turno de la IA se divide en tres pasos para que la interfaz pueda
+    # ejecutar el cálculo en un hilo: preparar y aplicar modifican el juego
+    # y se llaman desde el hilo principal; calcular sólo lee una copia.
     
-    def ejecutar_turno_ia(self):
-        """Ejecuta el turno completo de la IA usando MINIMAX para decisiones estratégicas"""
+    def preparar_turno_ia(self):
+        """
+        Pasa el turno a la IA y la hace robar. Retorna una copia
+        (ia_jugador, humano) del estado sobre la que calcular la jugada.
+        """
+        self.detener_ponderacion()
+        self.turno_actual = self.jugador_ia
+        self.resetear_acciones_turno("ia")
+        
+        # 1. IA Roba carta
+        carta = self.jugador_ia.robar_carta()
+        if carta:
+            self.agregar_historial(f"IA robó una carta.")
+        else:
+            self.agregar_historial(f"IA no puede robar (Deck vacío).")
+        
         self.agregar_historial("--- Turno de la IA ---")
         
-        # Usar Minimax para obtener la mejor acción
-        mejor_accion = self.ia.elegir_mejor_jugada(self.jugador_ia, self.jugador_humano)
+        # Actualizar interfaz antes de que la IA piense
+        if self.on_actualizar_interfaz:
+            self.on_actualizar_interfaz()
+        
+        return self.jugador_ia.clonar(), self.jugador_humano.clonar()
+    
+    def calcular_turno_ia(self, ia_jugador, humano, senal_detener=None):
+        """
+        Busca la jugada de la IA (Minimax o MCTS) sobre la copia de
+        `preparar_turno_ia`. No modifica el juego, así que puede llamarse
+        desde otro hilo. Si se activa `senal_detener` la IA deja de pensar
+        y retorna la mejor jugada que tenga hasta ese momento.
+        """
+        return self.ia.elegir_mejor_jugada(ia_jugador, humano, senal_detener)
+    
+    def aplicar_turno_ia(self, mejor_accion):
+        """Ejecuta la jugada calculada y, si nadie ganó, devuelve el turno al humano"""
+        # 2. IA Ejecuta su lógica (Minimax)
+        self.ejecutar_turno_ia(mejor_accion)
+        
+        # Verificar si alguien ganó durante el turno de la IA
+        if self.ganador:
+            return
+        
+        # --- VUELTA AL JUGADOR ---
+        self.turno_actual = self.jugador_humano
+        self.fase = "main"
+        self.resetear_acciones_turno("humano")
+        
+        self.agregar_historial("-" * 20)
+        self.agregar_historial("--- TU TURNO ---")
+        
+        # 3. Humano robar carta
+        carta_humano = self.jugador_humano.robar_carta()
+        if carta_humano:
+            self.agregar_historial(f"Robaste: {carta_humano.nombre}")
+        else:
+            self.agregar_historial("¡Tu deck está vacío! No puedes robar.")
+        
+        self.iniciar_ponderacion()
+    
+    def ejecutar_turno_ia(self, mejor_accion):
+        """Ejecuta sobre el juego real la jugada (o el turno completo) elegida por la IA"""
+        self.registrar_estadisticas_ia()
         
         if mejor_accion:
-            tipo, datos = mejor_accion
+            if mejor_accion[0] == "turno":
+                for accion in mejor_accion[1]:
+                    self._ejecutar_accion_ia(accion)
+                    if self.ganador:
+                        break
+            else:
+                self._ejecutar_accion_ia(mejor_accion)
+        
+        self.agregar_historial("--- Fin del turno de la IA ---")
+        self.verificar_ganador()
+    
+    def registrar_estadisticas_ia(self):
+        """Guarda las estadísticas de la búsqueda que acaba de hacer la IA"""
+        self.turnos_ia += 1
+        self.estadisticas_ia = getattr(self.ia, "estadisticas", None)
+        
+        resultado_final = getattr(self.estadisticas_ia, "resultado_final", None)
+        if resultado_final is not None:
+            self.agregar_historial(
+                f"IA analizó el final ({resultado_final}) en {self.estadisticas_ia.ms_final:.0f} ms."
+            )
+        
+        if self.estadisticas_ia is not None and self.archivo_estadisticas_ia:
+            self.estadisticas_ia.guardar_jsonl(self.archivo_estadisticas_ia, turno_ia=self.turnos_ia)
+    
+    def _ejecutar_accion_ia(self, accion):
+        """Ejecuta sobre el juego real una acción elegida por la IA"""
+        tipo, datos = accion
 
-            # FASE 0: FUSIONAR (nueva funcionalidad)
-            if tipo == "fusionar" and not self.ia_fusiono:
-                carta1, carta2, resultado = datos
-                c1 = next((c for c in self.jugador_ia.mano if c.nombre == carta1.nombre), None)
-                c2 = next((c for c in self.jugador_ia.mano if c.nombre == carta2.nombre and c != c1), None)
-                
-                if c1 and c2:
-                    self.jugador_ia.mano.remove(c1)
-                    self.jugador_ia.mano.remove(c2)
-                    self.jugador_ia.cementerio.append(c1)
-                    self.jugador_ia.cementerio.append(c2)
-                    self.jugador_ia.mano.append(resultado)
-                    
-                    self.ia_fusiono = True
-                    self.agregar_historial(f"IA fusionó: {c1.nombre} + {c2.nombre} = {resultado.nombre} (ATK: {resultado.atk})")
-                    
-                    if self.on_actualizar_interfaz:
-                        self.on_actualizar_interfaz()
-            
-            # FASE 1: INVOCAR
-            elif tipo == "jugar" and not self.ia_invoco_carta:
-                carta, posicion = datos
-                carta_real = next((c for c in self.jugador_ia.mano if c.nombre == carta.nombre), None)
-                if carta_real:
-                    self.jugador_ia.jugar_carta(carta_real, posicion)
-                    self.ia_invoco_carta = True
-                    self.agregar_historial(f"IA invocó: {carta_real.nombre} en posición {posicion} (ATK: {carta_real.atk}, DEF: {carta_real.defensa})")
-                    
-                    if self.on_actualizar_interfaz:
-                        self.on_actualizar_interfaz()
+        # FASE 0: FUSIONAR (nueva funcionalidad)
+        if tipo == "fusionar" and not self.ia_fusiono:
+            carta1, carta2, resultado = datos
+            c1 = self.jugador_ia.mano.buscar(carta1.uid)
+            c2 = self.jugador_ia.mano.buscar(carta2.uid)
             
-            # FASE 2: ATACAR
-            elif tipo == "atacar" and not self.ia_ataco:
-                atacante, objetivo = datos
-                atacante_real = next((c for c in self.jugador_ia.campo if c.nombre == atacante.nombre), None)
-                objetivo_real = next((c for c in self.jugador_humano.campo if c.nombre == objetivo.nombre), None)
+            if c1 and c2 and c1 is not c2:
+                self.jugador_ia.mano.remove(c1)
+                self.jugador_ia.mano.remove(c2)
+                self.jugador_ia.cementerio.append(c1)
+                self.jugador_ia.cementerio.append(c2)
+                self.jugador_ia.mano.append(resultado)
                 
-                if atacante_real and objetivo_real:
-                    self.realizar_batalla(atacante_real, objetivo_real, self.jugador_ia, self.jugador_humano)
-                    self.ia_ataco = True
-                    
-                    if self.on_actualizar_interfaz:
-                        self.on_actualizar_interfaz()
-            
-            # FASE 3: ATAQUE DIRECTO
-            elif tipo == "ataque_directo" and not self.ia_ataco:
-                atacante = datos
-                atacante_real = next((c for c in self.jugador_ia.campo if c.nombre == atacante.nombre), None)
+                self.ia_fusiono = True
+                self.agregar_historial(f"IA fusionó: {c1.nombre} + {c2.nombre} = {resultado.nombre} (ATK: {resultado.atk})")
+                
+                if self.on_actualizar_interfaz:
+                    self.on_actualizar_interfaz()
+        
+        # FASE 0b: CADENA DE FUSIONES (cuenta como la fusión del turno)
+        elif tipo == "cadena" and not self.ia_fusiono:
+            pasos = self._fusionar_cadena(self.jugador_ia, datos)
+            if pasos:
+                self.ia_fusiono = True
+                self.agregar_historial(f"IA encadenó fusiones: {self._describir_cadena(pasos)}")
+                
+                if self.on_actualizar_interfaz:
+                    self.on_actualizar_interfaz()
+        
+        # FASE 1: INVOCAR
+        elif tipo == "jugar" and not self.ia_invoco_carta:
+            carta, posicion = datos
+            carta_real = self.jugador_ia.mano.buscar(carta.uid)
+            if carta_real:
+                self.jugador_ia.jugar_carta(carta_real, posicion)
+                self.ia_invoco_carta = True
+                self.agregar_historial(f"IA invocó: {carta_real.nombre} en posición {posicion} (ATK: {carta_real.atk}, DEF: {carta_real.defensa})")
                 
-                if atacante_real and not self.jugador_humano.tiene_cartas_campo():
-                    danio = atacante_real.atk
-                    self.jugador_humano.recibir_danio(danio)
-                    self.ia_ataco = True
-                    self.agregar_historial(f"¡Ataque directo! {atacante_real.nombre} te causa {danio} de daño.")
-                    
-                    self.verificar_ganador()
-                    if self.on_actualizar_interfaz:
-                        self.on_actualizar_interfaz()
+                if self.on_actualizar_interfaz:
+                    self.on_actualizar_interfaz()
+        
+        # FASE 2: ATACAR
+        elif tipo == "atacar" and not self.ia_ataco:
+            atacante, objetivo = datos
+            atacante_real = self.jugador_ia.campo.buscar(atacante.uid)
+            objetivo_real = self.jugador_humano.campo.buscar(objetivo.uid)
             
-            # FASE 4: CAMBIAR POSICIÓN
-            elif tipo == "cambiar_posicion" and not self.ia_cambio_posicion:
-                carta = datos
-                carta_real = next((c for c in self.jugador_ia.campo if c.nombre == carta.nombre), None)
-                if carta_real:
-                    posicion_anterior = carta_real.posicion
-                    carta_real.cambiar_posicion()
-                    self.ia_cambio_posicion = True
-                    self.agregar_historial(f"IA cambió {carta_real.nombre} de {posicion_anterior} a {carta_real.posicion}")
-                    
-                    if self.on_actualizar_interfaz:
-                        self.on_actualizar_interfaz()
+            if atacante_real and objetivo_real:
+                self.realizar_batalla(atacante_real, objetivo_real, self.jugador_ia, self.jugador_humano)
+                self.ia_ataco = True
+                
+                if self.on_actualizar_interfaz:
+                    self.on_actualizar_interfaz()
         
-        self.agregar_historial("--- Fin del turno de la IA ---")
-        self.verificar_ganador()
+        # FASE 3: ATAQUE DIRECTO
+        elif tipo == "ataque_directo" and not self.ia_ataco:
+            atacante = datos
+            atacante_real = self.jugador_ia.campo.buscar(atacante.uid)
+            
+            if atacante_real and not self.jugador_humano.tiene_cartas_campo():
+                danio = atacante_real.atk
+                self.jugador_humano.recibir_danio(danio)
+                self.ia_ataco = True
+                self.agregar_historial(f"¡Ataque directo! {atacante_real.nombre} te causa {danio} de daño.")
+                
+                self.verificar_ganador()
+                if self.on_actualizar_interfaz:
+                    self.on_actualizar_interfaz()
+        
+        # FASE 4: CAMBIAR POSICIÓN
+        elif tipo == "cambiar_posicion" and not self.ia_cambio_posicion:
+            carta = datos
+            carta_real = self.jugador_ia.campo.buscar(carta.uid)
+            if carta_real:
+                posicion_anterior = carta_real.posicion
+                carta_real.cambiar_posicion()
+                self.ia_cambio_posicion = True
+                self.agregar_historial(f"IA cambió {carta_real.nombre} de {posicion_anterior} a {carta_real.posicion}")
+                
+                if self.on_actualizar_interfaz:
+                    self.on_actualizar_interfaz()
     
     def jugar_carta_humano(self, carta, posicion="ataque"):
         """El jugador humano invoca una carta"""
@@ -363,6 +505,72 @@ class Juego:
         
         return False, "Fusión no disponible"
     
+    def sugerir_cadenas_fusion(self, cantidad=5):
+        """
+        Mejores cadenas de dos o más fusiones de la mano del jugador (ver
+        modelo/planificador_fusiones.py), de mayor a menor ATK final
+        """
+        if len(self.jugador_humano.mano) < 3 or not self.cartas_fusion:
+            return []
+        return self.planificador_fusiones.cadenas(
+            self.jugador_humano.mano, self.fusionador, self.cartas_fusion, cantidad, minimo_pasos=2
+        )
+    
+    def fusionar_cadena(self, cadena):
+        """
+        Realiza una cadena de fusiones del jugador (pasos de
+        `sugerir_cadenas_fusion`); cuenta como la fusión del turno
+        """
+        if self.turno_actual != self.jugador_humano:
+            return False, "No es tu turno"
+        
+        if self.humano_fusiono:
+            return False, " Ya fusionaste este turno"
+        
+        pasos = self._fusionar_cadena(self.jugador_humano, cadena)
+        if not pasos:
+            return False, "Cadena de fusiones no disponible"
+        
+        self.humano_fusiono = True
+        self.agregar_historial(f"Cadena de fusiones: {self._describir_cadena(pasos)}")
+        return True, pasos[-1][2]
+    
+    def _fusionar_cadena(self, jugador, cadena):
+        """
+        Aplica los pasos si todos son válidos en la mano real: las cartas
+        están en la mano y cada par da el resultado indicado. Retorna los
+        pasos aplicados (con las cartas reales) o una lista vacía.
+        """
+        usadas = [cadena[0][0]] + [paso[1] for paso in cadena]
+        reales = [jugador.mano.buscar(carta.uid) for carta in usadas]
+        if any(carta is None for carta in reales) or len({c.uid for c in reales}) != len(reales):
+            return []
+        
+        actual = reales[0]
+        for (_, _, resultado), carta in zip(cadena, reales[1:]):
+            esperado = self.fusionador.resultado_fusion(actual, carta, self.cartas_fusion)
+            if esperado is None or esperado.id != resultado.id:
+                return []
+            actual = resultado
+        
+        pasos = []
+        actual = reales[0]
+        for (_, _, resultado), carta in zip(cadena, reales[1:]):
+            jugador.mano.remove(actual)
+            jugador.mano.remove(carta)
+            jugador.cementerio.append(actual)
+            jugador.cementerio.append(carta)
+            jugador.mano.append(resultado)
+            pasos.append((actual, carta, resultado))
+            actual = resultado
+        return pasos
+    
+    @staticmethod
+    def _describir_cadena(pasos):
+        texto = " + ".join([pasos[0][0].nombre] + [paso[1].nombre for paso in pasos])
+        resultado = pasos[-1][2]
+        return f"{texto} = {resultado.nombre} (ATK: {resultado.atk})"
+    
     def cambiar_posicion_carta(self, carta):
         """Cambia la posición de una carta en el campo del jugador humano"""
         if self.turno_actual != self.jugador_humano:
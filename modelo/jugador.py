@@ -1,11 +1,17 @@
+from modelo.zona import Mano, Zona
+
+
 class Jugador:
     """Representa un jugador (humano o IA)"""
     
     def __init__(self, nombre, deck, puntos_vida=8000):
         self.nombre = nombre
         self.deck = deck.copy()  # Baraja completa
-        self.mano = []  # Cartas en mano
-        self.campo = []  # Cartas en el campo (máximo 5)
+        # Mano y campo son Zonas: se buscan cartas por uid en O(1). Al
+        # reemplazarlas hay que asignar una Zona (una Mano para la mano,
+        # que además lleva sus fusiones posibles), no una lista
+        self.mano = Mano()  # Cartas en mano
+        self.campo = Zona()  # Cartas en el campo (máximo 5)
         self.cementerio = []  # Cartas destruidas
         self.puntos_vida = puntos_vida
         self.es_ia = False
@@ -76,10 +82,10 @@ class Jugador:
         clon.deck = [c.clonar() for c in self.deck]
         
         # Clonar mano
-        clon.mano = [c.clonar() for c in self.mano]
+        clon.mano = self.mano.clonar()
         
         # Clonar campo
-        clon.campo = [c.clonar() for c in self.campo]
+        clon.campo = Zona([c.clonar() for c in self.campo])
         
         # Clonar cementerio
         clon.cementerio = [c.clonar() for c in self.cementerio]
@@ -0,0 +1,96 @@
+"""
+Perfiles de búsqueda selectiva de IAMinimax.
+
+Un perfil fija cuántas acciones de cada tipo se generan por nodo (el ancho
+del haz) y cómo se reducen las jugadas tardías (LMR, late move
+reductions): las que quedan al final del orden de un nodo interior se
+buscan con menos profundidad y, si aun así superan alfa, se vuelven a
+buscar con la profundidad completa.
+
+Los perfiles se eligen por dificultad ("facil", "normal", "dificil") o a
+partir del presupuesto de tiempo de la IA con `perfil_para_presupuesto`.
+"""
+
+
+class PerfilBusqueda:
+    """Anchos del haz por tipo de acción y parámetros de LMR"""
+
+    def __init__(self, nombre, anchos=None, max_acciones=None, reducir_desde=None,
+                 reduccion=1, profundidad_reduccion=3):
+        """
+        Args:
+            nombre: Nombre del perfil
+            anchos: Dict tipo de acción -> máximo de acciones de ese tipo
+                por nodo; los tipos que no aparecen no tienen límite
+            max_acciones: Máximo de acciones por nodo (None: sin límite)
+            reducir_desde: Posición en el orden del nodo desde la que se
+                reducen las jugadas (None: sin LMR)
+            reduccion: Plies que se le quitan a una jugada reducida
+            profundidad_reduccion: Profundidad restante mínima para reducir
+        """
+        self.nombre = nombre
+        self.anchos = dict(anchos or {})
+        self.max_acciones = max_acciones
+        self.reducir_desde = reducir_desde
+        self.reduccion = reduccion
+        self.profundidad_reduccion = profundidad_reduccion
+
+    def ancho(self, tipo):
+        """Máximo de acciones del tipo por nodo (None: sin límite)"""
+        return self.anchos.get(tipo)
+
+    def reduccion_lmr(self, indice, profundidad):
+        """
+        Plies a reducir para la jugada en la posición `indice` de un nodo
+        con `profundidad` restante (0 si se busca completa). Siempre queda
+        al menos un ply por buscar.
+        """
+        if self.reducir_desde is None or indice < self.reducir_desde:
+            return 0
+        if profundidad < self.profundidad_reduccion:
+            return 0
+        return max(0, min(self.reduccion, profundidad - 2))
+
+    def __repr__(self):
+        return (f"PerfilBusqueda({self.nombre!r}, anchos={self.anchos}, "
+                f"max_acciones={self.max_acciones}, reducir_desde={self.reducir_desde})")
+
+
+PERFILES = {
+    # Haz estrecho y reducciones tempranas: llega hondo con poco tiempo
+    "facil": PerfilBusqueda("facil", {"fusionar": 1, "cadena": 1, "jugar": 2}, max_acciones=6,
+                            reducir_desde=2),
+    # Los límites de siempre (3 fusiones, 3 invocaciones, 12 acciones)
+    "normal": PerfilBusqueda("normal", {"fusionar": 3, "cadena": 2, "jugar": 3}, max_acciones=12),
+    # Haz ancho; LMR paga las jugadas extra que no prometen
+    "dificil": PerfilBusqueda("dificil", {"fusionar": 6, "cadena": 3, "jugar": 5}, max_acciones=20,
+                              reducir_desde=4),
+}
+
+# Presupuestos (ms por jugada) a partir de los cuales se usa cada perfil
+UMBRALES_PRESUPUESTO = (
+    (2000, "dificil"),
+    (200, "normal"),
+    (0, "facil"),
+)
+
+
+def obtener_perfil(perfil):
+    """Acepta un PerfilBusqueda, el nombre de uno de PERFILES o None ("normal")"""
+    if perfil is None:
+        return PERFILES["normal"]
+    if isinstance(perfil, PerfilBusqueda):
+        return perfil
+    if perfil not in PERFILES:
+        raise ValueError(f"Perfil de búsqueda desconocido: {perfil}")
+    return PERFILES[perfil]
+
+
+def perfil_para_presupuesto(presupuesto_ms):
+    """Perfil según el tiempo por jugada; sin presupuesto, "normal" """
+    if presupuesto_ms is None:
+        return PERFILES["normal"]
+    for minimo, nombre in UMBRALES_PRESUPUESTO:
+        if presupuesto_ms >= minimo:
+            return PERFILES[nombre]
+    return PERFILES["facil"]
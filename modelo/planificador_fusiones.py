@@ -0,0 +1,196 @@
+"""
+Planificador de cadenas de fusiones.
+
+En Forbidden Memories una fusión puede seguir con el resultado: A + B = R,
+luego R + C = R2 y así mientras queden cartas en la mano. El fusionador
+sólo resuelve pares; el planificador busca, para cada par inicial de la
+mano, la cadena que termina en la carta de más ATK.
+
+- La búsqueda va sobre subconjuntos de la mano: el estado es la carta
+  que se lleva (por id) y la tupla ordenada de ids de las cartas que
+  quedan. Las cartas con el mismo id son intercambiables, así que las
+  copias no multiplican los estados, y la memoria sirve entre consultas
+  (las manos de la búsqueda de la IA se repiten mucho).
+- Una cadena sólo se alarga si el resultado mejora el ATK; con
+  `largo_maximo` se limita el número de fusiones y con `limite_ms` el
+  tiempo de cada consulta (los pares iniciales que no alcanzan a
+  resolverse quedan fuera y `completo` queda en False).
+
+Cada cadena es una tupla de pasos (carta1, carta2, resultado): carta1 del
+primer paso y todas las carta2 son cartas de la mano, y carta1 de cada
+paso siguiente es el resultado del anterior.
+"""
+import time
+
+from modelo.zona import Mano
+
+# Estados recordados antes de vaciar la memoria
+MAX_ESTADOS = 200000
+
+# Cada cuántos estados nuevos se mira el reloj
+ESTADOS_POR_CONSULTA_RELOJ = 64
+
+
+class PlanInterrumpido(Exception):
+    """Se lanza dentro de la búsqueda cuando se agota el tiempo de la consulta"""
+
+
+class PlanificadorFusiones:
+    """Mejores cadenas de fusiones de una mano, con memoria por subconjunto"""
+
+    def __init__(self, largo_maximo=3, limite_ms=None):
+        """
+        Args:
+            largo_maximo: Máximo de fusiones de una cadena
+            limite_ms: Tiempo máximo de cada consulta (None: sin límite)
+        """
+        self.largo_maximo = largo_maximo
+        self.limite_ms = limite_ms
+        self.completo = True
+        self.estados = 0
+        # (id de la carta que se lleva, ids que quedan, fusiones que quedan)
+        # -> (ATK final, ids de las cartas que se agregan en orden)
+        self._memoria = {}
+        self._origen = None
+        self._por_id = {}
+        self._fusionador = None
+        self._cartas_disponibles = None
+        self._limite = None
+
+    def __getstate__(self):
+        # La memoria se rehace en cada proceso
+        estado = self.__dict__.copy()
+        estado["_memoria"] = {}
+        estado["_origen"] = None
+        return estado
+
+    def cadenas(self, mano, fusionador, cartas_disponibles, cantidad=None, minimo_pasos=1):
+        """
+        Mejores cadenas de la mano, de mayor a menor ATK final y a igual
+        ATK las más cortas; una por resultado final.
+
+        Args:
+            mano: Cartas de la mano
+            fusionador: Fusionador que resuelve cada par
+            cartas_disponibles: Cartas de fusión (violetas)
+            cantidad: Máximo de cadenas (None: todas)
+            minimo_pasos: Sólo cadenas con al menos esas fusiones
+
+        Returns:
+            Lista de cadenas (tuplas de pasos con resultados ya instanciados)
+        """
+        self._preparar(fusionador, cartas_disponibles)
+        self._por_id = {}
+        for carta in mano:
+            self._por_id.setdefault(carta.id, carta)
+        ids = tuple(sorted(carta.id for carta in mano))
+
+        self.completo = True
+        self._limite = None
+        if self.limite_ms is not None:
+            self._limite = time.perf_counter() + self.limite_ms / 1000
+
+        mejores = {}
+        try:
+            for i, id1 in enumerate(ids):
+                if i and ids[i - 1] == id1:
+                    continue
+                for j in range(i + 1, len(ids)):
+                    id2 = ids[j]
+                    if j > i + 1 and ids[j - 1] == id2:
+                        continue
+                    resultado = self._resolver(self._por_id[id1], self._por_id[id2])
+                    if resultado is None:
+                        continue
+                    restantes = ids[:i] + ids[i + 1:j] + ids[j + 1:]
+                    atk, siguientes = self._mejor(resultado, restantes, self.largo_maximo - 1)
+                    if len(siguientes) + 1 < minimo_pasos:
+                        continue
+                    final = self._final(resultado, siguientes)
+                    candidata = (atk, -len(siguientes), (id1, id2) + siguientes)
+                    if final.id not in mejores or candidata[:2] > mejores[final.id][:2]:
+                        mejores[final.id] = candidata
+        except PlanInterrumpido:
+            self.completo = False
+
+        ordenadas = sorted(mejores.values(), key=lambda c: c[:2], reverse=True)
+        if cantidad is not None:
+            ordenadas = ordenadas[:cantidad]
+        return [self._armar_cadena(mano, ids_cadena) for _, _, ids_cadena in ordenadas]
+
+    def _preparar(self, fusionador, cartas_disponibles):
+        """Vacía la memoria si cambió el fusionador, el pool o sus resultados"""
+        origen = self._origen
+        if (origen is None or origen[0] is not fusionador or origen[1] is not cartas_disponibles
+                or origen[2] != fusionador.version):
+            self._memoria = {}
+            self._origen = (fusionador, cartas_disponibles, fusionador.version)
+        elif len(self._memoria) > MAX_ESTADOS:
+            self._memoria.clear()
+        self._fusionador = fusionador
+        self._cartas_disponibles = cartas_disponibles
+
+    def _resolver(self, carta1, carta2):
+        return self._fusionador.resultado_fusion(carta1, carta2, self._cartas_disponibles)
+
+    def _mejor(self, actual, restantes, fusiones):
+        """
+        (ATK final, ids agregados) de la mejor forma de seguir la cadena
+        desde la carta `actual` con las cartas `restantes`
+        """
+        if fusiones <= 0 or not restantes:
+            return actual.atk, ()
+
+        clave = (actual.id, restantes, fusiones)
+        mejor = self._memoria.get(clave)
+        if mejor is not None:
+            return mejor
+
+        self.estados += 1
+        if (self._limite is not None and self.estados % ESTADOS_POR_CONSULTA_RELOJ == 0
+                and time.perf_counter() > self._limite):
+            raise PlanInterrumpido()
+
+        # Parar aquí; sólo se sigue si el ATK mejora
+        mejor = (actual.atk, ())
+        for i, id_carta in enumerate(restantes):
+            if i and restantes[i - 1] == id_carta:
+                continue
+            resultado = self._resolver(actual, self._por_id[id_carta])
+            if resultado is None:
+                continue
+            atk, siguientes = self._mejor(resultado, restantes[:i] + restantes[i + 1:], fusiones - 1)
+            if atk > mejor[0]:
+                mejor = (atk, (id_carta,) + siguientes)
+
+        self._memoria[clave] = mejor
+        return mejor
+
+    def _final(self, actual, siguientes):
+        """Prototipo de la última carta de la cadena"""
+        for id_carta in siguientes:
+            actual = self._resolver(actual, self._por_id[id_carta])
+        return actual
+
+    def _armar_cadena(self, mano, ids_cadena):
+        """
+        Pasos con las cartas de la mano (una distinta por id repetido); en
+        una Mano cada resultado lleva el uid de su par (ver
+        Mano.instanciar_fusion)
+        """
+        libres = {}
+        for carta in mano:
+            libres.setdefault(carta.id, []).append(carta)
+        cartas = [libres[id_carta].pop(0) for id_carta in ids_cadena]
+
+        pasos = []
+        actual = cartas[0]
+        for carta in cartas[1:]:
+            prototipo = self._resolver(actual, carta)
+            if isinstance(mano, Mano):
+                resultado = mano.instanciar_fusion(actual, carta, prototipo)
+            else:
+                resultado = prototipo.instanciar()
+            pasos.append((actual, carta, resultado))
+            actual = resultado
+        return tuple(pasos)
@@ -0,0 +1,40 @@
+"""
+Ponderación: la IA sigue pensando en un hilo mientras juega el humano.
+
+El motor (IAMinimax o IAMCTS) implementa `ponderar(ia_jugador, oponente,
+senal_detener)`; aquí sólo se gestiona el hilo. La búsqueda trabaja sobre
+copias del estado tomadas al iniciar, así que el humano puede seguir
+modificando el juego real mientras tanto.
+"""
+import threading
+
+
+class Ponderador:
+    """Ejecuta la ponderación de una IA en un hilo en segundo plano"""
+
+    def __init__(self, ia):
+        self.ia = ia
+        self._hilo = None
+        self._senal_detener = threading.Event()
+
+    def iniciar(self, ia_jugador, oponente):
+        """Empieza a ponderar desde el estado actual (turno del oponente)"""
+        self.detener()
+
+        self._senal_detener = threading.Event()
+        self._hilo = threading.Thread(
+            target=self.ia.ponderar,
+            args=(ia_jugador.clonar(), oponente.clonar(), self._senal_detener),
+            daemon=True,
+        )
+        self._hilo.start()
+
+    def detener(self):
+        """Pide al hilo que pare y espera a que termine"""
+        if self._hilo is not None:
+            self._senal_detener.set()
+            self._hilo.join()
+            self._hilo = None
+
+    def activo(self):
+        return self._hilo is not None and self._hilo.is_alive()
@@ -0,0 +1,182 @@
+"""
+Reglas de fusión leídas de un archivo de datos (datos/reglas_fusion.json).
+
+Hay dos clases de reglas:
+
+- Fusiones por nombre: un par de cartas da una carta concreta. El orden
+  del par no importa; si el archivo repite un par vale la primera.
+- Reglas generales, en el orden del archivo: cuando las dos cartas
+  comparten atributo ("por": "atributo"), tipo ("tipo") o siempre
+  ("cualquiera"), el resultado es la carta de fusión del mismo atributo o
+  tipo (o cualquiera) con ATK dentro de la ventana [atk_minimo,
+  atk_maximo] veces el promedio de las dos, sin repetir sus nombres; la
+  de más ATK ("mas_fuerte") o la más cercana al promedio
+  ("mas_cercana"). Con "valor" la regla sólo vale para ese atributo o
+  tipo. Gana la primera regla que encuentra una carta.
+
+Las fusiones por nombre van antes que las generales. Al cargar el pool
+de fusión las reglas se compilan (ReglasCompiladas): los pares por nombre
+pasan a un dict por par de ids con el prototipo del resultado ya buscado
+y las generales a listas por atributo y tipo. El resultado de las
+generales se recuerda por (atributo y tipo compartidos, ATK promedio), así
+que el costo de cada par no crece con el número de reglas.
+"""
+import hashlib
+import json
+import os
+
+# Relativa al proyecto, no al directorio desde el que se ejecuta
+RUTA_REGLAS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "datos", "reglas_fusion.json")
+
+POR = ("atributo", "tipo", "cualquiera")
+ELEGIR = ("mas_fuerte", "mas_cercana")
+
+
+def _par(a, b):
+    return (a, b) if a <= b else (b, a)
+
+
+class ReglaFusion:
+    """Regla general: grupo de cartas de fusión, ventana de ATK y criterio"""
+
+    __slots__ = ("orden", "por", "valor", "atk_minimo", "atk_maximo", "elegir")
+
+    def __init__(self, orden, por, atk_minimo, atk_maximo, elegir, valor=None):
+        if por not in POR:
+            raise ValueError(f"Regla de fusión {orden}: 'por' debe ser uno de {POR}, no {por!r}")
+        if elegir not in ELEGIR:
+            raise ValueError(f"Regla de fusión {orden}: 'elegir' debe ser uno de {ELEGIR}, no {elegir!r}")
+        if por == "cualquiera" and valor is not None:
+            raise ValueError(f"Regla de fusión {orden}: una regla 'cualquiera' no lleva 'valor'")
+        self.orden = orden
+        self.por = por
+        self.valor = valor
+        self.atk_minimo = atk_minimo
+        self.atk_maximo = atk_maximo
+        self.elegir = elegir
+
+    def datos(self):
+        return (self.por, self.valor, self.atk_minimo, self.atk_maximo, self.elegir)
+
+    def __repr__(self):
+        return (f"ReglaFusion({self.por!r}, valor={self.valor!r}, "
+                f"ventana=({self.atk_minimo}, {self.atk_maximo}), elegir={self.elegir!r})")
+
+
+class ReglasFusion:
+    """Reglas tal como están en el archivo (nombres de cartas)"""
+
+    def __init__(self, datos):
+        # (nombre, nombre) ordenado -> nombre del resultado
+        self.nombradas = {}
+        for entrada in datos.get("nombradas", []):
+            carta1, carta2 = entrada["cartas"]
+            self.nombradas.setdefault(_par(carta1, carta2), entrada["resultado"])
+
+        self.reglas = [
+            ReglaFusion(orden, regla["por"], regla["atk_minimo"], regla["atk_maximo"],
+                        regla["elegir"], regla.get("valor"))
+            for orden, regla in enumerate(datos.get("reglas", []))
+        ]
+        self._huella = None
+
+    @classmethod
+    def cargar(cls, ruta=RUTA_REGLAS):
+        """Lee las reglas de un JSON (el archivo es la única fuente de reglas)"""
+        if not os.path.exists(ruta):
+            raise FileNotFoundError(f"No se encontró el archivo de reglas de fusión {ruta}")
+        with open(ruta, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def huella(self):
+        """
+        Hash del contenido (entra en el nombre de la tabla de pares y en
+        la clave de la caché de posiciones)
+        """
+        if self._huella is None:
+            contenido = repr((sorted(self.nombradas.items()), [r.datos() for r in self.reglas]))
+            self._huella = hashlib.blake2b(contenido.encode("utf-8"), digest_size=8).hexdigest()
+        return self._huella
+
+    def compilar(self, cartas_fusion, cartas_normales=()):
+        return ReglasCompiladas(self, cartas_fusion, cartas_normales)
+
+
+class ReglasCompiladas:
+    """
+    Reglas listas para un pool de fusión: pares por nombre por ids con su
+    prototipo y reglas generales agrupadas por atributo y tipo.
+    """
+
+    def __init__(self, reglas, cartas_fusion, cartas_normales=()):
+        self.reglas = reglas
+        self.cartas_fusion = cartas_fusion
+
+        # Primera carta del pool con cada nombre (la que daba recorrerlo)
+        prototipos = {}
+        for carta in cartas_fusion:
+            prototipos.setdefault(carta.nombre, carta)
+
+        # Pares por nombre cuyo resultado está en el pool
+        self.por_nombres = {}
+        for par, nombre_resultado in reglas.nombradas.items():
+            if nombre_resultado in prototipos:
+                self.por_nombres[par] = prototipos[nombre_resultado]
+
+        # Los mismos pares por ids de las cartas conocidas: id -> nombre
+        self.nombres = {}
+        ids_por_nombre = {}
+        for carta in list(cartas_normales) + list(cartas_fusion):
+            if self.nombres.setdefault(carta.id, carta.nombre) == carta.nombre:
+                ids_por_nombre.setdefault(carta.nombre, set()).add(carta.id)
+        self.por_ids = {}
+        for (nombre1, nombre2), resultado in self.por_nombres.items():
+            for id1 in ids_por_nombre.get(nombre1, ()):
+                for id2 in ids_por_nombre.get(nombre2, ()):
+                    self.por_ids.setdefault(_par(id1, id2), resultado)
+
+        # Reglas generales por atributo y por tipo (las que tienen ese
+        # valor más las que valen para todos, en el orden del archivo)
+        self.por_atributo, self.atributo_general = self._agrupar("atributo")
+        self.por_tipo, self.tipo_general = self._agrupar("tipo")
+        self.cualquiera = tuple(r for r in reglas.reglas if r.por == "cualquiera")
+        self._combinadas = {}
+
+        # (atributo compartido, tipo compartido, ATK promedio) -> resultado
+        # de las reglas generales sin excluir nombres (lo llena Fusionador)
+        self.resultados = {}
+
+    def _agrupar(self, por):
+        generales = tuple(r for r in self.reglas.reglas if r.por == por and r.valor is None)
+        valores = {r.valor for r in self.reglas.reglas if r.por == por and r.valor is not None}
+        especificas = {
+            valor: tuple(r for r in self.reglas.reglas if r.por == por and r.valor in (None, valor))
+            for valor in valores
+        }
+        return especificas, generales
+
+    def por_nombre(self, carta1, carta2):
+        """Prototipo de la fusión por nombre del par, o None"""
+        resultado = self.por_ids.get(_par(carta1.id, carta2.id))
+        if resultado is not None:
+            return resultado
+        # Cartas que no estaban al compilar (o con otro nombre): por nombre
+        if self.nombres.get(carta1.id) != carta1.nombre or self.nombres.get(carta2.id) != carta2.nombre:
+            return self.por_nombres.get(_par(carta1.nombre, carta2.nombre))
+        return None
+
+    def reglas_para(self, carta1, carta2):
+        """Reglas generales que se aplican al par, en el orden del archivo"""
+        atributo = carta1.atributo if carta1.atributo == carta2.atributo else None
+        tipo = carta1.tipo if carta1.tipo == carta2.tipo else None
+        clave = (atributo, tipo)
+        reglas = self._combinadas.get(clave)
+        if reglas is None:
+            reglas = self.cualquiera
+            if atributo is not None:
+                reglas += self.por_atributo.get(atributo, self.atributo_general)
+            if tipo is not None:
+                reglas += self.por_tipo.get(tipo, self.tipo_general)
+            reglas = self._combinadas[clave] = tuple(sorted(reglas, key=lambda r: r.orden))
+        return reglas
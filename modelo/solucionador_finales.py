@@ -0,0 +1,264 @@
+"""
+Solucionador exacto de finales para IAMinimax.
+
+Al final de la partida quedan pocas cartas entre decks, manos y campos y
+el árbol del resto del duelo es pequeño: en lugar de cortar a profundidad
+fija y confiar en `evaluar_estado` se busca hasta que un jugador quede
+derrotado (`esta_derrotado`), con el robo del comienzo de cada turno y
+todas las jugadas legales, no sólo las que propone el haz del perfil.
+
+Cada estado vale GANA, PIERDE o TABLAS desde el punto de vista de quien
+juega. Como ambos jugadores pueden pasar para siempre, la búsqueda mira
+como mucho un horizonte de turnos: TABLAS significa que nadie puede
+forzar la victoria dentro del horizonte. El horizonte crece de a un turno
+(profundización iterativa), así que la primera victoria encontrada es la
+más corta y la IA no da vueltas sin cerrar la partida.
+
+Los valores se memorizan por clave Zobrist junto con el horizonte con el
+que se buscaron: una victoria o derrota forzada en n turnos vale para
+cualquier horizonte mayor, y unas tablas para cualquiera menor.
+"""
+import math
+import time
+
+from modelo.ia_minimax import CATEGORIAS_TURNO
+
+GANA = 1
+TABLAS = 0
+PIERDE = -1
+
+NOMBRES_RESULTADO = {GANA: "gana", TABLAS: "tablas", PIERDE: "pierde"}
+
+
+class SolucionInterrumpida(Exception):
+    """Se lanza cuando el solucionador agota sus nodos o su tiempo"""
+
+
+def cartas_restantes(*jugadores):
+    """Cartas que les quedan a los jugadores entre deck, mano y campo"""
+    return sum(len(j.deck) + len(j.mano) + len(j.campo) for j in jugadores)
+
+
+class SolucionadorFinales:
+    """Búsqueda exacta de victoria/derrota/tablas con las reglas de la IA"""
+
+    def __init__(self, ia, turnos_maximos=12, max_nodos=5000, limite_tiempo=None,
+                 senal_detener=None):
+        """
+        Args:
+            ia: IAMinimax de la que se usan el fusionador, las claves
+                Zobrist y el aplicar/deshacer de acciones. Si tiene
+                `turno_completo` cada jugada es un turno entero; si no,
+                una sola acción por turno
+            turnos_maximos: Horizonte máximo en turnos (de ambos jugadores)
+            max_nodos: Estados a visitar antes de rendirse
+            limite_tiempo: Instante (time.perf_counter) en que se rinde
+            senal_detener: threading.Event que lo interrumpe desde fuera
+        """
+        self.ia = ia
+        self.turnos_maximos = turnos_maximos
+        self.max_nodos = max_nodos
+        self.limite_tiempo = limite_tiempo
+        self.senal_detener = senal_detener
+        self.nodos = 0
+        self.turnos = 0
+        self._memo = {}
+        self._alcanzo_horizonte = False
+
+    def resolver(self, jugador, oponente):
+        """
+        Resuelve la posición de `jugador`, que ya robó y tiene el turno.
+        Retorna (valor, jugada, turnos): la jugada que logra el valor y el
+        horizonte con el que se resolvió. Lanza SolucionInterrumpida si se
+        agota el presupuesto antes de terminar.
+        """
+        self.ia._totales = {}
+        valor, jugada = TABLAS, None
+
+        for horizonte in range(1, self.turnos_maximos + 1):
+            self._alcanzo_horizonte = False
+            valor, jugada = self._raiz(jugador, oponente, horizonte)
+            self.turnos = horizonte
+
+            # Resuelta, o ninguna línea llegó al horizonte: no hay más que ver
+            if valor != TABLAS or not self._alcanzo_horizonte:
+                break
+
+        return valor, jugada, self.turnos
+
+    def _raiz(self, jugador, oponente, turnos):
+        """Mejor jugada y su valor con el horizonte dado"""
+        mejor_valor, mejor_jugada = None, None
+        for jugada in self._jugadas(jugador, oponente):
+            valor = self._valor_jugada(jugador, oponente, jugada, turnos)
+            if mejor_valor is None or valor > mejor_valor:
+                mejor_valor, mejor_jugada = valor, jugada
+            if mejor_valor == GANA:
+                break
+        self._memo[self._clave(jugador, oponente)] = (mejor_valor, turnos,
+                                                      self.ia._clave_accion(mejor_jugada))
+        return mejor_valor, mejor_jugada
+
+    def _valor(self, jugador, oponente, turnos):
+        """Valor para `jugador`, que tiene el turno, mirando `turnos` turnos"""
+        if turnos == 0:
+            self._alcanzo_horizonte = True
+            return TABLAS
+
+        clave = self._clave(jugador, oponente)
+        entrada = self._memo.get(clave)
+        if entrada is not None:
+            valor, buscado, _ = entrada
+            if valor != TABLAS and buscado <= turnos:
+                return valor
+            if valor == TABLAS and buscado >= turnos:
+                # Unas tablas sólo salen de líneas cortadas en el horizonte:
+                # con más turnos podrían resolverse
+                self._alcanzo_horizonte = True
+                return valor
+
+        mejor_valor, mejor_jugada = PIERDE, None
+        for jugada in self._jugadas(jugador, oponente):
+            valor = self._valor_jugada(jugador, oponente, jugada, turnos)
+            if mejor_jugada is None or valor > mejor_valor:
+                mejor_valor, mejor_jugada = valor, jugada
+            if mejor_valor == GANA:
+                break
+
+        self._memo[clave] = (mejor_valor, turnos, self.ia._clave_accion(mejor_jugada))
+        return mejor_valor
+
+    def _valor_jugada(self, jugador, oponente, jugada, turnos):
+        """Aplica la jugada, hace robar al rival y busca su turno"""
+        self.nodos += 1
+        self._verificar_presupuesto()
+
+        registro = []
+        self.ia._aplicar_accion(jugador, oponente, jugada, registro)
+        # Mismo orden que el duelo: primero se mira si cayó el rival
+        if oponente.esta_derrotado():
+            valor = GANA
+        elif jugador.esta_derrotado():
+            valor = PIERDE
+        else:
+            self.ia._robar(oponente, registro)
+            valor = -self._valor(oponente, jugador, turnos - 1)
+        self.ia._deshacer_accion(registro)
+        return valor
+
+    def _verificar_presupuesto(self):
+        if self.max_nodos is not None and self.nodos > self.max_nodos:
+            raise SolucionInterrumpida()
+        if self.nodos % 256 == 0:
+            if self.senal_detener is not None and self.senal_detener.is_set():
+                raise SolucionInterrumpida()
+            if self.limite_tiempo is not None and time.perf_counter() >= self.limite_tiempo:
+                raise SolucionInterrumpida()
+
+    def _clave(self, jugador, oponente):
+        # Dentro de una resolución el deck de cada jugador es siempre un
+        # sufijo del de la raíz, así que basta su tamaño (lo que usa Zobrist)
+        return self.ia.zobrist.hash_estado(jugador, oponente, True)
+
+    # ========== JUGADAS LEGALES ==========
+
+    def _jugadas(self, jugador, oponente):
+        """
+        Jugadas del turno: turnos completos o acciones sueltas más pasar,
+        de la que mejor deja a quien juega según `evaluar_estado` a la
+        peor, para encontrar antes las victorias (y las refutaciones). La
+        mejor jugada que dejó en la memoria una iteración anterior va
+        primero.
+        """
+        if self.ia.turno_completo:
+            finales = {}
+            self._explorar_turno(jugador, oponente, (), frozenset(), finales, set())
+            puntuadas = [(puntaje, ("turno", plan)) for plan, puntaje in finales.values()]
+        else:
+            puntuadas = []
+            for accion in self._acciones(jugador, oponente) + [("pasar", None)]:
+                registro = []
+                self.ia._aplicar_accion(jugador, oponente, accion, registro)
+                puntuadas.append((self._puntaje(jugador, oponente), accion))
+                self.ia._deshacer_accion(registro)
+
+        puntuadas.sort(key=lambda x: -x[0])
+        jugadas = [jugada for _, jugada in puntuadas]
+
+        entrada = self._memo.get(self._clave(jugador, oponente))
+        if entrada is not None:
+            for i, jugada in enumerate(jugadas):
+                if self.ia._clave_accion(jugada) == entrada[2]:
+                    return [jugada] + jugadas[:i] + jugadas[i + 1:]
+        return jugadas
+
+    def _puntaje(self, jugador, oponente):
+        """Valor heurístico del estado para ordenar; derrotar al rival va primero"""
+        if oponente.esta_derrotado():
+            return math.inf
+        return self.ia.evaluar_estado(jugador, oponente)
+
+    def _explorar_turno(self, jugador, oponente, plan, usadas, finales, visitados):
+        """Como IAMinimax._explorar_turno, pero con todas las acciones legales"""
+        clave = self._clave(jugador, oponente)
+        if (clave, usadas) in visitados:
+            return
+        visitados.add((clave, usadas))
+        if clave not in finales:
+            finales[clave] = (plan, self._puntaje(jugador, oponente))
+
+        if jugador.esta_derrotado() or oponente.esta_derrotado():
+            return
+
+        for accion in self._acciones(jugador, oponente):
+            categoria = CATEGORIAS_TURNO[accion[0]]
+            if categoria in usadas:
+                continue
+
+            registro = []
+            self.ia._aplicar_accion(jugador, oponente, accion, registro)
+            self._explorar_turno(jugador, oponente, plan + (accion,), usadas | {categoria},
+                                 finales, visitados)
+            self.ia._deshacer_accion(registro)
+
+    def _acciones(self, jugador, oponente):
+        """
+        Todas las acciones legales, una por grupo de copias. Se omiten los
+        ataques que sólo pueden dañar a quien ataca (contra un ATK mayor o
+        una DEF igual o mayor): perder vida o cartas nunca mejora el
+        resultado y no atacar siempre es posible.
+        """
+        ia = self.ia
+        acciones = []
+
+        if len(jugador.mano) >= 2 and ia.fusionador and ia.cartas_disponibles:
+            fusiones = ia.fusionador.obtener_fusiones_posibles(jugador.mano, ia.cartas_disponibles)
+            for carta1, carta2, resultado in ia._fusiones_distintas(fusiones):
+                acciones.append(("fusionar", (carta1, carta2, resultado)))
+            if ia.planificador_fusiones and len(jugador.mano) >= 3:
+                for cadena in ia.planificador_fusiones.cadenas(
+                    jugador.mano, ia.fusionador, ia.cartas_disponibles, minimo_pasos=2
+                ):
+                    acciones.append(("cadena", cadena))
+
+        if jugador.puede_jugar_carta():
+            for carta in ia._distintas(jugador.mano):
+                acciones.append(("jugar", (carta, "ataque")))
+                acciones.append(("jugar", (carta, "defensa")))
+
+        for carta in ia._distintas(jugador.campo):
+            acciones.append(("cambiar_posicion", carta))
+
+        atacantes = [c for c in ia._distintas(jugador.campo) if c.posicion == "ataque"]
+        if oponente.campo:
+            for atacante in atacantes:
+                for objetivo in ia._distintas(oponente.campo):
+                    if objetivo.posicion == "ataque" and atacante.atk >= objetivo.atk:
+                        acciones.append(("atacar", (atacante, objetivo)))
+                    elif objetivo.posicion == "defensa" and atacante.atk > objetivo.defensa:
+                        acciones.append(("atacar", (atacante, objetivo)))
+        else:
+            for atacante in atacantes:
+                acciones.append(("ataque_directo", atacante))
+
+        return acciones
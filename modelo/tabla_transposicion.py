@@ -0,0 +1,148 @@
+import hashlib
+
+# Tipos de entrada según la ventana alfa-beta con la que se obtuvo el valor
+EXACTO = "exacto"
+COTA_INFERIOR = "inferior"  # El valor real es >= al guardado
+COTA_SUPERIOR = "superior"  # El valor real es <= al guardado
+
+
+class Zobrist:
+    """
+    Calcula claves Zobrist de 64 bits para los estados de la búsqueda.
+
+    Cada rasgo del estado (vida, tamaño del deck, carta en un espacio del
+    campo con su posición, carta en un espacio de la mano) tiene una clave
+    aleatoria y la clave del estado es el XOR de todas. Las claves se derivan
+    de un hash del propio rasgo, así que son iguales entre ejecuciones y
+    procesos distintos.
+    """
+
+    def __init__(self):
+        self._claves = {}
+
+    def clave(self, rasgo):
+        """Retorna la clave aleatoria (estable) asociada a un rasgo"""
+        valor = self._claves.get(rasgo)
+        if valor is None:
+            digest = hashlib.blake2b(repr(rasgo).encode("utf-8"), digest_size=8).digest()
+            valor = int.from_bytes(digest, "little")
+            self._claves[rasgo] = valor
+        return valor
+
+    def hash_estado(self, jugador_max, jugador_min, es_maximizador):
+        """
+        Clave del estado visto desde la búsqueda.
+
+        Se usa el índice de cada carta en su zona porque el orden de la mano
+        y del campo influye en la generación de acciones.
+        """
+        clave = 0
+
+        for rol, jugador in ((0, jugador_max), (1, jugador_min)):
+            clave ^= self.clave(("vida", rol, jugador.puntos_vida))
+            clave ^= self.clave(("deck", rol, len(jugador.deck)))
+
+            for indice, carta in enumerate(jugador.campo):
+                clave ^= self.clave(("campo", rol, indice, carta.id, carta.posicion))
+
+            for indice, carta in enumerate(jugador.mano):
+                clave ^= self.clave(("mano", rol, indice, carta.id))
+
+        if es_maximizador:
+            clave ^= self.clave(("turno_max",))
+
+        return clave
+
+
+class EntradaTabla:
+    """
+    Resultado guardado de la búsqueda de un estado. `horizonte` indica si
+    alguna rama de esa búsqueda se cortó en el horizonte (si no, el valor
+    es el del árbol completo y buscar más hondo no lo cambia).
+    """
+
+    __slots__ = ("clave", "profundidad", "valor", "tipo", "generacion", "horizonte")
+
+    def __init__(self, clave, profundidad, valor, tipo, generacion, horizonte=True):
+        self.clave = clave
+        self.profundidad = profundidad
+        self.valor = valor
+        self.tipo = tipo
+        self.generacion = generacion
+        self.horizonte = horizonte
+
+
+class TablaTransposicion:
+    """
+    Tabla de transposición de tamaño fijo indexada por clave Zobrist.
+
+    Políticas de reemplazo cuando dos estados caen en la misma ranura:
+    - "profundidad": conserva la entrada buscada a más profundidad, salvo
+      que sea de una búsqueda anterior.
+    - "siempre": la entrada nueva reemplaza siempre a la anterior.
+    """
+
+    POLITICAS = ("profundidad", "siempre")
+
+    def __init__(self, tamanio_max=2 ** 16, politica="profundidad"):
+        if politica not in self.POLITICAS:
+            raise ValueError(f"Política de reemplazo desconocida: {politica}")
+
+        self.tamanio_max = tamanio_max
+        self.politica = politica
+        self.zobrist = Zobrist()
+        self.ranuras = [None] * tamanio_max
+        self.generacion = 0
+
+        # Contadores para medir si la tabla compensa
+        self.aciertos = 0
+        self.fallos = 0
+        self.reemplazos = 0
+
+    def clave_estado(self, jugador_max, jugador_min, es_maximizador):
+        """Atajo para calcular la clave Zobrist de un estado"""
+        return self.zobrist.hash_estado(jugador_max, jugador_min, es_maximizador)
+
+    def nueva_busqueda(self):
+        """Marca el inicio de una búsqueda; las entradas previas envejecen"""
+        self.generacion += 1
+
+    def buscar(self, clave, profundidad):
+        """
+        Retorna la entrada del estado si fue buscada al menos a la
+        profundidad pedida, o None.
+        """
+        entrada = self.ranuras[clave % self.tamanio_max]
+
+        if entrada is not None and entrada.clave == clave and entrada.profundidad >= profundidad:
+            self.aciertos += 1
+            return entrada
+
+        self.fallos += 1
+        return None
+
+    def guardar(self, clave, profundidad, valor, tipo, horizonte=True):
+        """Guarda el resultado de buscar un estado según la política"""
+        indice = clave % self.tamanio_max
+        actual = self.ranuras[indice]
+
+        if actual is not None:
+            if (self.politica == "profundidad" and
+                    actual.generacion == self.generacion and
+                    actual.profundidad > profundidad):
+                return
+            if actual.clave != clave:
+                self.reemplazos += 1
+
+        self.ranuras[indice] = EntradaTabla(clave, profundidad, valor, tipo, self.generacion, horizonte)
+
+    def limpiar(self):
+        """Vacía la tabla y reinicia los contadores"""
+        self.ranuras = [None] * self.tamanio_max
+        self.aciertos = 0
+        self.fallos = 0
+        self.reemplazos = 0
+
+    def ocupacion(self):
+        """Número de ranuras ocupadas"""
+        return sum(1 for entrada in self.ranuras if entrada is not None)
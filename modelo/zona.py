@@ -0,0 +1,169 @@
+"""
+Zona de cartas de un jugador (mano o campo).
+
+Es una lista de cartas que además lleva un índice uid -> carta, así que
+encontrar una carta (`buscar`, `in`) no recorre la zona y distingue las
+copias de una misma carta. El índice se mantiene en todas las operaciones
+que cambian qué cartas hay en la lista; las que devuelven listas nuevas
+(slices, `+`, `copy`) dan listas normales.
+
+El índice guarda la carta y no su posición: insertar o quitar una carta
+no obliga a renumerar las siguientes, y la posición, cuando hace falta
+(el registro para deshacer), la da `list.index` sobre a lo sumo unas
+pocas cartas.
+"""
+
+
+class Zona(list):
+    """Lista de cartas con índice uid -> carta"""
+
+    __slots__ = ("_cartas",)
+
+    def __init__(self, cartas=()):
+        super().__init__(cartas)
+        self._cartas = {carta.uid: carta for carta in self}
+
+    def __reduce__(self):
+        # pickle y copy reconstruyen la zona (y su índice) desde sus cartas
+        return (Zona, (list(self),))
+
+    def buscar(self, uid):
+        """Carta con ese uid, o None si no está"""
+        return self._cartas.get(uid)
+
+    def __contains__(self, carta):
+        return self._cartas.get(getattr(carta, "uid", None)) is carta
+
+    # ========== MODIFICACIONES ==========
+
+    def append(self, carta):
+        list.append(self, carta)
+        self._cartas[carta.uid] = carta
+
+    def insert(self, indice, carta):
+        list.insert(self, indice, carta)
+        self._cartas[carta.uid] = carta
+
+    def pop(self, indice=-1):
+        carta = list.pop(self, indice)
+        del self._cartas[carta.uid]
+        return carta
+
+    def remove(self, carta):
+        list.remove(self, carta)
+        del self._cartas[carta.uid]
+
+    def extend(self, cartas):
+        cartas = list(cartas)
+        list.extend(self, cartas)
+        self._cartas.update((carta.uid, carta) for carta in cartas)
+
+    def __iadd__(self, cartas):
+        self.extend(cartas)
+        return self
+
+    def clear(self):
+        list.clear(self)
+        self._cartas.clear()
+
+    def __setitem__(self, indice, valor):
+        list.__setitem__(self, indice, valor)
+        self._cartas = {carta.uid: carta for carta in self}
+
+    def __delitem__(self, indice):
+        list.__delitem__(self, indice)
+        self._cartas = {carta.uid: carta for carta in self}
+
+
+# Pares resueltos que guarda una mano antes de vaciarlos: los de cartas
+# que ya no están en juego no se borran uno por uno
+MAX_PARES = 4096
+
+_SIN_RESOLVER = object()
+
+
+class Mano(Zona):
+    """
+    Zona de la mano que además recuerda qué pares de sus cartas se
+    pueden fusionar y en qué.
+
+    Los pares se guardan por los uid de sus cartas, así que robar, jugar,
+    fusionar o deshacer no invalida nada: al pedir las fusiones sólo se
+    resuelven los pares con cartas que entraron desde la vez anterior
+    (O(n) tras robar una carta) y el resto son consultas a un dict. Una
+    carta que sale y vuelve (jugar y deshacer) recupera sus pares.
+
+    El resultado de fusionar un par se instancia siempre con el mismo uid
+    (`instanciar_fusion`): la búsqueda genera las fusiones en cada nodo y,
+    con un uid nuevo cada vez, los pares del resultado con el resto de la
+    mano nunca se repetirían.
+
+    Los clones de la mano comparten los pares resueltos: una carta
+    clonada conserva su uid y sus datos.
+    """
+
+    __slots__ = ("_pares", "_uids", "_origen")
+
+    def __init__(self, cartas=()):
+        super().__init__(cartas)
+        # (uid menor, uid mayor) -> carta de fusión resultante o None
+        self._pares = {}
+        # (uid menor, uid mayor) -> uid de las instancias del resultado
+        self._uids = {}
+        # (fusionador, cartas de fusión, versión del fusionador) de los pares
+        self._origen = None
+
+    def __reduce__(self):
+        # Los pares resueltos no viajan: se vuelven a resolver al consultar
+        return (Mano, (list(self),))
+
+    def clonar(self):
+        """Mano con copias de las cartas (mismos uid) que comparte los pares resueltos"""
+        clon = Mano([carta.clonar() for carta in self])
+        clon._pares = self._pares
+        clon._uids = self._uids
+        clon._origen = self._origen
+        return clon
+
+    def fusiones(self, fusionador, cartas_disponibles):
+        """
+        Lista de (carta1, carta2, prototipo del resultado) con carta1 antes
+        que carta2 en la mano, en el orden en que se recorren los pares i < j
+        """
+        origen = self._origen
+        if (origen is None or origen[0] is not fusionador or origen[1] is not cartas_disponibles
+                or origen[2] != fusionador.version):
+            # Otro fusionador u otro pool: los pares de antes no sirven (un
+            # dict nuevo, los clones que comparten el anterior lo conservan)
+            self._pares = {}
+            self._uids = {}
+            self._origen = (fusionador, cartas_disponibles, fusionador.version)
+        elif len(self._pares) > MAX_PARES:
+            self._pares.clear()
+            self._uids.clear()
+
+        pares = self._pares
+        fusiones = []
+        for i, carta1 in enumerate(self):
+            uid1 = carta1.uid
+            for carta2 in self[i + 1:]:
+                uid2 = carta2.uid
+                clave = (uid1, uid2) if uid1 < uid2 else (uid2, uid1)
+                resultado = pares.get(clave, _SIN_RESOLVER)
+                if resultado is _SIN_RESOLVER:
+                    resultado = fusionador.resultado_fusion(carta1, carta2, cartas_disponibles)
+                    pares[clave] = resultado
+                if resultado is not None:
+                    fusiones.append((carta1, carta2, resultado))
+        return fusiones
+
+    def instanciar_fusion(self, carta1, carta2, prototipo):
+        """
+        Instancia del resultado de fusionar carta1 y carta2, con el uid que
+        ya recibió ese par (o uno nuevo que queda reservado para él)
+        """
+        uid1, uid2 = carta1.uid, carta2.uid
+        clave = (uid1, uid2) if uid1 < uid2 else (uid2, uid1)
+        instancia = prototipo.instanciar(self._uids.get(clave))
+        self._uids[clave] = instancia.uid
+        return instancia